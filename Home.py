@@ -1,7 +1,9 @@
 import streamlit as st
-import pandas as pd
 from PIL import Image
 
+from credit_scoring.dataset_io import is_columnar, read_table
+from credit_scoring.schema import PREPROCESSED_DATA_PATH
+
 # Sayfa yapılandırması
 st.set_page_config(
     page_title="Kredi Skoru Sınıflandırma Uygulaması",
@@ -24,6 +26,7 @@ Farklı modelleme yöntemlerini kıyaslayabilir, veri setine dair içgörüler e
 - **Dataset Story**: Veri setinin yapısı, görselleştirmeler ve analiz hikayesi
 - **Supervised Model**: Etiketli veriyle eğitilmiş model tahminleri
 - **Semi Supervised Model**: Yarı denetimli (semi-supervised) modelle tahminler
+- **Model Comparison**: Aynı başvurunun iki modelle eşzamanlı skorlanması ve karşılaştırılması
 
 👉 Lütfen sol menüden bir sayfa seçin.
 """)
@@ -53,9 +56,11 @@ Bu veri seti, global bir finans şirketinin müşterilerine ait temel banka bilg
 Bu yapı, kredi risk analizi, müşteri profilleme ve finansal karar destek sistemlerinde doğrudan kullanılabilir niteliktedir.
 """)
 
-# CSV veri yükleme ve gösterim
+# Veri yükleme ve gösterim
 try:
-    df = pd.read_csv("data/preprocessed_data.csv")  # ya da kendi yolun
+    # Notebook'un sütunlu çıktısı (dataset_io) yoksa eski CSV çıktısı okunur
+    source = PREPROCESSED_DATA_PATH if is_columnar(PREPROCESSED_DATA_PATH) else f"{PREPROCESSED_DATA_PATH}.csv"
+    df = read_table(source)
     with st.expander("📂 Veri Setini Görüntüle"):
         st.dataframe(df)
 except FileNotFoundError:
@@ -0,0 +1,63 @@
+"""
+Paralel toplu skorlamanın (credit_scoring.batch) çekirdek sayısıyla ölçeklenmesi.
+
+Özellik matrisi bir kez yazılır; 1, 2, 4, ... işçi ile skorlanır ve tek çağrılık model.predict_proba ile
+karşılaştırılır.
+
+Kullanım:
+    python benchmarks/bench_batch_scoring.py --rows 1000000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_compact_features import load_rows  # noqa: E402
+from credit_scoring.batch import SHARED_TMP_DIR, score_matrix, write_feature_matrix  # noqa: E402
+from credit_scoring.schema import PROCESSED_DATA_PATH  # noqa: E402
+from credit_scoring.training import PIPELINES  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paralel toplu skorlama ölçeklenme testi")
+    parser.add_argument("--source", default=PROCESSED_DATA_PATH)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--model", choices=sorted(PIPELINES), default="supervised")
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    df = load_rows(args.source, args.rows)
+    work_dir = tempfile.mkdtemp(prefix="bench-batch-", dir=SHARED_TMP_DIR)
+    try:
+        features_path = write_feature_matrix(df, os.path.join(work_dir, "features.npy"), args.model)
+        output_path = os.path.join(work_dir, "proba.npy")
+
+        model = PIPELINES[args.model].load().model
+        X = np.load(features_path, mmap_mode="r")
+        start = time.perf_counter()
+        reference = model.predict_proba(X)[:, 1]
+        single_call = time.perf_counter() - start
+        print(f"{len(df):,} satır | tek predict_proba çağrısı: {len(df) / single_call:,.0f} satır/sn\n")
+
+        print(f"{'İşçi':>6}{'Süre (sn)':>12}{'Satır/sn':>14}{'Hızlanma':>10}{'Verimlilik':>12}")
+        jobs, base = 1, None
+        while jobs <= args.max_jobs:
+            report = score_matrix(features_path, output_path, args.model, jobs)
+            base = base or report["seconds"]
+            print(f"{jobs:>6}{report['seconds']:>12.3f}{report['rows_per_sec']:>14,}"
+                  f"{base / report['seconds']:>9.2f}x{report['parallel_efficiency']:>12.2f}")
+            jobs *= 2
+        diff = np.abs(np.load(output_path) - reference).max()
+        print(f"\nTek çağrı ile en büyük fark: {diff:.2e}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Kompakt (float32/uint8/int8) özellik hattı ile sayfalardaki float64 np.hstack yolunun karşılaştırması.
+
+Ölçülenler:
+- Özellik üretimi sırasında en yüksek bellek kullanımı (tracemalloc) ve nihai matris boyutu
+- Özellik üretimi ve (modeller yüklenebiliyorsa) tahmin hızı, satır/sn
+
+Kullanım:
+    python benchmarks/bench_compact_features.py --source data/not_scaled_processed_data.csv --rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credit_scoring.dataset_io import read_table  # noqa: E402
+from credit_scoring.features import encode_raw  # noqa: E402
+from credit_scoring.pipelines import PseudoLabelPipeline, SupervisedPipeline  # noqa: E402
+from credit_scoring.schema import (  # noqa: E402
+    CATEGORICAL_VOCABULARIES, LOAN_TYPES, NUMERIC_COLS, PAYMENT_OF_MIN_COL, PROCESSED_DATA_PATH
+)
+
+
+def legacy_supervised_features(df, scaler):
+    """Sayfalardaki eski yolun toplu hali: float64 vektörler ve np.hstack."""
+    numeric = df[NUMERIC_COLS].to_numpy(dtype=float)
+    col = {name: numeric[:, i] for i, name in enumerate(NUMERIC_COLS)}
+    total_accounts = col["Num_Bank_Accounts"] + col["Num_Credit_Card"]
+    safe_accounts = np.where(total_accounts > 0, total_accounts, 1)
+    safe_income = np.where(col["Annual_Income"] > 0, col["Annual_Income"], 1)
+    engineered = np.column_stack([
+        total_accounts,
+        np.where(total_accounts > 0, col["Outstanding_Debt"] / safe_accounts, 0),
+        np.where(col["Annual_Income"] > 0, col["Outstanding_Debt"] / safe_income, 0),
+        np.where(total_accounts > 0, col["Num_of_Delayed_Payment"] / safe_accounts, 0),
+        col["Amount_invested_monthly"] + col["Total_EMI_per_month"],
+    ])
+    numeric_features = np.hstack([numeric, engineered, df[[PAYMENT_OF_MIN_COL]].to_numpy(dtype=float)])
+    codes = np.column_stack([
+        pd.Categorical(df[c], categories=v).codes for c, v in CATEGORICAL_VOCABULARIES.items()
+    ])
+    return np.hstack([scaler.transform(numeric_features), df[LOAN_TYPES].to_numpy(), codes])
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def load_rows(source, n_rows, seed=42):
+    df = read_table(source)
+    df = df[df["Occupation"].isin(CATEGORICAL_VOCABULARIES["Occupation"])]
+    return df.sample(n=n_rows, replace=n_rows > len(df), random_state=seed).reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kompakt özellik hattı bellek/hız karşılaştırması")
+    parser.add_argument("--source", default=PROCESSED_DATA_PATH)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--predict-rows", type=int, default=100_000,
+                        help="Tahmin karşılaştırmasında kullanılacak satır sayısı")
+    args = parser.parse_args(argv)
+
+    df = load_rows(args.source, args.rows)
+    supervised = SupervisedPipeline.load()
+    print(f"{len(df):,} satır\n")
+
+    legacy, legacy_t, legacy_peak = measure(lambda: legacy_supervised_features(df, supervised.scaler))
+    blocks, encode_t, encode_peak = measure(lambda: encode_raw(df))
+    compact, compact_t, compact_peak = measure(lambda: supervised.transform(blocks))
+
+    print(f"{'Yol':<28}{'Süre (sn)':>12}{'Satır/sn':>14}{'Tepe bellek':>14}{'Sonuç':>12}")
+    rows = [
+        ("float64 hstack (eski)", legacy_t, legacy_peak, legacy.nbytes),
+        ("kompakt bloklar", encode_t, encode_peak, blocks.nbytes),
+        ("bloklar -> float32 girdi", compact_t, compact_peak, compact.nbytes),
+    ]
+    for name, t, peak, size in rows:
+        print(f"{name:<28}{t:>12.3f}{len(df) / t:>14,.0f}{peak / 2**20:>11.1f} MB{size / 2**20:>9.1f} MB")
+    print(f"\nEn büyük mutlak fark (float32 vs float64): {np.abs(compact - legacy).max():.2e}")
+
+    n = min(args.predict_rows, len(df))
+    for name, pipeline, X64 in [
+        ("supervised", supervised, legacy[:n]),
+        ("pseudo_label", PseudoLabelPipeline.load(), None),
+    ]:
+        X32 = pipeline.transform(blocks.take(slice(0, n)))
+        _, t32, _ = measure(lambda: pipeline.model.predict(X32))
+        line = f"{name:<14} float32 tahmin: {n / t32:>10,.0f} satır/sn"
+        if X64 is not None:
+            _, t64, _ = measure(lambda: pipeline.model.predict(X64))
+            line += f" | float64 tahmin: {n / t64:>10,.0f} satır/sn"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Eşzamanlı oturum yük testi: bir uygulama kopyasının kaç analisti/ajanı kaldırabildiği.
+
+Her N değeri için yeni bir işçi süreci (tek bir Streamlit sunucusu gibi) açılır ve içinde N oturum eşzamanlı
+çalışır. Oturumlar sayfalara sırayla dağıtılır (seviyeler arasında sayfa karışımının aynı kalması için N
+3'ün katı seçilir) ve süre bitene kadar eylem yapar:
+- Dataset Story: rastgele filtre (kredi skoru, yaş, meslek, ay) veya sekme değişikliği
+- Supervised / Semi Supervised Model: formdaki sayıları ve seçimleri rastgele değiştirip skorlama
+
+Oturumlar streamlit.testing AppTest ile sayfa betiklerinin kendisini çalıştırır. Streamlit sunucusunda olduğu
+gibi her oturum aynı süreçte ayrı bir iş parçacığıdır; st.cache_* ve süreç geneli nesneler (modeller, figür
+önbelleği) paylaşılır, oturum durumu ve filtrelenmiş veri oturum başınadır. Sayfaların yazdığı denetim kayıtları,
+gölge skorlama istatistikleri ve drift metrikleri işçi sürecinde geçici bir klasöre yönlendirilir ve test sonunda
+silinir; yük testi kararları gerçek kayıtlara karışmaz.
+
+Ölçülenler: eylem gecikmesi yüzdelikleri (p50/p95/p99), saniyedeki eylem sayısı ve işçi sürecinin RSS'i
+(ısınma sonrası ve en yüksek; oturum başına artış). Throughput eğrisinin dirsek noktası (knee), eğri
+normalize edildikten sonra ilk ve son noktayı birleştiren doğruya en uzak nokta olarak raporlanır.
+
+Kullanım:
+    python benchmarks/bench_load.py --sessions 3,6,12,24 --duration 30
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Dataset Story.py", "Supervised Model.py", "Semi Supervised Model.py"]
+RSS_SAMPLE_SECONDS = 0.2
+
+
+def current_rss():
+    """Sürecin o anki RSS'i (bayt); /proc yoksa en yüksek RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _story_action(at, rng):
+    """Dataset Story'de rastgele bir filtre veya sekme değişikliği."""
+    sidebar = at.sidebar
+    choice = rng.randrange(5)
+    if choice == 0:
+        options = sidebar.multiselect[0].options
+        sidebar.multiselect[0].set_value(rng.sample(options, rng.randint(1, len(options))))
+    elif choice == 1:
+        low, high = sidebar.slider[0].min, sidebar.slider[0].max
+        start = rng.randint(low, high)
+        sidebar.slider[0].set_range(start, rng.randint(start, high))
+    elif choice == 2:
+        sidebar.selectbox[0].set_value(rng.choice(sidebar.selectbox[0].options))
+    elif choice == 3:
+        options = sidebar.multiselect[1].options
+        sidebar.multiselect[1].set_value(rng.sample(options, rng.randint(1, len(options))))
+    else:
+        at.session_state["story_section"] = rng.choice([tab.label for tab in at.tabs])
+    at.run()
+
+
+def _form_action(at, rng):
+    """Model sayfasında formu rastgele değiştirip skorlama düğmesine basar."""
+    for number in at.number_input:
+        value = number.value * rng.uniform(0.5, 1.5)
+        number.set_value(int(round(value)) if isinstance(number.value, int) else value)
+    for select in at.selectbox:
+        select.set_value(rng.choice(select.options))
+    at.button[0].click().run()
+
+
+def _run_session(page, deadline, seed, records, errors):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    action = _story_action if page == "Dataset Story.py" else _form_action
+    at = AppTest.from_file(os.path.abspath(os.path.join("pages", page)), default_timeout=600)
+    start = time.perf_counter()
+    at.run()
+    records.append((page, "open", time.perf_counter() - start))
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            action(at, rng)
+            failed = bool(at.exception)
+        except Exception:
+            failed = True
+        records.append((page, "action", time.perf_counter() - start))
+        if failed:
+            errors.append(page)
+
+
+def run_level(n_sessions, duration, seed, app_dir, log_dir):
+    """
+    Yeni bir işçi sürecinde N oturumu `duration` saniye çalıştırır.
+
+    Her sayfa önce bir kez açılarak ısıtılır (veri, profil, modeller yüklenir); ısınma RSS'i bundan sonra
+    ölçülür. Kayıt klasörleri credit_scoring içe aktarılmadan önce log_dir altına çevrilir.
+    """
+    os.environ["AUDIT_LOG_DIR"] = os.path.join(log_dir, "audit")
+    os.environ["SHADOW_LOG_DIR"] = os.path.join(log_dir, "shadow")
+    os.environ["DRIFT_METRICS_FILE"] = os.path.join(log_dir, "drift.prom")
+    os.chdir(app_dir)
+    sys.path.insert(0, app_dir)
+    from streamlit.testing.v1 import AppTest
+
+    for page in PAGES:
+        AppTest.from_file(os.path.abspath(os.path.join("pages", page)), default_timeout=600).run()
+    warm_rss = current_rss()
+
+    peak = [warm_rss]
+    done = threading.Event()
+
+    def sample_rss():
+        while not done.wait(RSS_SAMPLE_SECONDS):
+            peak[0] = max(peak[0], current_rss())
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    records, errors = [], []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    sessions = [
+        threading.Thread(target=_run_session, args=(PAGES[i % len(PAGES)], deadline, seed + i, records, errors))
+        for i in range(n_sessions)
+    ]
+    for session in sessions:
+        session.start()
+    for session in sessions:
+        session.join()
+    wall = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    return {
+        "sessions": n_sessions, "wall_seconds": wall, "records": records, "errors": len(errors),
+        "warm_rss": warm_rss, "peak_rss": max(peak[0], current_rss()),
+    }
+
+
+def summarize(result):
+    actions = np.array([latency for _, kind, latency in result["records"] if kind == "action"])
+    summary = {
+        "sessions": result["sessions"],
+        "actions": int(actions.size),
+        "errors": result["errors"],
+        "throughput": actions.size / result["wall_seconds"],
+        "warm_rss_mb": result["warm_rss"] / 2 ** 20,
+        "peak_rss_mb": result["peak_rss"] / 2 ** 20,
+        "rss_per_session_mb": (result["peak_rss"] - result["warm_rss"]) / 2 ** 20 / result["sessions"],
+    }
+    for q in (50, 95, 99):
+        summary[f"p{q}_ms"] = float(np.percentile(actions, q) * 1000) if actions.size else float("nan")
+    summary["pages"] = {}
+    for page in PAGES:
+        page_actions = [latency for p, kind, latency in result["records"] if p == page and kind == "action"]
+        if page_actions:
+            summary["pages"][page] = {
+                "actions": len(page_actions), "p95_ms": float(np.percentile(page_actions, 95) * 1000),
+            }
+    return summary
+
+
+def knee_point(xs, ys):
+    """
+    Eğrinin dirsek noktası: x ve y [0, 1] aralığına normalize edilir, ilk ve son noktayı birleştiren doğrunun
+    en çok üstünde kalan nokta seçilir. Üç noktadan az, düz veya doğrusal (doymamış) eğride None.
+    """
+    if len(xs) < 3:
+        return None
+    x, y = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    if np.ptp(x) == 0 or np.ptp(y) == 0:
+        return None
+    x = (x - x.min()) / np.ptp(x)
+    y = (y - y.min()) / np.ptp(y)
+    chord = y[0] + (y[-1] - y[0]) * (x - x[0]) / (x[-1] - x[0])
+    gap = y - chord
+    return xs[int(np.argmax(gap))] if gap.max() > 1e-9 else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eşzamanlı oturum yük testi")
+    parser.add_argument("--sessions", default="3,6,12,24", help="Virgülle ayrılmış oturum sayıları")
+    parser.add_argument("--duration", type=float, default=30, help="Her seviyede saniye")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--app-dir", default=REPO_DIR, help="data/ ve models/ klasörlerinin bulunduğu dizin")
+    parser.add_argument("--output", default=None, help="Özetin yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+    levels = [int(n) for n in args.sessions.split(",")]
+
+    # Her seviye taze bir süreçte: önceki seviyenin önbellekleri ve belleği ölçümü etkilemez
+    context = multiprocessing.get_context("spawn")
+    print(f"{'Oturum':>7}{'Eylem':>8}{'Hata':>6}{'Eylem/sn':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'RSS MB':>9}{'MB/oturum':>11}")
+    summaries = []
+    for n in levels:
+        log_dir = tempfile.mkdtemp(prefix="bench-load-logs-")
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(run_level, n, args.duration, args.seed, os.path.abspath(args.app_dir),
+                                     log_dir).result()
+        finally:
+            shutil.rmtree(log_dir, ignore_errors=True)
+        summary = summarize(result)
+        summaries.append(summary)
+        print(f"{n:>7}{summary['actions']:>8}{summary['errors']:>6}{summary['throughput']:>10.2f}"
+              f"{summary['p50_ms']:>9.0f}{summary['p95_ms']:>9.0f}{summary['p99_ms']:>9.0f}"
+              f"{summary['peak_rss_mb']:>9.0f}{summary['rss_per_session_mb']:>11.1f}")
+
+    knee = knee_point([s["sessions"] for s in summaries], [s["throughput"] for s in summaries])
+    if knee is None:
+        print("\nDirsek bulunamadı (en az üç seviye gerekir veya throughput henüz doymadı).")
+    else:
+        best = max(summaries, key=lambda s: s["throughput"])
+        print(f"\nThroughput dirseği: {knee} oturum | en yüksek throughput {best['throughput']:.2f} eylem/sn "
+              f"({best['sessions']} oturum)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"levels": summaries, "knee_sessions": knee}, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+Kredi skoru projesinin veri, model ve dashboard yardımcıları.
+
+Streamlit sayfaları, notebook ve komut satırı araçları ortak mantığı bu paketten kullanır.
+"""
@@ -0,0 +1,93 @@
+"""
+models/ klasöründeki model dosyaları için sürümleme.
+
+Her kayıt models/versions/<ad>-v0001.pkl gibi değişmez bir dosyaya yazılır ve models/manifest.json'a eklenir.
+promote=True ise sayfaların yüklediği models/<ad>.pkl dosyası atomik olarak (os.replace) yeni sürüme çevrilir.
+"""
+import json
+import os
+import pickle
+import shutil
+from datetime import datetime, timezone
+
+from credit_scoring.schema import MODELS_DIR
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _atomic_write_bytes(path, write):
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_manifest(models_dir=MODELS_DIR):
+    path = os.path.join(models_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest, models_dir):
+    data = json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+    _atomic_write_bytes(os.path.join(models_dir, MANIFEST_NAME), lambda f: f.write(data))
+
+
+def current_version(name, models_dir=MODELS_DIR):
+    return read_manifest(models_dir).get(name, {}).get("current")
+
+
+def version_path(name, version, models_dir=MODELS_DIR, manifest=None):
+    """Sürümün models/versions altındaki değişmez dosyası."""
+    entry = (manifest or read_manifest(models_dir))[name]
+    return os.path.join(models_dir, next(v["path"] for v in entry["versions"] if v["version"] == version))
+
+
+def save_versioned(obj, name, metadata=None, models_dir=MODELS_DIR, promote=True):
+    """
+    Nesneyi yeni bir sürüm olarak kaydeder.
+
+    Returns:
+        (sürüm numarası, sürüm dosyasının yolu)
+    """
+    manifest = read_manifest(models_dir)
+    entry = manifest.setdefault(name, {"current": None, "versions": []})
+    version = max((v["version"] for v in entry["versions"]), default=0) + 1
+
+    versions_dir = os.path.join(models_dir, "versions")
+    os.makedirs(versions_dir, exist_ok=True)
+    path = os.path.join(versions_dir, f"{name}-v{version:04d}.pkl")
+    _atomic_write_bytes(path, lambda f: pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+    entry["versions"].append({
+        "version": version,
+        "path": os.path.relpath(path, models_dir),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "parent": entry["current"],
+        **(metadata or {}),
+    })
+    if promote:
+        promote_version(name, version, models_dir, manifest)
+    else:
+        _write_manifest(manifest, models_dir)
+    return version, path
+
+
+def promote_version(name, version, models_dir=MODELS_DIR, manifest=None):
+    """models/<ad>.pkl dosyasını verilen sürüme atomik olarak çevirir (mümkünse hard link ile, kopyasız)."""
+    manifest = manifest or read_manifest(models_dir)
+    entry = manifest[name]
+    source = version_path(name, version, models_dir, manifest)
+    target = os.path.join(models_dir, f"{name}.pkl")
+    tmp = f"{target}.tmp-{os.getpid()}"
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
+    entry["current"] = version
+    _write_manifest(manifest, models_dir)
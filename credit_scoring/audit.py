@@ -0,0 +1,420 @@
+"""
+Tahmin denetim kaydı (audit log): her kredi kararı girdileriyle birlikte saklanır.
+
+- Tahmin yolu sadece bellekteki sınırlı kuyruğa put_nowait ile kayıt bırakır; disk G/Ç'sini hiç beklemez.
+  Kuyruk doluysa kayıt düşürülür ve dropped sayacı artar (stats ile izlenir).
+- Arka plan yazıcısı kayıtları toplar ve batch_rows satırda veya flush_interval saniyede bir, açık dosyaya Arrow
+  IPC stream kaydı olarak ekler. Stream formatı son tam kayda kadar her zaman okunabildiği için çökme sonrası
+  açık dosya kurtarılabilir.
+- Dosya max_file_rows satıra ulaşınca, rotate_interval saniyeden (varsayılan bir saat) eskiyince veya gün
+  değişince döndürülür: stream, date=YYYY-MM-DD/ altında tek bir Parquet dosyasına çevrilir. Bölüm, yazım anının
+  değil kaydın kendi zaman damgasının (UTC) günüdür; gece yarısını geçen bir grup iki bölüme bölünür. Sorgular
+  pyarrow.dataset ile sadece gereken sütun ve bölümleri okur; canlı kayıtlar en geç rotate_interval sonra görünür.
+- Kayıt satırları log çağrısında oluşturulur, hatalı girdi çağırana hata olarak döner. Yazıcıda bir kaydın
+  dönüşümü veya bir grubun yazımı başarısız olursa kayıtlar _dead_letter/ altına Parquet olarak bırakılır ve
+  iş parçacığı çalışmaya devam eder; hata sayıları ve yazıcının durumu stats ile izlenir. Stream'e yazılmış bir
+  grup, sonraki adımlar (fsync, döndürme) başarısız olsa da dead-letter'a gitmez; tekrar oynatmada çift kayıt
+  oluşmaz.
+
+fsync politikaları:
+- "batch": her eklenen kayıt grubundan sonra fsync (en güvenli)
+- "rotate": sadece dosya kapatılırken fsync
+- "never": işletim sistemine bırakılır
+
+Kullanım (sorgu):
+    python -m credit_scoring.audit --since 2026-10-01 --model supervised --decision Rejected
+"""
+import argparse
+import atexit
+import glob
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from credit_scoring.schema import (
+    AUDIT_LOG_DIR, CATEGORICAL_VOCABULARIES, CUSTOMER_ID_COL, LOAN_TYPES, NUMERIC_COLS, PAYMENT_OF_MIN_COL
+)
+
+FSYNC_POLICIES = ("batch", "rotate", "never")
+INPROGRESS_PREFIX = "_inprogress-"
+# pyarrow.dataset "_" ile başlayan klasörleri atladığı için sorgulara karışmaz
+DEAD_LETTER_DIR = "_dead_letter"
+DAY_MS = 86_400_000
+
+AUDIT_SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ("request_id", pa.string()),
+        ("source", pa.string()),
+        ("model", pa.string()),
+        ("model_version", pa.int32()),
+        ("probability", pa.float64()),
+        ("decision", pa.string()),
+        ("latency_ms", pa.float64()),
+        (CUSTOMER_ID_COL, pa.string()),
+    ]
+    + [(col, pa.float64()) for col in NUMERIC_COLS + [PAYMENT_OF_MIN_COL]]
+    + [(col, pa.string()) for col in CATEGORICAL_VOCABULARIES]
+    + [(col, pa.int8()) for col in LOAN_TYPES]
+)
+
+
+def day_groups(table):
+    """
+    Tabloyu kayıtların zaman damgası gününe (UTC, YYYY-MM-DD) göre böler.
+
+    Her grup tek Arrow kaydı olarak yazılsın diye parçaları birleştirilir.
+    """
+    days = table.column("timestamp").cast(pa.int64()).to_numpy() // DAY_MS
+    for day in np.unique(days):
+        group = table if days[0] == days[-1] == day else table.filter(pa.array(days == day))
+        yield str(np.datetime64(int(day), "D")), group.combine_chunks()
+
+
+def audit_records(timestamp, inputs, model, probability, decision, latency_ms, model_version=None, source="page"):
+    """
+    Ham başvurulardan denetim kayıtları (AUDIT_SCHEMA sütunları). Gecikme toplam süredir; satırlara bölünür.
+    """
+    n = len(inputs)
+    records = pd.DataFrame({
+        "timestamp": pd.Timestamp(timestamp, unit="s", tz="UTC").floor("ms"),
+        "request_id": [uuid.uuid4().hex for _ in range(n)],
+        "source": source,
+        "model": model,
+        "model_version": pd.array([model_version] * n, dtype="Int32"),
+        "probability": np.asarray(probability, dtype=np.float64),
+        "decision": np.where(np.asarray(decision) == 1, "Rejected", "Approved"),
+        "latency_ms": latency_ms / max(n, 1),
+    })
+    records[CUSTOMER_ID_COL] = (
+        inputs[CUSTOMER_ID_COL].astype(str).to_numpy() if CUSTOMER_ID_COL in inputs.columns else None
+    )
+    for col in NUMERIC_COLS + [PAYMENT_OF_MIN_COL]:
+        records[col] = inputs[col].to_numpy(dtype=np.float64)
+    for col in CATEGORICAL_VOCABULARIES:
+        records[col] = inputs[col].astype(str).to_numpy()
+    for col in LOAN_TYPES:
+        records[col] = inputs[col].to_numpy(dtype=np.int8)
+    return records
+
+
+class AuditLogger:
+    """Sınırlı kuyruk + arka plan yazıcısı; log çağrısı hiçbir zaman disk G/Ç'sini beklemez."""
+
+    def __init__(self, directory=AUDIT_LOG_DIR, max_queue=10_000, batch_rows=1000, flush_interval=1.0,
+                 max_file_rows=100_000, rotate_interval=3600.0, fsync="batch"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync politikası {FSYNC_POLICIES} değerlerinden biri olmalı: {fsync}")
+        self.directory = directory
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.max_file_rows = max_file_rows
+        self.rotate_interval = rotate_interval
+        self.fsync = fsync
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.written = 0
+        self.files = 0
+        self.errors = 0
+        self.dead_lettered = 0
+        self.lost = 0
+        self.last_error = None
+        self._stream = None
+        self._closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        recover(directory)
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def log(self, inputs, model, probability, decision, latency_ms, model_version=None, source="page",
+            block=False):
+        """
+        Kararları kuyruğa bırakır. Sayfalar block=False kullanır (kuyruk doluysa kayıt düşürülür);
+        toplu işler kaybı önlemek için block=True ile bekleyebilir.
+
+        Kayıt satırları burada oluşturulur: hatalı girdi (eksik sütun, uzunluk uyuşmazlığı) çağırana döner.
+
+        Returns:
+            Kayıt kuyruğa alındıysa True
+        """
+        records = audit_records(time.time(), inputs, model, probability, decision, latency_ms, model_version, source)
+        try:
+            self.queue.put(records, block=block)
+            return True
+        except queue.Full:
+            self.dropped += len(inputs)
+            return False
+
+    def stats(self):
+        """
+        Kuyruk ve yazıcı sayaçları. dead_lettered: _dead_letter/ altına bırakılan, lost: oraya da yazılamayan
+        satırlar; writer_alive False ise yeni kayıtlar diske ulaşmaz.
+        """
+        return {"queued": self.queue.qsize(), "written": self.written, "dropped": self.dropped,
+                "files": self.files, "errors": self.errors, "dead_lettered": self.dead_lettered, "lost": self.lost,
+                "last_error": self.last_error, "writer_alive": self._thread.is_alive()}
+
+    def close(self, timeout=10.0):
+        """Kuyruğu boşaltır, açık dosyayı Parquet'e çevirip kapatır."""
+        if self._closed:
+            return
+        self._closed = True
+        if not self._thread.is_alive():
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    # === Arka plan yazıcısı: hiçbir kayıt veya G/Ç hatası iş parçacığını durdurmaz
+    def _run(self):
+        pending, pending_rows = [], 0
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self.queue.get(timeout=max(deadline - time.monotonic(), 0.01))
+            except queue.Empty:
+                item = False
+            if item is None:
+                self._flush(pending)
+                self._guard(self._rotate)
+                return
+            if item is not False:
+                # Kayıt kayıt dönüştürülür: şemaya uymayan bir kayıt grubun geri kalanını bozmaz
+                try:
+                    table = pa.Table.from_pandas(item, schema=AUDIT_SCHEMA, preserve_index=False)
+                except Exception as e:
+                    self._dead_letter(item, e)
+                else:
+                    pending.append(table)
+                    pending_rows += table.num_rows
+            if pending and (pending_rows >= self.batch_rows or time.monotonic() >= deadline):
+                self._flush(pending)
+                pending, pending_rows = [], 0
+            if time.monotonic() >= deadline:
+                # Boşta da eski dosya döndürülür; son kayıtlar en geç rotate_interval sonra sorgulanabilir
+                if self._stream is not None and self._stale(self._stream):
+                    self._guard(self._rotate)
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, tables):
+        if not tables:
+            return
+        for day, table in day_groups(pa.concat_tables(tables)):
+            try:
+                self._write(table, day)
+            except Exception as e:
+                # Yarım kalan stream kapatılır (yarım kayıt mühürlemede atlanır); sonraki grup yeni dosyaya yazılır
+                self._guard(self._discard_stream)
+                self._dead_letter(table, e)
+            else:
+                # Grup stream'de: bundan sonraki hatalar sadece sayılır, kayıtlar dead-letter'a kopyalanmaz
+                self._guard(self._after_write)
+
+    def _guard(self, step):
+        try:
+            step()
+        except Exception as e:
+            self._record_error(e)
+
+    def _record_error(self, error):
+        self.errors += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+
+    def _dead_letter(self, records, error):
+        """Yazılamayan kayıtları (Arrow tablosu veya DataFrame) _dead_letter/ altına Parquet olarak bırakır."""
+        self._record_error(error)
+        rows = records.num_rows if isinstance(records, pa.Table) else len(records)
+        try:
+            directory = os.path.join(self.directory, DEAD_LETTER_DIR)
+            os.makedirs(directory, exist_ok=True)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S%f")
+            path = os.path.join(directory, f"audit-{stamp}-{os.getpid()}.parquet")
+            if isinstance(records, pa.Table):
+                pq.write_table(records, path)
+            else:
+                records.to_parquet(path, index=False)
+            self.dead_lettered += rows
+        except Exception as e:
+            self._record_error(e)
+            self.lost += rows
+
+    def _stale(self, stream):
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        return stream["day"] != day or time.monotonic() - stream["opened"] >= self.rotate_interval
+
+    def _write(self, table, day):
+        """Tek günlük grubu o günün stream'ine tek Arrow kaydı olarak ekler."""
+        if self._stream is not None and (self._stream["day"] != day or self._stale(self._stream)):
+            self._rotate()
+        if self._stream is None:
+            self._open(day)
+        self._stream["writer"].write_table(table)
+        self._stream["rows"] += table.num_rows
+        self.written += table.num_rows
+
+    def _after_write(self):
+        if self._stream is None:
+            return
+        if self.fsync == "batch":
+            self._stream["file"].flush()
+            os.fsync(self._stream["file"].fileno())
+        if self._stream["rows"] >= self.max_file_rows:
+            self._rotate()
+
+    def _open(self, day):
+        partition = os.path.join(self.directory, f"date={day}")
+        os.makedirs(partition, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%H%M%S%f")
+        name = f"audit-{stamp}-{os.getpid()}"
+        f = open(os.path.join(partition, f"{INPROGRESS_PREFIX}{name}.arrows"), "wb")
+        self._stream = {"day": day, "rows": 0, "file": f, "name": name, "opened": time.monotonic(),
+                        "writer": pa.ipc.new_stream(f, AUDIT_SCHEMA)}
+
+    def _rotate(self):
+        if self._stream is None:
+            return
+        stream, self._stream = self._stream, None
+        stream["writer"].close()
+        if self.fsync != "never":
+            stream["file"].flush()
+            os.fsync(stream["file"].fileno())
+        stream["file"].close()
+        seal(stream["file"].name, fsync=self.fsync != "never")
+        self.files += 1
+
+    def _discard_stream(self):
+        """Yazım hatasından sonra açık stream'i bırakır; son tam kayda kadarki kısmı Parquet'e çevrilmeye çalışılır."""
+        stream, self._stream = self._stream, None
+        if stream is None:
+            return
+        try:
+            stream["writer"].close()
+        except Exception:
+            pass
+        stream["file"].close()
+        seal(stream["file"].name, fsync=False)
+        self.files += 1
+
+
+def seal(stream_path, fsync=True):
+    """Arrow IPC stream dosyasını (son tam kayda kadar) aynı klasörde Parquet'e çevirir ve siler."""
+    with pa.OSFile(stream_path, "rb") as source:
+        batches = []
+        try:
+            reader = pa.ipc.open_stream(source)
+            for batch in reader:
+                batches.append(batch)
+        except (pa.ArrowInvalid, OSError):
+            pass  # Çökme sırasında yarım kalan son kayıt atlanır
+    if batches:
+        directory = os.path.dirname(stream_path)
+        name = os.path.basename(stream_path)[len(INPROGRESS_PREFIX):].rsplit(".", 1)[0] + ".parquet"
+        tmp = os.path.join(directory, f"{INPROGRESS_PREFIX}{name}")
+        with open(tmp, "wb") as f:
+            pq.write_table(pa.Table.from_batches(batches, schema=AUDIT_SCHEMA), f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(directory, name))
+    os.remove(stream_path)
+
+
+def _writer_alive(stream_path):
+    pid = int(os.path.basename(stream_path).rsplit(".", 1)[0].rsplit("-", 1)[1])
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def recover(directory=AUDIT_LOG_DIR):
+    """Önceki bir çalışmadan (ör. çökme) kalan, yazan süreci artık yaşamayan stream dosyalarını Parquet'e çevirir."""
+    for path in glob.glob(os.path.join(directory, "date=*", f"{INPROGRESS_PREFIX}*.arrows")):
+        if not _writer_alive(path):
+            seal(path)
+
+
+def open_dataset(directory=AUDIT_LOG_DIR):
+    """
+    Kapanmış denetim dosyaları; _inprogress- dosyaları ve _dead_letter/ pyarrow.dataset tarafından atlanır.
+    Açık dosyadaki kayıtlar en geç rotate_interval sonra burada görünür.
+    """
+    return ds.dataset(directory, format="parquet", partitioning="hive", schema=AUDIT_SCHEMA.append(
+        pa.field("date", pa.string())))
+
+
+def query(directory=AUDIT_LOG_DIR, since=None, until=None, model=None, decision=None, columns=None):
+    """
+    Denetim kayıtlarını filtreleyerek okur; tarih bölümleri ve sütunlar dosya düzeyinde elenir.
+
+    Returns:
+        DataFrame
+    """
+    expr = None
+    conditions = []
+    if since:
+        conditions.append(ds.field("date") >= since)
+    if until:
+        conditions.append(ds.field("date") <= until)
+    if model:
+        conditions.append(ds.field("model") == model)
+    if decision:
+        conditions.append(ds.field("decision") == decision)
+    for condition in conditions:
+        expr = condition if expr is None else expr & condition
+    return open_dataset(directory).to_table(columns=columns, filter=expr).to_pandas()
+
+
+_shared_logger = None
+_shared_lock = threading.Lock()
+
+
+def shared_logger(directory=AUDIT_LOG_DIR):
+    """Süreç genelinde tek denetim kaydedici; çıkışta kuyruk boşaltılıp dosya kapatılır."""
+    global _shared_logger
+    with _shared_lock:
+        if _shared_logger is None:
+            _shared_logger = AuditLogger(directory)
+            atexit.register(_shared_logger.close)
+        return _shared_logger
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tahmin denetim kayıtlarını sorgular.")
+    parser.add_argument("--dir", default=AUDIT_LOG_DIR)
+    parser.add_argument("--since", default=None, help="Başlangıç günü (YYYY-MM-DD)")
+    parser.add_argument("--until", default=None, help="Bitiş günü (YYYY-MM-DD)")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--decision", choices=["Approved", "Rejected"], default=None)
+    parser.add_argument("--output", default=None, help="Sonucun yazılacağı dosya (.csv/.parquet)")
+    args = parser.parse_args(argv)
+
+    recover(args.dir)
+    result = query(args.dir, args.since, args.until, args.model, args.decision)
+    print(f"{len(result):,} kayıt")
+    if args.output:
+        if args.output.endswith(".parquet"):
+            result.to_parquet(args.output, index=False)
+        else:
+            result.to_csv(args.output, index=False)
+    else:
+        print(result.tail(20).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Çok çekirdekli toplu skorlama.
+
+Özellik matrisi float32 bir .npy dosyasına yazılır (varsayılan olarak RAM üzerindeki /dev/shm altında) ve
+işçi süreçlerde mmap ile açılır; satır verisi süreçler arasında hiç pickle edilmez. Her işçi models/
+dosyalarını başlangıçta bir kez yükler ve tek iş parçacığıyla çalışır. Ana süreç sadece (başlangıç, bitiş)
+satır aralıklarını dağıtır; işçiler sonuçları önceden ayrılmış ortak çıktı dizisine (yine mmap'li .npy)
+kendi aralıklarına yazar. Böylece verim çekirdek sayısıyla yaklaşık doğrusal artar.
+
+Kullanım:
+    python -m credit_scoring.batch data/musteriler.csv data/skorlar.parquet --model supervised --jobs 8
+    python -m credit_scoring.batch data/ozellikler.npy data/skorlar.npy --jobs 8   # hazır özellik matrisi
+    python -m credit_scoring.batch data/df_for_model data/skorlar.parquet   # notebook'un hazır model girdisi
+    python -m credit_scoring.batch data/musteri_idleri.csv data/skorlar.csv        # sadece Customer_ID sütunu
+    python -m credit_scoring.batch data/musteriler.csv data/skorlar.csv --model cascade  # kademeli skorlama
+    python -m credit_scoring.batch data/musteriler.csv data/skorlar.csv --model supervised_fast  # öğrenci
+    python -m credit_scoring.batch data/musteriler.csv data/skorlar.csv --shadow  # aday model de skorlanır
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from credit_scoring.artifacts import current_version, version_path
+from credit_scoring.audit import AuditLogger
+from credit_scoring.cascade import CascadeModel, CascadePipeline
+from credit_scoring.dataset_io import load_model_matrix, read_manifest
+from credit_scoring.feature_store import FeatureStore
+from credit_scoring.features import encode_raw
+from credit_scoring.pipelines import DECISION_THRESHOLD, MODEL_DTYPE, load_pickle, single_threaded
+from credit_scoring.schema import CUSTOMER_ID_COL, MONTH_COL
+from credit_scoring.shadow import SHADOW_PIPELINES, ShadowStats, candidate_version, stats_path
+from credit_scoring.training import ARTIFACT_NAMES, PIPELINES, STUDENT_PIPELINES, read_data
+
+DEFAULT_CHUNK_ROWS = 50_000
+SHARED_TMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+SCORING_PIPELINES = {
+    **PIPELINES, CascadePipeline.name: CascadePipeline,
+    **{pipeline.name: pipeline for pipeline in STUDENT_PIPELINES.values()},
+}
+
+# İşçi süreç durumu (_init_worker ile bir kez doldurulur)
+_worker = {}
+
+
+def _single_threaded(model):
+    """Süreç havuzunda çekirdekler süreçlere dağıtıldığı için modelin kendi iş parçacıkları kapatılır."""
+    if isinstance(model, CascadeModel):
+        single_threaded(model.first_stage)
+        single_threaded(model.stack)
+        return model
+    return single_threaded(model)
+
+
+def _init_worker(model, features_path, output_path, model_path=None):
+    # model_path: gölge skorlamada aday sürümün dosyası (özellikler aynı hattın dönüşümüyle yazılmıştır)
+    model = load_pickle(model_path) if model_path else SCORING_PIPELINES[model].load().model
+    _worker["model"] = _single_threaded(model)
+    _worker["X"] = np.load(features_path, mmap_mode="r")
+    _worker["out"] = np.load(output_path, mmap_mode="r+")
+
+
+def _score_chunk(bounds):
+    start, stop = bounds
+    t = time.perf_counter()
+    _worker["out"][start:stop] = _worker["model"].predict_proba(_worker["X"][start:stop])[:, 1]
+    return time.perf_counter() - t
+
+
+def chunk_bounds(n_rows, chunk_size=DEFAULT_CHUNK_ROWS):
+    return [(start, min(start + chunk_size, n_rows)) for start in range(0, n_rows, chunk_size)]
+
+
+def write_feature_matrix(df, path, model="supervised", chunk_size=DEFAULT_CHUNK_ROWS):
+    """
+    Ham başvuruları parça parça model girdisine çevirip float32 .npy dosyasına yazar. df hazır model girdisi
+    klasörünün yoluysa (training.read_data) sütunları dönüşümsüz olarak doğrudan dosyaya kopyalanır.
+
+    Returns:
+        Yazılan dosyanın yolu
+    """
+    feature_names = SCORING_PIPELINES[model].feature_names
+    if isinstance(df, str):
+        X = np.lib.format.open_memmap(path, mode="w+", dtype=MODEL_DTYPE,
+                                      shape=(read_manifest(df)["rows"], len(feature_names)))
+        load_model_matrix(df, feature_names, out=X)
+    else:
+        pipeline = SCORING_PIPELINES[model].load()
+        X = np.lib.format.open_memmap(path, mode="w+", dtype=MODEL_DTYPE, shape=(len(df), len(feature_names)))
+        for start, stop in chunk_bounds(len(df), chunk_size):
+            X[start:stop] = pipeline.transform(encode_raw(df.iloc[start:stop]))
+    X.flush()
+    del X
+    return path
+
+
+def score_matrix(features_path, output_path, model="supervised", jobs=None, chunk_size=DEFAULT_CHUNK_ROWS,
+                 model_path=None):
+    """
+    .npy özellik matrisini süreç havuzunda skorlar; Rejected olasılıkları output_path'e (.npy) yazılır.
+    model_path verilirse hattın etkin modeli yerine o dosyadaki model kullanılır.
+
+    Returns:
+        rapor dict (satır, işçi, süre, satır/sn, paralel verimlilik)
+    """
+    jobs = jobs or os.cpu_count()
+    n_rows = np.load(features_path, mmap_mode="r").shape[0]
+    out = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.float64, shape=(n_rows,))
+    del out
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(model, features_path, output_path, model_path)) as pool:
+        worker_seconds = sum(pool.map(_score_chunk, chunk_bounds(n_rows, chunk_size)))
+    seconds = time.perf_counter() - start
+    return {
+        "rows": n_rows,
+        "jobs": jobs,
+        "chunk_size": chunk_size,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(n_rows / seconds),
+        "parallel_efficiency": round(worker_seconds / (seconds * jobs), 3),
+    }
+
+
+def shadow_matrix(features_path, champion_proba, champion_report, model="supervised", jobs=None,
+                  chunk_size=DEFAULT_CHUNK_ROWS, tmp_dir=SHARED_TMP_DIR):
+    """
+    Şampiyon skorlandıktan sonra aynı özellik matrisini aday sürümle skorlar ve gölge istatistiklerini
+    logs/shadow altına yazar; şampiyonun süresi ve çıktısı etkilenmez.
+
+    Returns:
+        gölge özeti dict; aday yoksa None
+    """
+    name = ARTIFACT_NAMES[model]
+    version = candidate_version(name)
+    if version is None:
+        return None
+    work_dir = tempfile.mkdtemp(prefix="credit-shadow-", dir=tmp_dir)
+    try:
+        output_path = os.path.join(work_dir, "proba.npy")
+        report = score_matrix(features_path, output_path, model, jobs, chunk_size, version_path(name, version))
+        rows = max(report["rows"], 1)
+        stats = ShadowStats(name, version, current_version(name))
+        stats.update(champion_proba, np.load(output_path, mmap_mode="r"),
+                     1000 * champion_report["seconds"] / rows, 1000 * report["seconds"] / rows)
+        stats.write(stats_path(name, version, "batch"))
+        return stats.summary()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def score_frame(df, model="supervised", jobs=None, chunk_size=DEFAULT_CHUNK_ROWS, tmp_dir=SHARED_TMP_DIR,
+                shadow=False):
+    """
+    Ham başvuruları (veya hazır model girdisi klasörünü) paralel skorlar; ara matrisler geçici (varsayılan RAM
+    üzerindeki) .npy dosyalarıdır. shadow=True ise aynı özellik matrisi ardından aday modelle de skorlanır
+    (rapor["shadow"]).
+
+    Returns:
+        (Rejected olasılıkları, rapor dict)
+    """
+    work_dir = tempfile.mkdtemp(prefix="credit-batch-", dir=tmp_dir)
+    try:
+        features_path = write_feature_matrix(df, os.path.join(work_dir, "features.npy"), model, chunk_size)
+        output_path = os.path.join(work_dir, "proba.npy")
+        report = score_matrix(features_path, output_path, model, jobs, chunk_size)
+        proba = np.array(np.load(output_path, mmap_mode="r"))
+        if shadow:
+            report["shadow"] = shadow_matrix(features_path, proba, report, model, jobs, chunk_size, tmp_dir)
+        return proba, report
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def audit_batch(df, proba, report, model="supervised", chunk_size=DEFAULT_CHUNK_ROWS):
+    """Toplu skorlama kararlarını denetim kaydına yazar; kayıp olmaması için kuyrukta beklenir."""
+    logger = AuditLogger()
+    version = current_version(ARTIFACT_NAMES[model])
+    latency_ms = 1000 * report["seconds"] / max(report["rows"], 1)
+    for start, stop in chunk_bounds(len(df), chunk_size):
+        decision = (proba[start:stop] >= DECISION_THRESHOLD).astype(int)
+        logger.log(df.iloc[start:stop], model, proba[start:stop], decision, latency_ms * (stop - start),
+                   version, source="batch", block=True)
+    logger.close(timeout=None)
+    return logger.stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Başvuruları süreç havuzunda paralel skorlar.")
+    parser.add_argument("data", help="Ham başvurular / Customer_ID listesi (CSV/Parquet) veya float32 özellik "
+                                     "matrisi (.npy)")
+    parser.add_argument("output", help="Çıktı: .npy (sadece olasılıklar), .parquet veya .csv")
+    parser.add_argument("--model", choices=sorted(SCORING_PIPELINES), default="supervised")
+    parser.add_argument("--jobs", type=int, default=None, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--audit", action="store_true", help="Kararları denetim kaydına yaz (ham girdi gerekir)")
+    parser.add_argument("--shadow", action="store_true", help="Aday model sürümünü de skorla (shadow.py)")
+    args = parser.parse_args(argv)
+    if args.shadow and args.model not in SHADOW_PIPELINES:
+        parser.error(f"Gölge skorlama {sorted(SHADOW_PIPELINES)} modelleri için desteklenir")
+
+    if args.data.endswith(".npy"):
+        if not args.output.endswith(".npy"):
+            parser.error("Hazır özellik matrisi için çıktı .npy olmalıdır")
+        report = score_matrix(args.data, args.output, args.model, args.jobs, args.chunk_size)
+        if args.shadow:
+            report["shadow"] = shadow_matrix(args.data, np.load(args.output, mmap_mode="r"), report, args.model,
+                                             args.jobs, args.chunk_size)
+    else:
+        df = read_data(args.data, SCORING_PIPELINES[args.model].feature_names)
+        # Hazır model girdisi (notebook'un df_for_model'i) klasör yolu olarak kalır; ham alanları yoktur
+        model_ready = isinstance(df, str)
+        if model_ready and args.audit:
+            parser.error("Hazır model girdisinde ham başvuru alanları yok; --audit kullanılamaz")
+        if not model_ready and list(df.columns) == [CUSTOMER_ID_COL]:
+            # Sadece ID listesi: müşterilerin son ay özellikleri özellik deposundan alınır
+            store = FeatureStore.open()
+            df = store.frame(df[CUSTOMER_ID_COL])
+            print(f"{len(df):,} müşteri özellik deposunda bulundu ({store.version})")
+        proba, report = score_frame(df, args.model, args.jobs, args.chunk_size, shadow=args.shadow)
+        if args.audit:
+            audit_batch(df, proba, report, args.model, args.chunk_size)
+        if args.output.endswith(".npy"):
+            np.save(args.output, proba)
+        else:
+            if model_ready:
+                result = pd.DataFrame(index=pd.RangeIndex(len(proba)))
+            else:
+                result = df[[c for c in (CUSTOMER_ID_COL, MONTH_COL) if c in df.columns]].copy()
+            result["rejected_proba"] = proba
+            result["decision"] = np.where(proba >= DECISION_THRESHOLD, "Rejected", "Approved")
+            if args.output.endswith(".parquet"):
+                result.to_parquet(args.output, index=False)
+            else:
+                result.to_csv(args.output, index=False)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Kademeli (cascade) skorlama: önce sığ bir model, tam stack sadece belirsiz başvurular için.
+
+Her başvuru tam StackingClassifier'dan (üç ağaç topluluğu + LogisticRegression) geçiyordu; oysa profillerin
+çoğu açıktır. İlk aşama, stack ile aynı 35 özellikte eğitilmiş tek ve sığ bir LightGBM'dir
+(training.build_first_stage, tam eğitimde stack ile birlikte kaydedilir). İlk aşamanın Rejected olasılığı
+belirsizlik bandının dışındaysa (p <= alt sınır: onay, p >= üst sınır: ret) karar onundur; bandın içindeki
+satırlar stack_supervised.pkl ile skorlanır. Band CASCADE_BAND ortam değişkeniyle ("0.1,0.9") ayarlanır.
+
+evaluate aynı veride tam stack ile karar uyumunu, stack'e giden satır oranını, toplu ve tek başvuru
+(sayfalardaki kullanım) ortalama gecikme kazancını ve birkaç band için uyum/yönlendirme oranlarını raporlar.
+
+Kullanım:
+    python -m credit_scoring.cascade fit data/train.csv
+    python -m credit_scoring.cascade evaluate data/test.csv --band 0.1 0.9
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from credit_scoring.artifacts import current_version, save_versioned
+from credit_scoring.features import encode_raw
+from credit_scoring.pipelines import DECISION_THRESHOLD, SupervisedPipeline, load_pickle, mean_row_ms
+from credit_scoring.schema import CASCADE_FIRST_STAGE_PATH, CLASSIC_SCALER_PATH, STACK_MODEL_PATH
+from credit_scoring.training import (
+    ARTIFACT_NAMES, FIRST_STAGE_ARTIFACT, binary_target, build_first_stage, read_frame
+)
+
+CASCADE_BAND = tuple(float(v) for v in os.environ.get("CASCADE_BAND", "0.1,0.9").split(","))
+SWEEP_BANDS = [(0.02, 0.98), (0.05, 0.95), (0.1, 0.9), (0.2, 0.8), (0.3, 0.7)]
+
+
+def check_band(band):
+    lower, upper = band
+    if not 0.0 <= lower < DECISION_THRESHOLD <= upper <= 1.0:
+        raise ValueError(f"Belirsizlik bandı {band}: 0 <= alt < {DECISION_THRESHOLD} <= üst <= 1 olmalıdır")
+    return float(lower), float(upper)
+
+
+class CascadeModel:
+    """İlk aşama + stack; sklearn modelleri gibi predict_proba(X) -> (n, 2)."""
+
+    def __init__(self, first_stage, stack, band=CASCADE_BAND):
+        self.first_stage = first_stage
+        self.stack = stack
+        self.band = check_band(band)
+
+    def route(self, X):
+        """
+        Returns:
+            (Rejected olasılıkları, stack'e gönderilen satırların maskesi)
+        """
+        lower, upper = self.band
+        proba = self.first_stage.predict_proba(X)[:, 1]
+        uncertain = (proba > lower) & (proba < upper)
+        if uncertain.any():
+            proba[uncertain] = self.stack.predict_proba(X[uncertain])[:, 1]
+        return proba, uncertain
+
+    def predict_proba(self, X):
+        proba, _ = self.route(X)
+        return np.column_stack([1 - proba, proba])
+
+    def predict(self, X):
+        return (self.route(X)[0] >= DECISION_THRESHOLD).astype(int)
+
+
+class CascadePipeline(SupervisedPipeline):
+    """SupervisedPipeline ile aynı özellikler; model CascadeModel'dir."""
+
+    name = "cascade"
+
+    @classmethod
+    def load(cls, scaler_path=CLASSIC_SCALER_PATH, model_path=STACK_MODEL_PATH,
+             first_stage_path=CASCADE_FIRST_STAGE_PATH, band=CASCADE_BAND):
+        model = CascadeModel(load_pickle(first_stage_path), load_pickle(model_path), band)
+        return cls(load_pickle(scaler_path), model)
+
+    @classmethod
+    def from_supervised(cls, pipeline, first_stage_path=CASCADE_FIRST_STAGE_PATH, band=CASCADE_BAND):
+        """Yüklü bir SupervisedPipeline'ın scaler ve stack'ini paylaşır (modeller ikinci kez yüklenmez)."""
+        return cls(pipeline.scaler, CascadeModel(load_pickle(first_stage_path), pipeline.model, band))
+
+    def route(self, blocks):
+        """
+        Returns:
+            (Rejected olasılıkları, kararı stack'in verdiği satırların maskesi); maskede False olan satırların
+            kararı ilk aşamanındır (açıklamaları da ilk aşamadan üretilmelidir)
+        """
+        return self.model.route(self.transform(blocks))
+
+
+def fit_first_stage(df, target_col=None, promote=True):
+    """
+    Mevcut stack'i değiştirmeden ilk aşamayı verilen veriyle eğitir ve sürümlü kaydeder.
+
+    Returns:
+        (sürüm, dosya yolu)
+    """
+    pipeline = SupervisedPipeline.load()
+    X = pipeline.transform(encode_raw(df))
+    first_stage = build_first_stage().fit(X, binary_target(df, target_col))
+    metadata = {"stack_version": current_version(ARTIFACT_NAMES["supervised"]), "rows": int(len(X))}
+    return save_versioned(first_stage, FIRST_STAGE_ARTIFACT, metadata, promote=promote)
+
+
+def band_sweep(first_proba, stack_decision, bands=SWEEP_BANDS):
+    """
+    Bandlar için stack'e giden satır oranı ve tam stack ile karar uyumu (tek ilk aşama tahmininden).
+
+    Band içindeki satırları stack skorladığından uyumsuzluk sadece ilk aşamanın emin olduğu satırlardadır.
+    """
+    first_decision = first_proba >= DECISION_THRESHOLD
+    rows = []
+    for lower, upper in bands:
+        confident = (first_proba <= lower) | (first_proba >= upper)
+        rows.append({
+            "band": (lower, upper),
+            "routed_share": round(float(1 - confident.mean()), 4),
+            "agreement": round(float(1 - (confident & (first_decision != stack_decision)).mean()), 4),
+        })
+    return rows
+
+
+def evaluate(df, pipeline=None, latency_sample=200, seed=42):
+    """
+    Kademeli skorlamayı aynı veride tam stack ile karşılaştırır.
+
+    Returns:
+        rapor dict
+    """
+    pipeline = pipeline or CascadePipeline.load()
+    cascade = pipeline.model
+    X = pipeline.transform(encode_raw(df))
+
+    start = time.perf_counter()
+    stack_proba = cascade.stack.predict_proba(X)[:, 1]
+    stack_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    proba, routed = cascade.route(X)
+    cascade_seconds = time.perf_counter() - start
+
+    stack_decision = stack_proba >= DECISION_THRESHOLD
+    agree = (proba >= DECISION_THRESHOLD) == stack_decision
+    report = {
+        "rows": int(len(X)),
+        "band": cascade.band,
+        "routed_share": round(float(routed.mean()), 4),
+        "agreement": round(float(agree.mean()), 4),
+        "disagreements": int((~agree).sum()),
+        "stack_seconds": round(stack_seconds, 4),
+        "cascade_seconds": round(cascade_seconds, 4),
+        "batch_speedup": round(stack_seconds / cascade_seconds, 2),
+    }
+
+    # Tek başvuru gecikmesi: sayfalar başvuruları tek tek skorlar
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(X), size=min(latency_sample, len(X)), replace=False)
+    stack_ms = mean_row_ms(cascade.stack.predict_proba, X, rows)
+    cascade_ms = mean_row_ms(cascade.predict_proba, X, rows)
+    report.update({
+        "stack_row_ms": round(stack_ms, 3),
+        "cascade_row_ms": round(cascade_ms, 3),
+        "saved_row_ms": round(stack_ms - cascade_ms, 3),
+        "saved_share": round(1 - cascade_ms / stack_ms, 4),
+        "bands": band_sweep(cascade.first_stage.predict_proba(X)[:, 1], stack_decision),
+    })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kademeli skorlamanın ilk aşamasını eğitir ve değerlendirir.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fit = sub.add_parser("fit", help="İlk aşamayı eğitir (stack değişmez)")
+    fit.add_argument("data", help="Eğitim verisi (not_scaled_processed_data.csv biçiminde)")
+    fit.add_argument("--target-col", default=None)
+    fit.add_argument("--no-promote", action="store_true", help="Sürümü kaydet ama etkin ilk aşamayı değiştirme")
+    evaluation = sub.add_parser("evaluate", help="Tam stack ile uyum ve gecikme kazancı")
+    evaluation.add_argument("data")
+    evaluation.add_argument("--band", type=float, nargs=2, default=CASCADE_BAND, metavar=("ALT", "UST"))
+    evaluation.add_argument("--latency-sample", type=int, default=200, help="Tek tek skorlanacak satır sayısı")
+    args = parser.parse_args(argv)
+
+    df = read_frame(args.data)
+    if args.command == "fit":
+        version, path = fit_first_stage(df, args.target_col, promote=not args.no_promote)
+        print(f"v{version} -> {path}")
+        return
+
+    report = evaluate(df, CascadePipeline.load(band=args.band), args.latency_sample)
+    bands = report.pop("bands")
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    print(f"\n{'Band':>14}{'Stack oranı':>13}{'Uyum':>8}")
+    for row in bands:
+        print(f"{str(row['band']):>14}{row['routed_share']:>13.2%}{row['agreement']:>8.2%}")
+
+
+if __name__ == "__main__":
+    main()
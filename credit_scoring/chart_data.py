@@ -0,0 +1,182 @@
+"""
+Büyük veri setleri için sunucu tarafında özetlenmiş plotly grafik verileri.
+
+Plotly express tüm satırları JSON olarak tarayıcıya gönderir; yüz binlerce satırda her etkileşim megabaytlarca
+veri taşır. Buradaki yardımcılar grafiği özet istatistiklerden kurar, böylece gönderilen veri satır sayısından
+bağımsız olarak sınırlı kalır:
+
+- Histogram: kutu sınırları ve sayımlar sunucuda hesaplanır (np.histogram).
+- Box: çeyrekler ve bıyıklar sunucuda hesaplanır, aykırı değerlerden sınırlı bir örnek gösterilir.
+- Violin: yoğunluk sabit bir ızgarada hesaplanır ve box ile birlikte çizilir.
+- Scatter: satır sayısı eşiği aşıldığında renk grubuna göre tabakalı örneklem gönderilir.
+
+Eşik CHART_MAX_ROWS ortam değişkeni ile ayarlanabilir.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+MAX_CHART_ROWS = int(os.environ.get("CHART_MAX_ROWS", 20_000))
+MAX_OUTLIERS_PER_GROUP = 200
+DENSITY_GRID_SIZE = 100
+
+
+def _groups(df, color):
+    """Grupları plotly express ile aynı sırada (ilk görülme sırası) döndürür."""
+    if color is None:
+        return [(None, df)]
+    return [(key, df[df[color] == key]) for key in pd.unique(df[color].dropna())]
+
+
+def _group_color(i, color_discrete_sequence):
+    return color_discrete_sequence[i % len(color_discrete_sequence)] if color_discrete_sequence else None
+
+
+def sample_for_chart(df, stratify=None, max_rows=None, seed=42):
+    """
+    Satır sayısı eşiği aşıyorsa tabakalı örneklem döndürür.
+
+    Her gruptan aynı oranda örnek alınır, böylece grupların oranları korunur.
+    """
+    max_rows = MAX_CHART_ROWS if max_rows is None else max_rows
+    if len(df) <= max_rows:
+        return df
+    if stratify is None:
+        return df.sample(n=max_rows, random_state=seed)
+    return df.groupby(stratify, observed=True).sample(frac=max_rows / len(df), random_state=seed)
+
+
+def histogram_counts(df, x, color=None, nbins=30):
+    """
+    Tüm gruplar için ortak kutu sınırlarıyla histogram sayımlarını hesaplar.
+
+    Returns:
+        DataFrame (group, bin_start, bin_end, Count)
+    """
+    values = df[x].dropna().to_numpy(dtype=float)
+    edges = np.histogram_bin_edges(values, bins=nbins) if values.size else np.linspace(0, 1, nbins + 1)
+    frames = []
+    for key, part in _groups(df, color):
+        counts, _ = np.histogram(part[x].dropna().to_numpy(dtype=float), bins=edges)
+        frames.append(pd.DataFrame({
+            "group": key, "bin_start": edges[:-1], "bin_end": edges[1:], "Count": counts
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def histogram_figure(df, x, color=None, nbins=30, title=None, color_discrete_sequence=None, barmode="overlay"):
+    """px.histogram yerine önceden sayılmış kutularla çizilen histogram."""
+    counts = histogram_counts(df, x, color, nbins)
+    fig = go.Figure()
+    for i, (key, part) in enumerate(counts.groupby("group", sort=False, dropna=False)):
+        fig.add_trace(go.Bar(
+            x=(part["bin_start"] + part["bin_end"]) / 2,
+            y=part["Count"],
+            width=part["bin_end"] - part["bin_start"],
+            name=str(key) if color else x,
+            marker_color=_group_color(i, color_discrete_sequence),
+            opacity=0.6 if barmode == "overlay" and color else 1.0,
+            customdata=part[["bin_start", "bin_end"]],
+            hovertemplate="%{customdata[0]:.3g} - %{customdata[1]:.3g}<br>Sayı: %{y}<extra></extra>",
+        ))
+    fig.update_layout(title=title, barmode=barmode, bargap=0, xaxis_title=x, legend_title_text=color)
+    return fig
+
+
+def box_stats(values):
+    """
+    Tukey box istatistikleri: çeyrekler, bıyıklar (1.5·IQR içindeki en uç veri) ve aykırı değerler.
+    """
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return None
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        "q1": q1, "median": median, "q3": q3, "mean": values.mean(),
+        "lowerfence": inside.min(), "upperfence": inside.max(),
+        "outliers": values[(values < inside.min()) | (values > inside.max())],
+    }
+
+
+def _outlier_sample(outliers, rng):
+    if outliers.size > MAX_OUTLIERS_PER_GROUP:
+        outliers = rng.choice(outliers, MAX_OUTLIERS_PER_GROUP, replace=False)
+    return outliers
+
+
+def box_figure(df, x, y, title=None, color_discrete_sequence=None, seed=42):
+    """px.box(df, x=x, y=y, color=x) yerine sunucuda hesaplanmış çeyreklerle çizilen box grafik."""
+    rng = np.random.default_rng(seed)
+    fig = go.Figure()
+    for i, (key, part) in enumerate(_groups(df, x)):
+        stats = box_stats(part[y].to_numpy(dtype=float))
+        if stats is None:
+            continue
+        color = _group_color(i, color_discrete_sequence)
+        fig.add_trace(go.Box(
+            x=[key], q1=[stats["q1"]], median=[stats["median"]], q3=[stats["q3"]], mean=[stats["mean"]],
+            lowerfence=[stats["lowerfence"]], upperfence=[stats["upperfence"]],
+            name=str(key), legendgroup=str(key), marker_color=color,
+        ))
+        outliers = _outlier_sample(stats["outliers"], rng)
+        if outliers.size:
+            fig.add_trace(go.Scatter(
+                x=[key] * outliers.size, y=outliers, mode="markers", name=str(key), legendgroup=str(key),
+                showlegend=False, marker=dict(color=color, size=4),
+            ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y, legend_title_text=x)
+    return fig
+
+
+def density_grid(values, grid_size=DENSITY_GRID_SIZE):
+    """
+    Sabit ızgarada gaussian çekirdekle yumuşatılmış yoğunluk (Silverman bant genişliği).
+
+    Yoğunluk önce ince bir histogramdan hesaplanır, böylece maliyet satır sayısıyla doğrusal kalır.
+    """
+    values = values[~np.isnan(values)]
+    lo, hi = values.min(), values.max()
+    if hi <= lo:
+        return np.array([lo]), np.array([1.0])
+    grid = np.linspace(lo, hi, grid_size)
+    counts, _ = np.histogram(values, bins=grid_size, range=(lo, hi))
+    step = grid[1] - grid[0]
+    bandwidth = max(1.06 * values.std() * values.size ** (-1 / 5), step)
+    offsets = np.arange(-grid_size + 1, grid_size) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    density = np.convolve(counts, kernel)[grid_size - 1:2 * grid_size - 1]
+    return grid, density / density.max()
+
+
+def violin_figure(df, x, y, title=None, color_discrete_sequence=None, width=0.4):
+    """px.violin(df, x=x, y=y, color=x, box=True) yerine yoğunluk ızgarası ve hazır çeyreklerle çizilen violin."""
+    fig = go.Figure()
+    groups = _groups(df, x)
+    for i, (key, part) in enumerate(groups):
+        values = part[y].to_numpy(dtype=float)
+        stats = box_stats(values)
+        if stats is None:
+            continue
+        color = _group_color(i, color_discrete_sequence)
+        grid, density = density_grid(values)
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([i - density * width, (i + density * width)[::-1]]),
+            y=np.concatenate([grid, grid[::-1]]),
+            fill="toself", mode="lines", line=dict(color=color, width=1), opacity=0.6,
+            name=str(key), legendgroup=str(key), hoverinfo="skip",
+        ))
+        fig.add_trace(go.Box(
+            x=[i], q1=[stats["q1"]], median=[stats["median"]], q3=[stats["q3"]],
+            lowerfence=[stats["lowerfence"]], upperfence=[stats["upperfence"]],
+            width=width / 3, name=str(key), legendgroup=str(key), showlegend=False,
+            marker_color=color, fillcolor="rgba(255,255,255,0.2)",
+        ))
+    fig.update_layout(
+        title=title, legend_title_text=x, xaxis_title=x, yaxis_title=y,
+        xaxis=dict(tickmode="array", tickvals=list(range(len(groups))), ticktext=[str(k) for k, _ in groups]),
+    )
+    return fig
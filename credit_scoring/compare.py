@@ -0,0 +1,88 @@
+"""
+İki modelin (supervised stack ve pseudo label) aynı başvurular üzerinde karşılaştırılması.
+
+Ortak özellik blokları (features.encode_raw) bir kez hesaplanır; iki hat kendi ölçekleme ve tahmin adımlarını
+iki iş parçacıklı bir havuzda eşzamanlı çalıştırır. Ağaç tahmincileri (XGBoost, LightGBM, sklearn ağaçları)
+tahmin sırasında GIL'i bıraktığı için toplam süre yaklaşık olarak yavaş olan modelin süresi kadardır.
+
+Kullanım:
+    python -m credit_scoring.compare data/basvurular.csv --output data/uyusmazliklar.csv
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from credit_scoring.features import encode_raw
+from credit_scoring.pipelines import DECISION_THRESHOLD, PseudoLabelPipeline, SupervisedPipeline
+from credit_scoring.training import read_frame
+
+
+def _timed_proba(pipeline, blocks):
+    start = time.perf_counter()
+    proba = pipeline.predict_proba(blocks)
+    return proba, time.perf_counter() - start
+
+
+def compare_models(df, pipelines=None):
+    """
+    Aynı başvuruları iki modelle eşzamanlı skorlar.
+
+    Returns:
+        (skorlar DataFrame'i: her model için olasılık ve karar + uyuşma, rapor dict)
+    """
+    pipelines = pipelines or [SupervisedPipeline.load(), PseudoLabelPipeline.load()]
+    start = time.perf_counter()
+    blocks = encode_raw(df)
+    encode_seconds = time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=len(pipelines)) as pool:
+        futures = [pool.submit(_timed_proba, pipeline, blocks) for pipeline in pipelines]
+        results = [future.result() for future in futures]
+    wall_seconds = time.perf_counter() - start
+
+    scores = pd.DataFrame(index=df.index)
+    report = {"rows": len(df), "encode_seconds": round(encode_seconds, 4)}
+    for pipeline, (proba, seconds) in zip(pipelines, results):
+        scores[f"{pipeline.name}_proba"] = proba
+        scores[f"{pipeline.name}_decision"] = (proba >= DECISION_THRESHOLD).astype(np.int8)
+        report[f"{pipeline.name}_seconds"] = round(seconds, 4)
+
+    decisions = scores[[f"{p.name}_decision" for p in pipelines]].to_numpy()
+    scores["agree"] = (decisions == decisions[:, :1]).all(axis=1)
+    report["agreement_rate"] = round(float(scores["agree"].mean()), 4) if len(df) else None
+    report["disagreements"] = int((~scores["agree"]).sum())
+    report["wall_seconds"] = round(wall_seconds, 4)
+    return scores, report
+
+
+def disagreement_rows(df, scores):
+    """Modellerin farklı karar verdiği başvurular, iki modelin olasılıklarıyla birlikte."""
+    mask = ~scores["agree"].to_numpy()
+    return pd.concat([df[mask], scores[mask].drop(columns="agree")], axis=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="İki modeli aynı başvurular üzerinde eşzamanlı karşılaştırır.")
+    parser.add_argument("data", help="Ham başvurular (not_scaled_processed_data.csv biçiminde CSV/Parquet)")
+    parser.add_argument("--output", default=None, help="Uyuşmazlık satırlarının yazılacağı dosya (.csv/.parquet)")
+    args = parser.parse_args(argv)
+
+    df = read_frame(args.data)
+    scores, report = compare_models(df)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+    if args.output:
+        rows = disagreement_rows(df, scores)
+        if args.output.endswith(".parquet"):
+            rows.to_parquet(args.output, index=False)
+        else:
+            rows.to_csv(args.output, index=False)
+        print(f"{len(rows):,} uyuşmazlık satırı -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Dataset Story sayfası için önceden hesaplanmış korelasyon istatistikleri.
+
+Veri, sidebar filtrelerinin hücrelerine (Credit_Score x Occupation x Month x Age) bölünür ve her hücre için
+yeterli istatistikler (satır sayısı, toplamlar, çapraz çarpım toplamları) bir kez hesaplanır.
+Yaş ekseninde kümülatif toplam tutulduğu için herhangi bir yaş aralığı iki fark işlemiyle bulunur;
+böylece her filtre kombinasyonunun korelasyon matrisi O(n·k²) tarama yerine hücre birleştirmesiyle elde edilir.
+"""
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ("Credit_Score", "Occupation", "Month")
+AGE_COLUMN = "Age"
+
+
+class CorrelationCells:
+    """
+    Filtre hücresi başına yeterli istatistikler.
+
+    - Değerler sayısal hassasiyet için sütun ortalamalarına göre kaydırılarak toplanır.
+    - Çapraz çarpımlar sadece üst üçgen için saklanır (k·(k+1)/2 değer).
+    - Seçili sütunlarda eksik değer içeren satırlar hesaba katılmaz.
+    """
+
+    def __init__(self, columns, categories, ages, counts, sums, cross):
+        self.columns = list(columns)
+        self.categories = categories
+        self.ages = ages
+        self.counts = counts
+        self.sums = sums
+        self.cross = cross
+        self._tri = np.triu_indices(len(self.columns))
+
+    @classmethod
+    def build(cls, df, columns, filter_columns=FILTER_COLUMNS, age_column=AGE_COLUMN):
+        columns = list(columns)
+        values = df[columns].to_numpy(dtype=float)
+        ages_raw = df[age_column].to_numpy(dtype=float)
+
+        valid = ~np.isnan(values).any(axis=1) & ~np.isnan(ages_raw)
+        categories = {}
+        codes = []
+        for col in filter_columns:
+            col_codes, uniques = pd.factorize(df[col], sort=True)
+            categories[col] = list(uniques)
+            codes.append(col_codes)
+            valid &= col_codes >= 0
+
+        values = values[valid]
+        values -= values.mean(axis=0) if len(values) else 0.0
+        ages = np.unique(ages_raw[valid])
+        age_idx = np.searchsorted(ages, ages_raw[valid])
+
+        group_shape = tuple(len(categories[c]) for c in filter_columns)
+        group_idx = np.ravel_multi_index(tuple(c[valid] for c in codes), group_shape) if group_shape else 0
+        n_groups = int(np.prod(group_shape))
+        cell_idx = group_idx * len(ages) + age_idx
+        n_cells = n_groups * len(ages)
+
+        k = len(columns)
+        rows, cols = np.triu_indices(k)
+        counts = np.bincount(cell_idx, minlength=n_cells).astype(float)
+        sums = np.empty((n_cells, k))
+        for j in range(k):
+            sums[:, j] = np.bincount(cell_idx, weights=values[:, j], minlength=n_cells)
+        cross = np.empty((n_cells, len(rows)))
+        for t, (i, j) in enumerate(zip(rows, cols)):
+            cross[:, t] = np.bincount(cell_idx, weights=values[:, i] * values[:, j], minlength=n_cells)
+
+        # Yaş ekseninde kümülatif toplam: aralık sorguları iki fark işlemine iner
+        counts = np.cumsum(counts.reshape(group_shape + (len(ages),)), axis=-1)
+        sums = np.cumsum(sums.reshape(group_shape + (len(ages), k)), axis=-2)
+        cross = np.cumsum(cross.reshape(group_shape + (len(ages), len(rows))), axis=-2)
+        return cls(columns, categories, ages, counts, sums, cross)
+
+    def _group_selector(self, filters):
+        indices = []
+        for col, allowed in filters.items():
+            if allowed is None:
+                indices.append(np.arange(len(self.categories[col])))
+            else:
+                lookup = {v: i for i, v in enumerate(self.categories[col])}
+                indices.append(np.array([lookup[v] for v in allowed if v in lookup], dtype=int))
+        return np.ix_(*indices)
+
+    def merged_stats(self, credit_scores=None, age_range=None, occupation=None, months=None):
+        """
+        Seçili filtre hücrelerini birleştirir.
+
+        None değerli filtreler tüm kategorileri kapsar (sayfadaki boş seçim / "Tümü" davranışı).
+
+        Returns:
+            (n, sums, cross) -> satır sayısı, sütun toplamları, üst üçgen çapraz çarpım toplamları
+        """
+        filters = {
+            "Credit_Score": credit_scores,
+            "Occupation": None if occupation is None else [occupation],
+            "Month": months,
+        }
+        groups = self._group_selector(filters)
+
+        lo, hi = 0, len(self.ages)
+        if age_range is not None:
+            lo = np.searchsorted(self.ages, age_range[0], side="left")
+            hi = np.searchsorted(self.ages, age_range[1], side="right")
+        if hi <= lo:
+            return 0.0, np.zeros(len(self.columns)), np.zeros(len(self._tri[0]))
+
+        age_axis = len(filters)
+
+        def range_sum(prefix):
+            block = prefix[groups]
+            total = np.take(block, hi - 1, axis=age_axis)
+            if lo > 0:
+                total = total - np.take(block, lo - 1, axis=age_axis)
+            return total.reshape((-1,) + total.shape[age_axis:]).sum(axis=0)
+
+        return range_sum(self.counts), range_sum(self.sums), range_sum(self.cross)
+
+    def correlation(self, credit_scores=None, age_range=None, occupation=None, months=None):
+        """Filtre kombinasyonu için Pearson korelasyon matrisini (DataFrame) döndürür."""
+        n, sums, cross = self.merged_stats(credit_scores, age_range, occupation, months)
+        k = len(self.columns)
+        if n < 2:
+            return pd.DataFrame(np.full((k, k), np.nan), index=self.columns, columns=self.columns)
+
+        q = np.zeros((k, k))
+        q[self._tri] = cross
+        q = q + np.triu(q, 1).T
+        cov = q - np.outer(sums, sums) / n
+        std = np.sqrt(np.clip(np.diag(cov), 0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def strongest_pairs(corr_matrix, threshold=0.3, upper=0.99, top_n=None):
+    """
+    Korelasyon matrisinden en güçlü değişken çiftlerini çıkarır.
+
+    - Her çift bir kez alınır (üst üçgen), kendisiyle olan korelasyonlar (>= upper) atılır.
+    - |r| > threshold olan çiftler mutlak değere göre sıralanır; top_n verilirse tam sıralama yerine
+      np.argpartition ile kısmi sıralama yapılır.
+
+    Returns:
+        DataFrame ('Değişken 1', 'Değişken 2', 'Korelasyon')
+    """
+    values = corr_matrix.to_numpy()
+    rows, cols = np.triu_indices(len(values), k=1)
+    pair_values = values[rows, cols]
+    keep = (np.abs(pair_values) > threshold) & (pair_values < upper)
+    rows, cols, pair_values = rows[keep], cols[keep], pair_values[keep]
+
+    strength = np.abs(pair_values)
+    if top_n is not None and top_n < len(strength):
+        top = np.argpartition(-strength, top_n - 1)[:top_n]
+    else:
+        top = np.arange(len(strength))
+    top = top[np.argsort(-strength[top], kind="stable")]
+
+    names = np.asarray(corr_matrix.columns)
+    return pd.DataFrame({
+        "Değişken 1": names[rows[top]],
+        "Değişken 2": names[cols[top]],
+        "Korelasyon": pair_values[top],
+    })
@@ -0,0 +1,216 @@
+"""
+Model verisi için ikili sütunlu kayıt biçimi (8 ondalıklı CSV yerine).
+
+Bir veri seti bir klasördür: her sütun kendi dtype'ıyla ayrı bir .npy dosyası, metin/kategorik sütunlar ise
+sözlük kodlu (int kodlar .npy'de, değerler manifest'te) saklanır. manifest.json sütun adlarını, sıralarını,
+özgün pandas dtype'larını ve satır sayısını içerir ve en son yazılır; manifest'i olan klasör tamdır.
+
+Okuma ayrıştırma yapmaz: sayısal sütunlar np.load(mmap_mode="c") ile bellek eşlemeli açılır ve kopyasız
+DataFrame'e konur (yazma yapılırsa sadece değişen sayfalar kopyalanır, dosya değişmez). Değerler bit düzeyinde
+aynıdır; NaN'ler de olduğu gibi korunur.
+
+Notebook'un kaydettiği df_for_model ve preprocessed_data klasörleri ham başvuru değil, hazır model girdisidir
+(ölçeklenmiş sayısal sütunlar, Occupation_label gibi kodlar ve target). Bunlar load_model_matrix ile
+DataFrame'e çevrilmeden doğrudan model matrisine okunur; kodlama ve ölçekleme ikinci kez uygulanmaz.
+
+Kullanım:
+    python -m credit_scoring.dataset_io convert data/df_for_model.csv data/df_for_model
+    python -m credit_scoring.dataset_io info data/df_for_model
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from credit_scoring.schema import MODEL_TARGET_COL
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_NAME = "credit-columnar"
+FORMAT_VERSION = 1
+
+
+def is_columnar(path):
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def column_names(path):
+    return [entry["name"] for entry in read_manifest(path)["columns"]]
+
+
+def is_model_matrix(path, feature_names):
+    """Klasör modelin tüm girdi sütunlarını hazır içeriyor mu (notebook'taki df_for_model / preprocessed_data)."""
+    return is_columnar(path) and set(feature_names) <= set(column_names(path))
+
+
+def _code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _column_arrays(series):
+    """Sütunun diske yazılacak dizisi ve manifest girdisi (sözlük kodlu sütunlarda kategori değerleri)."""
+    entry = {"name": series.name, "dtype": str(series.dtype)}
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufmM":
+        return series.to_numpy(), entry
+    # Metin, kategorik ve pandas uzantı tipleri (str, Int64 ...) sözlük kodlanır
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, categories = series.cat.codes.to_numpy(), series.cat.categories
+        entry["ordered"] = bool(series.cat.ordered)
+    else:
+        codes, categories = pd.factorize(series, use_na_sentinel=True)
+    entry["categories"] = [v.item() if hasattr(v, "item") else v for v in categories]
+    return codes.astype(_code_dtype(len(categories))), entry
+
+
+def save_columns(df, path, **metadata):
+    """
+    DataFrame'i sütunlu klasör olarak yazar (index yazılmaz). Klasör varsa yenisi hazırlandıktan sonra
+    değiştirilir; yarıda kalan yazım eski veriyi bozmaz.
+
+    Returns:
+        path
+    """
+    path = path.rstrip(os.sep)
+    staging = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    columns = []
+    for i, col in enumerate(df.columns):
+        values, entry = _column_arrays(df[col])
+        entry["file"] = f"{i:04d}.npy"
+        np.save(os.path.join(staging, entry["file"]), np.ascontiguousarray(values))
+        columns.append(entry)
+    manifest = {
+        "format": FORMAT_NAME, "version": FORMAT_VERSION, "rows": int(len(df)), "columns": columns,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"), **metadata,
+    }
+    with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    if os.path.exists(path):
+        old = f"{path}.old-{os.getpid()}"
+        os.rename(path, old)
+        os.rename(staging, path)
+        shutil.rmtree(old, ignore_errors=True)
+    else:
+        os.rename(staging, path)
+    return path
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_NAME or manifest.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"{path}: desteklenmeyen veri biçimi {manifest.get('format')} v{manifest.get('version')}")
+    return manifest
+
+
+def _restore(values, entry):
+    if "categories" not in entry:
+        return values
+    if entry["dtype"] == "category":
+        return pd.Categorical.from_codes(values, pd.Index(entry["categories"]), ordered=entry["ordered"])
+    categories = pd.Index(entry["categories"], dtype=object)
+    restored = categories.take(values, allow_fill=True, fill_value=np.nan).to_numpy(dtype=object)
+    return pd.Series(restored, dtype=entry["dtype"])
+
+
+def load_columns(path, columns=None, mmap=True):
+    """
+    Sütunlu klasörü DataFrame olarak açar.
+
+    Args:
+        columns: Sadece bu sütunları oku (diğer dosyalara hiç dokunulmaz)
+        mmap: Sayısal sütunları bellek eşlemeli aç (False ise belleğe okunur)
+    """
+    manifest = read_manifest(path)
+    entries = manifest["columns"]
+    if columns is not None:
+        by_name = {entry["name"]: entry for entry in entries}
+        missing = [col for col in columns if col not in by_name]
+        if missing:
+            raise KeyError(f"{path} içinde olmayan sütunlar: {missing}")
+        entries = [by_name[col] for col in columns]
+    data = {}
+    for entry in entries:
+        values = np.load(os.path.join(path, entry["file"]), mmap_mode="c" if mmap else None)
+        # np.memmap alt sınıfı yerine aynı belleği gösteren düz ndarray
+        data[entry["name"]] = _restore(values.view(np.ndarray), entry)
+    return pd.DataFrame(data, index=pd.RangeIndex(manifest["rows"]), copy=False)
+
+
+def load_model_matrix(path, feature_names, target_col=MODEL_TARGET_COL, dtype=np.float32, out=None):
+    """
+    Hazır model girdisi klasörünü model matrisine açar: sütunlar mmap ile açılıp feature_names sırasıyla tek bir
+    önceden ayrılmış matrise kopyalanır. Değerler zaten ölçeklenmiş ve kodlanmış olduğundan dönüşüm uygulanmaz.
+
+    Args:
+        out: Verilirse matris buraya yazılır (ör. toplu skorlamadaki mmap'li .npy)
+
+    Returns:
+        (X (n, k), hedef (n,) int; target_col yoksa None)
+    """
+    manifest = read_manifest(path)
+    by_name = {entry["name"]: entry for entry in manifest["columns"]}
+    missing = [col for col in feature_names if col not in by_name]
+    if missing:
+        raise KeyError(f"{path} içinde olmayan model girdisi sütunları: {missing}")
+    coded = [col for col in feature_names if "categories" in by_name[col]]
+    if coded:
+        raise ValueError(f"{path}: model girdisi sayısal olmalı, sözlük kodlu sütunlar: {coded}")
+    X = np.empty((manifest["rows"], len(feature_names)), dtype=dtype) if out is None else out
+    for j, col in enumerate(feature_names):
+        X[:, j] = np.load(os.path.join(path, by_name[col]["file"]), mmap_mode="r")
+    y = None
+    if target_col in by_name:
+        y = np.load(os.path.join(path, by_name[target_col]["file"])).astype(int, copy=False)
+    return X, y
+
+
+def read_table(path):
+    """Sütunlu klasör, Parquet veya CSV veri dosyasını okur."""
+    if is_columnar(path):
+        return load_columns(path)
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Veri dosyalarını ikili sütunlu biçime çevirir.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="CSV/Parquet dosyasını sütunlu klasöre çevirir")
+    convert.add_argument("source")
+    convert.add_argument("output")
+    convert.add_argument("--na-values", default=None, help="CSV'de NaN sayılacak ek değer (ör. NA)")
+    info = sub.add_parser("info", help="Sütunlu klasörün şemasını gösterir")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        start = time.perf_counter()
+        if args.source.endswith(".parquet"):
+            df = pd.read_parquet(args.source)
+        else:
+            df = pd.read_csv(args.source, na_values=args.na_values)
+        read_seconds = time.perf_counter() - start
+        save_columns(df, args.output, source=os.path.basename(args.source))
+        start = time.perf_counter()
+        load_columns(args.output)
+        print(f"{len(df):,} satır x {df.shape[1]} sütun -> {args.output} | kaynak okuma {read_seconds:.3f} sn, "
+              f"sütunlu açma {time.perf_counter() - start:.4f} sn")
+        return
+
+    manifest = read_manifest(args.path)
+    print(f"{manifest['rows']:,} satır, {len(manifest['columns'])} sütun ({manifest['created']})")
+    for entry in manifest["columns"]:
+        extra = f" ({len(entry['categories'])} kategori)" if "categories" in entry else ""
+        print(f"  {entry['name']}: {entry['dtype']}{extra}")
+
+
+if __name__ == "__main__":
+    main()
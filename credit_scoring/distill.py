@@ -0,0 +1,127 @@
+"""
+Model damıtma: tam modelin olasılıklarından öğrenen küçük bir öğrenci ("hızlı" katman).
+
+HTTP ve kiosk katmanları küçük CPU'larda tek haneli milisaniye tahmin ister; stack_supervised.pkl (üç ağaç
+topluluğu + LogisticRegression) ve pseudo_label_model.pkl buna göre ağırdır. Öğrenci, öğretmen hattıyla aynı
+özelliklerde eğitilen tek bir LightGBM'dir (training.build_student; ağaç sayısı, derinlik ve yaprak bütçesi
+ayarlanabilir). Hedef, öğretmenin predict_proba çıktısıdır (yumuşak etiket): her satır bir kez sınıf 1 ağırlığı
+p, bir kez sınıf 0 ağırlığı 1 - p ile eklenir; ağırlıklı log-loss öğretmenin olasılıklarıyla çapraz entropiye
+eşittir. Öğrenci sıradan bir LGBMClassifier olduğundan açıklamalar (explain.py) ve toplu skorlama değişmeden
+çalışır.
+
+Sadakat raporu: öğretmenle karar uyumu, olasılık farkı (ortalama / p99), etiket varsa iki modelin F1'i ve tek
+başvuru gecikmesi. Öğrenci models/<öğretmen>_student.pkl olarak sürümlü kaydedilir.
+
+Kullanım:
+    python -m credit_scoring.distill data/train.csv --model supervised --eval-data data/test.csv
+    python -m credit_scoring.distill data/train.csv --model pseudo_label --trees 60 --depth 3 --leaves 7
+"""
+import argparse
+
+import numpy as np
+from sklearn.metrics import f1_score
+
+from credit_scoring.artifacts import current_version, save_versioned
+from credit_scoring.pipelines import DECISION_THRESHOLD, mean_row_ms
+from credit_scoring.training import (
+    ARTIFACT_NAMES, PIPELINES, STUDENT_PIPELINES, build_student, model_input, read_data
+)
+
+
+def fit_soft_labels(student, X, soft):
+    """Öğrenciyi öğretmenin olasılıklarıyla eğitir (her satır iki sınıf için ağırlıklı iki kopya)."""
+    X_pair = np.concatenate([X, X])
+    y_pair = np.concatenate([np.ones(len(X), dtype=int), np.zeros(len(X), dtype=int)])
+    weights = np.concatenate([soft, 1 - soft])
+    return student.fit(X_pair, y_pair, sample_weight=weights)
+
+
+def fidelity(teacher, student, X, y=None, latency_sample=200, seed=42):
+    """
+    Öğrencinin öğretmene sadakati ve gecikme kazancı.
+
+    Returns:
+        rapor dict
+    """
+    teacher_proba = teacher.predict_proba(X)[:, 1]
+    student_proba = student.predict_proba(X)[:, 1]
+    gap = np.abs(teacher_proba - student_proba)
+    teacher_decision = teacher_proba >= DECISION_THRESHOLD
+    student_decision = student_proba >= DECISION_THRESHOLD
+    report = {
+        "fidelity_rows": int(len(X)),
+        "agreement": round(float((teacher_decision == student_decision).mean()), 4),
+        "mean_abs_gap": round(float(gap.mean()), 4),
+        "p99_abs_gap": round(float(np.percentile(gap, 99)), 4),
+    }
+    if y is not None:
+        report["teacher_f1"] = round(float(f1_score(y, teacher_decision)), 4)
+        report["student_f1"] = round(float(f1_score(y, student_decision)), 4)
+
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(X), size=min(latency_sample, len(X)), replace=False)
+    teacher_ms = mean_row_ms(teacher.predict_proba, X, rows)
+    student_ms = mean_row_ms(student.predict_proba, X, rows)
+    report.update({
+        "teacher_row_ms": round(teacher_ms, 3),
+        "student_row_ms": round(student_ms, 3),
+        "row_speedup": round(teacher_ms / student_ms, 1),
+    })
+    return report
+
+
+def distill(df, model="supervised", budget=None, eval_df=None, promote=True, latency_sample=200):
+    """
+    Etkin öğretmen modelden öğrenci eğitir, sadakatini ölçer ve sürümlü kaydeder.
+
+    Sadakat eval_df varsa onda, yoksa eğitim verisinde ölçülür (fidelity_data). df ve eval_df ham başvuru
+    DataFrame'i veya hazır model girdisi klasörüdür (training.read_data).
+
+    Returns:
+        dict (sürüm, yol, bütçe, sadakat raporu)
+    """
+    teacher = PIPELINES[model].load()
+    X, y = model_input(teacher, df)
+    student = fit_soft_labels(build_student(budget), X, teacher.model.predict_proba(X)[:, 1])
+
+    X_eval, y_eval = (X, y) if eval_df is None else model_input(teacher, eval_df)
+    report = {
+        "teacher": model,
+        "teacher_version": current_version(ARTIFACT_NAMES[model]),
+        "rows": int(len(X)),
+        "budget": {key: student.get_params()[key] for key in ("n_estimators", "max_depth", "num_leaves")},
+        "fidelity_data": "train" if eval_df is None else "eval",
+        **fidelity(teacher.model, student, X_eval, y_eval, latency_sample),
+    }
+    version, path = save_versioned(student, ARTIFACT_NAMES[STUDENT_PIPELINES[model].name], report,
+                                   promote=promote)
+    return {"version": version, "path": path, **report}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tam modelden küçük bir öğrenci damıtır ve sadakatini raporlar.")
+    parser.add_argument("data", help="Eğitim verisi (not_scaled_processed_data.csv biçiminde CSV/Parquet)")
+    parser.add_argument("--model", choices=sorted(PIPELINES), default="supervised", help="Öğretmen model")
+    parser.add_argument("--trees", type=int, default=None, help="Ağaç sayısı bütçesi")
+    parser.add_argument("--depth", type=int, default=None, help="En büyük ağaç derinliği")
+    parser.add_argument("--leaves", type=int, default=None, help="Ağaç başına en fazla yaprak")
+    parser.add_argument("--eval-data", default=None, help="Sadakat raporu için ayrı veri")
+    parser.add_argument("--latency-sample", type=int, default=200, help="Tek tek skorlanacak satır sayısı")
+    parser.add_argument("--no-promote", action="store_true", help="Sürümü kaydet ama etkin öğrenciyi değiştirme")
+    args = parser.parse_args(argv)
+
+    budget = {key: value for key, value in
+              (("n_estimators", args.trees), ("max_depth", args.depth), ("num_leaves", args.leaves))
+              if value is not None}
+    feature_names = PIPELINES[args.model].feature_names
+    report = distill(
+        read_data(args.data, feature_names), model=args.model, budget=budget,
+        eval_df=read_data(args.eval_data, feature_names) if args.eval_data else None,
+        promote=not args.no_promote, latency_sample=args.latency_sample,
+    )
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
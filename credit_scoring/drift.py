@@ -0,0 +1,197 @@
+"""
+Sabit bellekli girdi kayması (drift) izleyicisi.
+
+Referans dağılım quantile_scaler.pkl içindeki eğitim kantillerinden (quantiles_, references_) alınır: her
+sayısal özellik için referans kantillerinden sabit kutu sınırları çıkarılır ve her kutunun eğitim verisindeki
+olasılığı scaler'ın CDF'inden hesaplanır (kesikli özelliklerde çakışan sınırlar birleştirilir).
+
+Gelen başvurular sadece kutu sayaçlarını artırır. Sayaçlar sabit sayıda pencereden oluşan bir halkada tutulur;
+bellek trafikten bağımsızdır ve karşılaştırma son pencerelerin toplamıyla yapılır:
+- PSI: sum((p - q) * ln(p / q)); < 0.1 stabil, 0.1-0.25 orta, > 0.25 belirgin kayma
+- KS: kutulanmış kümülatif dağılımlar arasındaki en büyük fark
+
+Metrikler Prometheus metin biçiminde verilir (textfile collector için dosyaya da yazılabilir).
+
+Kullanım (toplu dosya ile referansı karşılaştırma):
+    python -m credit_scoring.drift data/yeni_ay.csv --metrics-file metrics/drift.prom
+"""
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from credit_scoring.features import encode_raw
+from credit_scoring.pipelines import load_pickle
+from credit_scoring.schema import NUMERIC_COLS, QUANTILE_SCALER_PATH
+from credit_scoring.training import read_frame
+
+N_BINS = 10
+WINDOW_ROWS = 1000
+N_WINDOWS = 10
+PSI_EPSILON = 1e-4
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+# Tanımlıysa metrikler en fazla METRICS_INTERVAL saniyede bir bu dosyaya yazılır
+METRICS_FILE = os.environ.get("DRIFT_METRICS_FILE")
+METRICS_INTERVAL = 5.0
+
+
+def reference_bins(quantiles, references, n_bins=N_BINS):
+    """
+    Tek bir özelliğin referans kantillerinden kutu sınırları ve kutu olasılıkları.
+
+    Kutular (-inf, e1], (e1, e2], ..., (ek, inf) şeklindedir.
+
+    Returns:
+        (sınırlar (k,), olasılıklar (k + 1,))
+    """
+    levels = np.linspace(0, 1, n_bins + 1)[1:-1]
+    edges = np.unique(np.interp(levels, references, quantiles))
+    # Sağdan sürekli referans CDF'i: F(e) = P(X <= e)
+    cdf = references[np.searchsorted(quantiles, edges, side="right") - 1]
+    probs = np.diff(np.concatenate([[0.0], cdf, [1.0]]))
+    return edges, probs
+
+
+def psi(expected, actual, epsilon=PSI_EPSILON):
+    expected = np.clip(expected, epsilon, None)
+    actual = np.clip(actual, epsilon, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def binned_ks(expected, actual):
+    return float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected))))
+
+
+class DriftMonitor:
+    """
+    Özellik başına sabit kutulu histogram halkası; observe her istekte çağrılabilecek kadar ucuzdur.
+
+    Birden fazla Streamlit oturumu aynı nesneyi paylaşabilir, tüm güncellemeler bir kilit altındadır.
+    """
+
+    def __init__(self, feature_names, edges, reference_probs, window_rows=WINDOW_ROWS, n_windows=N_WINDOWS):
+        self.feature_names = list(feature_names)
+        self.edges = edges
+        self.reference_probs = reference_probs
+        self.window_rows = window_rows
+        self.counts = [np.zeros((n_windows, len(p)), dtype=np.int64) for p in reference_probs]
+        self.window = 0
+        self.window_filled = 0
+        self.observations = 0
+        self._last_export = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_scaler(cls, scaler, feature_names=NUMERIC_COLS, n_bins=N_BINS, **kwargs):
+        references = scaler.references_
+        bins = [reference_bins(scaler.quantiles_[:, j], references, n_bins) for j in range(len(feature_names))]
+        return cls(feature_names, [b[0] for b in bins], [b[1] for b in bins], **kwargs)
+
+    @classmethod
+    def load(cls, scaler_path=QUANTILE_SCALER_PATH, **kwargs):
+        return cls.from_scaler(load_pickle(scaler_path), **kwargs)
+
+    def observe(self, numeric):
+        """numeric: (n, 17) sayısal özellikler, NUMERIC_COLS sırasıyla (FeatureBlocks.numeric)."""
+        numeric = np.asarray(numeric)
+        bin_idx = [np.searchsorted(edges, numeric[:, j], side="left") for j, edges in enumerate(self.edges)]
+        with self._lock:
+            start = 0
+            while start < len(numeric):
+                # Pencere dolunca halkadaki en eski pencere sıfırlanıp yeniden kullanılır
+                if self.window_filled == self.window_rows:
+                    self.window = (self.window + 1) % len(self.counts[0])
+                    self.window_filled = 0
+                    for counts in self.counts:
+                        counts[self.window] = 0
+                stop = min(len(numeric), start + self.window_rows - self.window_filled)
+                for counts, idx in zip(self.counts, bin_idx):
+                    counts[self.window] += np.bincount(idx[start:stop], minlength=counts.shape[1])
+                self.window_filled += stop - start
+                start = stop
+            self.observations += len(numeric)
+
+    def snapshot(self):
+        """
+        Returns:
+            DataFrame (özellik başına örnek sayısı, PSI, KS, durum)
+        """
+        with self._lock:
+            totals = [counts.sum(axis=0) for counts in self.counts]
+        rows = []
+        for name, expected, total in zip(self.feature_names, self.reference_probs, totals):
+            n = int(total.sum())
+            actual = total / n if n else expected
+            value = psi(expected, actual)
+            status = "alert" if value > PSI_ALERT else "warning" if value > PSI_WARNING else "stable"
+            rows.append({"feature": name, "samples": n, "psi": value, "ks": binned_ks(expected, actual),
+                         "status": status if n else "no_data"})
+        return pd.DataFrame(rows).set_index("feature")
+
+    def prometheus_text(self, prefix="credit_input_drift"):
+        """Prometheus metin biçiminde metrikler."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_observations_total Drift izleyicisine gelen başvuru sayısı",
+            f"# TYPE {prefix}_observations_total counter",
+            f"{prefix}_observations_total {self.observations}",
+        ]
+        for metric in ("psi", "ks"):
+            lines.append(f"# HELP {prefix}_{metric} Referans dağılıma göre {metric.upper()} (son pencereler)")
+            lines.append(f"# TYPE {prefix}_{metric} gauge")
+            lines.extend(f'{prefix}_{metric}{{feature="{name}"}} {value:.6f}'
+                         for name, value in snapshot[metric].items())
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self, path):
+        """Metrikleri atomik olarak dosyaya yazar (node_exporter textfile collector)."""
+        tmp = f"{path}.tmp-{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+    def export(self, path=METRICS_FILE, interval=METRICS_INTERVAL):
+        """Metrik dosyası tanımlıysa ve son yazımdan bu yana interval geçtiyse metrikleri yazar."""
+        now = time.monotonic()
+        if not path or now - self._last_export < interval:
+            return
+        self._last_export = now
+        self.write_metrics(path)
+
+
+_shared_monitor = None
+_shared_lock = threading.Lock()
+
+
+def shared_monitor(scaler_path=QUANTILE_SCALER_PATH):
+    """Süreç genelinde tek izleyici; tüm model sayfaları aynı histogramlara yazar."""
+    global _shared_monitor
+    with _shared_lock:
+        if _shared_monitor is None:
+            _shared_monitor = DriftMonitor.load(scaler_path)
+        return _shared_monitor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bir veri dosyasının quantile_scaler referansına göre kaymasını ölçer.")
+    parser.add_argument("data", help="Ham başvurular (not_scaled_processed_data.csv biçiminde CSV/Parquet)")
+    parser.add_argument("--metrics-file", default=None, help="Prometheus metriklerinin yazılacağı dosya")
+    args = parser.parse_args(argv)
+
+    df = read_frame(args.data)
+    monitor = DriftMonitor.load(window_rows=max(len(df), 1), n_windows=1)
+    monitor.observe(encode_raw(df).numeric)
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(monitor.snapshot().round(4))
+    if args.metrics_file:
+        monitor.write_metrics(args.metrics_file)
+        print(f"metrikler -> {args.metrics_file}")
+
+
+if __name__ == "__main__":
+    main()
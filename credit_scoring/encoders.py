@@ -0,0 +1,217 @@
+"""
+Kategorik alanlar (Occupation, Payment_Behaviour, Credit_Mix) için kalıcı kodlayıcı.
+
+Notebook'ta Occupation için LabelEncoder eğitim ve test verisine ayrı ayrı fit edildiğinden kodlar iki küme
+arasında farklılaşabiliyordu; diğer iki alan elle yazılmış sözlüklerle eşleniyordu. Kodlayıcı eğitim verisine bir
+kez fit edilir, models/categorical_encoder.pkl olarak sürümlü kaydedilir (artifacts.py) ve sayfalar, toplu
+skorlama ve eğitim aynı dosyayı kullanır.
+
+- Occupation: eğitimdeki değerlerin sıralı listesi (LabelEncoder ile aynı kodlar)
+- Payment_Behaviour, Credit_Mix: schema.py'deki sıralı (ordinal) sözlükler
+- Ham veri yer tutucuları ("_______", "!@9#%8", "_") eksik sayılır; eksik ve bilinmeyen değerler sütunun
+  yedek kategorisine atanır (Occupation: Unknown/Other, diğerleri: eğitimdeki en sık değer). Yedek kategorisi
+  olmayan sütunda bilinmeyen değer ValueError verir. Atamalar sütun başına substituted sayacında toplanır;
+  substitutions(df) tek başvurudaki atamaları sayfalarda göstermek için verir.
+
+Dönüşüm sütun başına tek bir sözlük araması (pd.Index.get_indexer) çağrısıdır; sonuç int8 kodlardır.
+
+models/categorical_encoder.pkl yoksa schema.py sözlükleri kullanılır (sayfaların önceki eşlemesi).
+
+Kullanım:
+    python -m credit_scoring.encoders fit data/train.csv
+"""
+import argparse
+import threading
+
+import numpy as np
+import pandas as pd
+
+from credit_scoring.artifacts import save_versioned
+from credit_scoring.dataset_io import read_table
+from credit_scoring.pipelines import load_pickle
+from credit_scoring.schema import (
+    CATEGORICAL_ENCODER_PATH, CATEGORICAL_VOCABULARIES, CREDIT_MIXES, MODELS_DIR, PAYMENT_BEHAVIOURS
+)
+
+ENCODER_ARTIFACT = "categorical_encoder"
+ORDINAL_VOCABULARIES = {"Payment_Behaviour": PAYMENT_BEHAVIOURS, "Credit_Mix": CREDIT_MIXES}
+MISSING_TOKENS = {"Occupation": ["_______"], "Payment_Behaviour": ["!@9#%8"], "Credit_Mix": ["_"]}
+UNKNOWN_CATEGORIES = ["Unknown", "Other"]
+SCHEMA_FALLBACKS = {"Occupation": "Other"}
+
+
+def _vocabulary_codes(series, vocabulary):
+    """Sözlükteki sıraları; eksik ve sözlükte olmayan değerler -1 (pd.Categorical bunlar için uyarı verir)."""
+    return pd.Index(vocabulary).get_indexer(pd.Series(series, dtype=object)).astype(np.int8)
+
+
+class CategoricalEncoder:
+    """Sütun başına sabit sözlük ve yedek kategori; transform tüm sütunu int8 koda çevirir."""
+
+    def __init__(self, vocabularies, fallbacks=None, missing_tokens=MISSING_TOKENS):
+        self.vocabularies = {col: list(vocabulary) for col, vocabulary in vocabularies.items()}
+        self.fallbacks = dict(fallbacks or {})
+        self.missing_tokens = {col: list(tokens) for col, tokens in missing_tokens.items()}
+        # Yedek kategoriye atanan değer sayısı (süreç boyunca, sütun başına); kaydedilen dosyaya yazılmaz
+        self.substituted = {}
+        for col, fallback in self.fallbacks.items():
+            if fallback not in self.vocabularies[col]:
+                raise ValueError(f"{col}: yedek kategori {fallback!r} sözlükte yok")
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["substituted"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("substituted", {})
+
+    @property
+    def columns(self):
+        return list(self.vocabularies)
+
+    @classmethod
+    def from_schema(cls):
+        return cls(CATEGORICAL_VOCABULARIES, SCHEMA_FALLBACKS)
+
+    @classmethod
+    def fit(cls, df, columns=tuple(CATEGORICAL_VOCABULARIES), missing_tokens=MISSING_TOKENS):
+        """
+        Eğitim verisinden sözlükler ve yedek kategoriler.
+
+        Occupation'da eksik değer varsa notebook'taki gibi "Unknown" kategorisi sözlüğe eklenir.
+        """
+        vocabularies, fallbacks = {}, {}
+        for col in columns:
+            values = df[col].astype(object).replace(missing_tokens.get(col, []), np.nan)
+            if col in ORDINAL_VOCABULARIES:
+                vocabulary = list(ORDINAL_VOCABULARIES[col])
+                unknown = sorted(set(values.dropna()) - set(vocabulary))
+                if unknown:
+                    raise ValueError(f"{col}: sıralı sözlükte olmayan değer(ler) {unknown}")
+                if values.isna().all():
+                    raise ValueError(f"{col}: eğitim verisinde hiç değer yok; yedek kategori (en sık değer) "
+                                     f"belirlenemiyor")
+                fallbacks[col] = values.mode().iloc[0]
+            else:
+                present = set(values.dropna())
+                if values.isna().any():
+                    present.add(UNKNOWN_CATEGORIES[0])
+                vocabulary = sorted(present)
+                fallback = next((c for c in UNKNOWN_CATEGORIES if c in present), None)
+                if fallback is not None:
+                    fallbacks[col] = fallback
+            vocabularies[col] = vocabulary
+        return cls(vocabularies, fallbacks, missing_tokens)
+
+    def transform_column(self, series, col=None):
+        """
+        Bir sütunu int8 kodlara çevirir. Sütun zaten sayısal kodlar içeriyorsa aralığı kontrol edilip kullanılır.
+
+        Sayısal kodlar int8'e çevrilmeden önce denetlenir: eksik (NaN), tam sayı olmayan veya sözlük aralığı
+        dışındaki değerler ValueError verir (int8 dönüşümü 256'yı 0'a, 1.7'yi 1'e sessizce çevirirdi).
+        """
+        col = col or series.name
+        vocabulary = self.vocabularies[col]
+        if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            if np.isnan(values).any():
+                raise ValueError(f"{col}: eksik kod")
+            invalid = (values != np.floor(values)) | (values < 0) | (values >= len(vocabulary))
+            if invalid.any():
+                bad = sorted(set(values[invalid].tolist()))
+                raise ValueError(f"{col}: 0-{len(vocabulary) - 1} aralığında tam sayı olmayan kod(lar) {bad}")
+            return values.astype(np.int8)
+        codes = _vocabulary_codes(series, vocabulary)
+        unseen = codes < 0
+        if unseen.any():
+            fallback = self.fallbacks.get(col)
+            if fallback is None:
+                tokens = set(self.missing_tokens.get(col, []))
+                bad = sorted({str(v) for v in series[unseen]} - tokens) or sorted(tokens)
+                raise ValueError(f"{col}: bilinmeyen değer(ler) {bad}")
+            codes[unseen] = vocabulary.index(fallback)
+            self.substituted[col] = self.substituted.get(col, 0) + int(unseen.sum())
+        return codes
+
+    def transform(self, df):
+        """
+        Returns:
+            (n, sütun) int8 kod matrisi (columns sırasıyla)
+        """
+        codes = np.empty((len(df), len(self.vocabularies)), dtype=np.int8)
+        for j, col in enumerate(self.vocabularies):
+            codes[:, j] = self.transform_column(df[col], col)
+        return codes
+
+    def substitutions(self, df):
+        """
+        Eksik veya bilinmeyen olduğu için yedek kategoriye atanacak değerler (sayaçları değiştirmez).
+
+        Returns:
+            sütun -> (değerler listesi, yedek kategori); ataması olmayan sütunlar yer almaz
+        """
+        result = {}
+        for col, fallback in self.fallbacks.items():
+            series = df[col]
+            if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            unseen = _vocabulary_codes(series, self.vocabularies[col]) < 0
+            if unseen.any():
+                result[col] = (series[unseen].tolist(), fallback)
+        return result
+
+    def inverse_transform(self, codes):
+        """int8 kod matrisinden sütun adı -> değer dizisi."""
+        return {col: np.asarray(vocabulary, dtype=object)[codes[:, j]]
+                for j, (col, vocabulary) in enumerate(self.vocabularies.items())}
+
+    def save(self, metadata=None, models_dir=MODELS_DIR, promote=True):
+        """models/ altına yeni sürüm olarak kaydeder; promote ise categorical_encoder.pkl güncellenir."""
+        return save_versioned(self, ENCODER_ARTIFACT, metadata, models_dir, promote)
+
+
+def load_encoder(path=CATEGORICAL_ENCODER_PATH):
+    """Kayıtlı kodlayıcı; dosya yoksa schema.py sözlükleri."""
+    try:
+        return load_pickle(path)
+    except FileNotFoundError:
+        return CategoricalEncoder.from_schema()
+
+
+_shared_encoder = None
+_shared_lock = threading.Lock()
+
+
+def shared_encoder(path=CATEGORICAL_ENCODER_PATH):
+    """Süreç genelinde tek kodlayıcı; features.encode_raw varsayılan olarak bunu kullanır."""
+    global _shared_encoder
+    with _shared_lock:
+        if _shared_encoder is None:
+            _shared_encoder = load_encoder(path)
+        return _shared_encoder
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kategorik kodlayıcıyı eğitim verisine fit edip kaydeder.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fit = sub.add_parser("fit", help="Eğitim verisinden kodlayıcı")
+    fit.add_argument("data", help="Ham veya işlenmiş eğitim verisi (CSV/Parquet)")
+    fit.add_argument("--no-promote", action="store_true", help="Sürümü kaydet ama etkin kodlayıcıyı değiştirme")
+    sub.add_parser("show", help="Kullanılan kodlayıcının sözlüklerini gösterir")
+    args = parser.parse_args(argv)
+
+    if args.command == "fit":
+        encoder = CategoricalEncoder.fit(read_table(args.data))
+        version, path = encoder.save({"source": args.data}, promote=not args.no_promote)
+        print(f"v{version} -> {path}")
+    else:
+        encoder = load_encoder()
+    for col, vocabulary in encoder.vocabularies.items():
+        codes = ", ".join(f"{i}={value}" for i, value in enumerate(vocabulary))
+        print(f"{col} (yedek: {encoder.fallbacks.get(col)}): {codes}")
+
+
+if __name__ == "__main__":
+    main()
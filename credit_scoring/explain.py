@@ -0,0 +1,244 @@
+"""
+Ağaç modelleri ve stacking ensemble için kesin, vektörel karar açıklamaları.
+
+- RandomForest: her düğümün sınıf-1 olasılığı ile ebeveyninin farkı, ebeveynin bölme özelliğine yazılır
+  (tree-path / Saabas katkıları). Tüm ağaçların düğümleri tek bir seyrek matriste toplanır; bir grup satırın
+  katkıları tek bir decision_path · matris çarpımıdır.
+- XGBoost / LightGBM: kütüphanelerin kendi TreeSHAP çıktısı (pred_contribs / pred_contrib) kullanılır ve
+  logit uzayından olasılık uzayına toplamı koruyarak ölçeklenir.
+- StackingClassifier: taban model katkıları LogisticRegression meta model ağırlıklarıyla birleştirilir;
+  passthrough özellikleri doğrudan katsayılarıyla eklenir. Sonuç logit uzayında tam toplamsaldır:
+  bias + katkıların toplamı = meta modelin decision_function değeri.
+
+Kullanım (toplu):
+    python -m credit_scoring.explain data/basvurular.csv data/aciklamalar.parquet --model supervised
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.special import expit
+from sklearn.ensemble import StackingClassifier
+
+from credit_scoring.features import encode_raw
+from credit_scoring.training import PIPELINES, read_frame
+
+
+def _positive_index(model, positive_class=1):
+    return list(model.classes_).index(positive_class)
+
+
+class ForestPathExplainer:
+    """sklearn RandomForest / ExtraTrees için tree-path katkıları (olasılık uzayı)."""
+
+    space = "probability"
+
+    def __init__(self, forest, positive_class=1):
+        self.forest = forest
+        cls_idx = _positive_index(forest, positive_class)
+        rows, cols, vals = [], [], []
+        offset = 0
+        bias = 0.0
+        for tree in forest.estimators_:
+            t = tree.tree_
+            value = t.value[:, 0, :]
+            prob = value[:, cls_idx] / value.sum(axis=1)
+
+            parent = np.full(t.node_count, -1)
+            internal = np.flatnonzero(t.children_left >= 0)
+            parent[t.children_left[internal]] = internal
+            parent[t.children_right[internal]] = internal
+            child = np.flatnonzero(parent >= 0)
+
+            rows.append(child + offset)
+            cols.append(t.feature[parent[child]])
+            vals.append(prob[child] - prob[parent[child]])
+            bias += prob[0]
+            offset += t.node_count
+
+        n_trees = len(forest.estimators_)
+        self.path_matrix = csr_matrix(
+            (np.concatenate(vals) / n_trees, (np.concatenate(rows), np.concatenate(cols))),
+            shape=(offset, forest.n_features_in_),
+        )
+        self.bias = bias / n_trees
+
+    def contributions(self, X):
+        """
+        Returns:
+            (bias (n,), katkılar (n, k)); bias + katkılar.sum(1) = predict_proba[:, 1]
+        """
+        indicator, _ = self.forest.decision_path(X)
+        contrib = (indicator @ self.path_matrix).toarray()
+        return np.full(len(contrib), self.bias), contrib
+
+
+class BoosterExplainer:
+    """XGBoost / LightGBM için TreeSHAP katkıları, olasılık uzayına ölçeklenmiş."""
+
+    space = "probability"
+
+    def __init__(self, model):
+        self.model = model
+        self.kind = type(model).__name__
+
+    def margin_contributions(self, X):
+        if self.kind == "XGBClassifier":
+            from xgboost import DMatrix
+            booster = self.model.get_booster()
+            contrib = booster.predict(DMatrix(X, feature_names=booster.feature_names), pred_contribs=True)
+        else:
+            contrib = self.model.predict(X, pred_contrib=True)
+        return contrib[:, -1], contrib[:, :-1]
+
+    def contributions(self, X):
+        """
+        Logit katkıları, p - p0 farkını koruyacak şekilde olasılık uzayına ölçeklenir.
+
+        Returns:
+            (bias (n,), katkılar (n, k)); bias + katkılar.sum(1) = predict_proba[:, 1]
+        """
+        base_margin, phi = self.margin_contributions(X)
+        margin = base_margin + phi.sum(axis=1)
+        p, p0 = expit(margin), expit(base_margin)
+        delta = margin - base_margin
+        safe_delta = np.where(np.abs(delta) > 1e-12, delta, 1.0)
+        scale = np.where(np.abs(delta) > 1e-12, (p - p0) / safe_delta, p * (1 - p))
+        return p0, phi * scale[:, None]
+
+
+class StackExplainer:
+    """StackingClassifier: taban model katkıları meta LogisticRegression ağırlıklarıyla birleştirilir (logit uzayı)."""
+
+    space = "logit"
+
+    def __init__(self, stack):
+        if any(method != "predict_proba" for method in stack.stack_method_):
+            raise TypeError("Sadece predict_proba ile stacklenmiş taban modeller destekleniyor")
+        self.stack = stack
+        self.base_explainers = [make_explainer(est) for est in stack.estimators_]
+        coef = stack.final_estimator_.coef_[0]
+        n_base = len(self.base_explainers)
+        self.base_weights = coef[:n_base]
+        self.passthrough_weights = coef[n_base:] if stack.passthrough else None
+        self.intercept = stack.final_estimator_.intercept_[0]
+
+    def contributions(self, X):
+        """
+        Returns:
+            (bias (n,), katkılar (n, k)); bias + katkılar.sum(1) = meta modelin logit değeri
+        """
+        bias = np.full(len(X), self.intercept, dtype=float)
+        total = np.zeros(X.shape, dtype=float)
+        for weight, explainer in zip(self.base_weights, self.base_explainers):
+            base, contrib = explainer.contributions(X)
+            bias += weight * base
+            total += weight * contrib
+        if self.passthrough_weights is not None:
+            total += X * self.passthrough_weights
+        return bias, total
+
+
+def make_explainer(model):
+    kind = type(model).__name__
+    if isinstance(model, StackingClassifier):
+        return StackExplainer(model)
+    if kind in ("RandomForestClassifier", "ExtraTreesClassifier"):
+        return ForestPathExplainer(model)
+    if kind in ("XGBClassifier", "LGBMClassifier"):
+        return BoosterExplainer(model)
+    raise TypeError(f"{kind} için açıklama desteklenmiyor")
+
+
+class PipelineExplainer:
+    """Bir skorlama hattının (pipelines.py) kararlarını özellik adlarıyla açıklar."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.explainer = make_explainer(pipeline.model)
+        self.feature_names = list(pipeline.feature_names)
+
+    @property
+    def space(self):
+        return self.explainer.space
+
+    def explain(self, blocks):
+        """
+        Returns:
+            (bias (n,), katkılar DataFrame (n, k)); pozitif katkı Rejected yönündedir
+        """
+        bias, contrib = self.explainer.contributions(self.pipeline.transform(blocks))
+        return bias, pd.DataFrame(contrib, columns=self.feature_names)
+
+
+def top_reasons(contributions, k=5):
+    """
+    Her satır için Rejected yönünde en büyük katkıya sahip k özelliği kısmi sıralama ile seçer.
+
+    Returns:
+        (özellik adları (n, k), katkılar (n, k))
+    """
+    values = contributions.to_numpy()
+    k = min(k, values.shape[1])
+    top = np.argpartition(-values, k - 1, axis=1)[:, :k]
+    top_values = np.take_along_axis(values, top, axis=1)
+    order = np.argsort(-top_values, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    names = np.asarray(contributions.columns)[top]
+    return names, np.take_along_axis(values, top, axis=1)
+
+
+def reason_table(contributions, row=0, k=5, rejected=True):
+    """
+    Tek bir karar için en etkili k özellik: Rejected ise reddi, Approved ise onayı en çok destekleyenler.
+    """
+    effects = contributions.iloc[row]
+    effects = effects.nlargest(k) if rejected else effects.nsmallest(k)
+    return pd.DataFrame({"Özellik": effects.index, "Etki": effects.to_numpy().round(4)})
+
+
+def explain_batch(df, model="supervised", k=5, chunk_size=50_000):
+    """
+    Toplu açıklama: her satır için olasılık, bias ve en etkili k neden.
+
+    Returns:
+        (DataFrame, satır başına milisaniye)
+    """
+    explainer = PipelineExplainer(PIPELINES[model].load())
+    frames = []
+    start = time.perf_counter()
+    for offset in range(0, len(df), chunk_size):
+        blocks = encode_raw(df.iloc[offset:offset + chunk_size])
+        bias, contrib = explainer.explain(blocks)
+        names, values = top_reasons(contrib, k)
+        part = pd.DataFrame({"base": bias, "score": bias + contrib.sum(axis=1).to_numpy()})
+        for i in range(names.shape[1]):
+            part[f"reason_{i + 1}"] = names[:, i]
+            part[f"reason_{i + 1}_effect"] = values[:, i]
+        frames.append(part)
+    elapsed = time.perf_counter() - start
+    result = pd.concat(frames, ignore_index=True)
+    result.insert(0, "score_space", explainer.space)
+    return result, 1000 * elapsed / max(len(df), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Başvuruların model kararlarını toplu olarak açıklar.")
+    parser.add_argument("data", help="Ham başvurular (not_scaled_processed_data.csv biçiminde CSV/Parquet)")
+    parser.add_argument("output", help="Çıktı dosyası (.csv veya .parquet)")
+    parser.add_argument("--model", choices=sorted(PIPELINES), default="supervised")
+    parser.add_argument("--top", type=int, default=5, help="Satır başına gösterilecek neden sayısı")
+    args = parser.parse_args(argv)
+
+    result, ms_per_row = explain_batch(read_frame(args.data), args.model, args.top)
+    if args.output.endswith(".parquet"):
+        result.to_parquet(args.output, index=False)
+    else:
+        result.to_csv(args.output, index=False)
+    print(f"{len(result):,} satır açıklandı ({ms_per_row:.3f} ms/satır) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+Müşteri ID ile skorlama için bellek eşlemeli (mmap) özellik deposu.
+
+İşlenmiş veri setinden her müşterinin en son ayına ait özellik satırı sabit genişlikli bir yapılandırılmış
+.npy dizisinde tutulur (features.FeatureBlocks alanları + Customer_ID + dönem). ID'ler için açık adresli bir
+hash tablosu (index_keys.npy / index_rows.npy) vardır; arama O(1)'dir ve sadece birkaç sayfa okunur.
+
+Yapı:
+    data/feature_store/
+        CURRENT             etkin sürüm klasörünün adı
+        v-20250101-120000/  features.npy, index_keys.npy, index_rows.npy, meta.json
+
+Kurulum veriyi parça parça okur: her parçada müşteri başına son ay seçilip geçici dosyaya eklenir, sonunda
+parçalar arası son satırlar seçilerek depo yazılır. "Son ay" yılın ayı değil, temporal.period_index dönem
+anahtarıdır (yıl * 12 + ay); Aralık satırı ertesi yılın Ocak satırını geçemez. Yeni sürüm ayrı klasörde
+hazırlanır ve CURRENT dosyası os.replace ile atomik olarak değiştirilir; açık okuyucular eski sürümü kullanmaya
+devam eder.
+
+Aylık yenilemede yeni kayıtlar etkin sürümün üzerine birleştirilir: yeni dosyada olmayan müşteriler korunur.
+Yıl bilgisi olmayan dosyanın ayları, depodaki son dönemin ayına ulaşıyorsa aynı yıla, ulaşmıyorsa ertesi yıla
+yerleştirilir. --full depoyu sadece verilen dosyadan kurar.
+
+Kullanım:
+    python -m credit_scoring.feature_store build data/not_scaled_processed_data.csv --full
+    python -m credit_scoring.feature_store build data/yeni_ay.csv   # aylık yenileme (birleştirme)
+    python -m credit_scoring.feature_store score CUS_0xd40 CUS_0x21b1 --model supervised
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from credit_scoring.artifacts import current_version
+from credit_scoring.encoders import ENCODER_ARTIFACT
+from credit_scoring.features import FeatureBlocks, decode_blocks, encode_raw
+from credit_scoring.pipelines import DECISION_THRESHOLD
+from credit_scoring.schema import (
+    CATEGORICAL_VOCABULARIES, CUSTOMER_ID_COL, ENGINEERED_COLS, FEATURE_STORE_DIR, LOAN_TYPES, MONTH_COL, MONTHS,
+    NUMERIC_COLS
+)
+from credit_scoring.temporal import dated_periods, month_index, period_index
+from credit_scoring.training import PIPELINES
+
+CHUNK_ROWS = 200_000
+ID_WIDTH = 32
+INDEX_LOAD = 0.5
+KEEP_VERSIONS = 2
+CURRENT_FILE = "CURRENT"
+
+RECORD_DTYPE = np.dtype([
+    (CUSTOMER_ID_COL, f"S{ID_WIDTH}"),
+    ("key", np.uint64),
+    ("period", np.int32),
+    ("numeric", np.float32, (len(NUMERIC_COLS),)),
+    ("engineered", np.float32, (len(ENGINEERED_COLS),)),
+    ("payment_of_min", np.int8),
+    ("loans", np.uint8, (len(LOAN_TYPES),)),
+    ("codes", np.int8, (len(CATEGORICAL_VOCABULARIES),)),
+])
+
+
+def id_keys(customer_ids):
+    """Customer_ID değerlerinin 64 bit hash'i (pd.util.hash_array, süreçten bağımsız ve sabit)."""
+    return pd.util.hash_array(np.asarray(customer_ids, dtype=object).astype(str).astype(object))
+
+
+def _encode_ids(customer_ids):
+    ids = np.asarray(customer_ids, dtype=object).astype(str)
+    too_long = [i for i in ids if len(i.encode("utf-8")) > ID_WIDTH]
+    if too_long:
+        raise ValueError(f"Customer_ID en fazla {ID_WIDTH} bayt olmalıdır: {too_long[:3]}")
+    return np.char.encode(ids, "utf-8")
+
+
+def _last_per_key(keys, periods):
+    """(key, dönem) sıralamasında her anahtarın son satırı; aynı dönemde sonra gelen satır kazanır."""
+    order = np.lexsort((periods, keys))
+    is_last = np.ones(len(order), dtype=bool)
+    is_last[:-1] = keys[order][1:] != keys[order][:-1]
+    return order[is_last]
+
+
+def chunk_records(df, periods=None):
+    """
+    Bir veri parçasındaki her müşterinin son dönemini depo kayıtlarına çevirir.
+
+    periods: satırların dönem anahtarları (varsayılan temporal.period_index)
+    """
+    keys = id_keys(df[CUSTOMER_ID_COL])
+    periods = period_index(df) if periods is None else periods
+    last = _last_per_key(keys, periods)
+    df = df.iloc[last]
+    blocks = encode_raw(df)
+    records = np.empty(len(df), dtype=RECORD_DTYPE)
+    records[CUSTOMER_ID_COL] = _encode_ids(df[CUSTOMER_ID_COL])
+    records["key"] = keys[last]
+    records["period"] = periods[last]
+    records["numeric"] = blocks.numeric
+    records["engineered"] = blocks.engineered
+    records["payment_of_min"] = blocks.payment_of_min
+    records["loans"] = blocks.loans
+    records["codes"] = blocks.codes
+    return records
+
+
+def build_index(keys, load=INDEX_LOAD):
+    """
+    Doğrusal yoklamalı açık adresli hash tablosu; boyut 2'nin kuvvetidir ve yuva anahtarın üst bitleridir.
+
+    Ekleme vektöreldir: her turda boş yuvaya gelen anahtarlardan biri yerleşir, diğerleri bir sonraki yuvaya
+    geçer. Böylece her anahtarın ev yuvasından kendi yuvasına kadar boş yuva kalmaz (arama sırası korunur).
+
+    Returns:
+        (yuva anahtarları uint64, yuva satırları int64; boş yuva -1)
+    """
+    bits = max(int(np.ceil(np.log2(max(len(keys), 1) / load))), 1)
+    size = 1 << bits
+    slot_keys = np.zeros(size, dtype=np.uint64)
+    slot_rows = np.full(size, -1, dtype=np.int64)
+    pending = np.arange(len(keys))
+    probe = (keys >> np.uint64(64 - bits)).astype(np.int64)
+    while len(pending):
+        slot = probe[pending]
+        empty = slot_rows[slot] < 0
+        slots, first = np.unique(slot[empty], return_index=True)
+        winners = pending[empty][first]
+        slot_rows[slots] = winners
+        slot_keys[slots] = keys[winners]
+        placed = np.zeros(len(keys), dtype=bool)
+        placed[winners] = True
+        pending = pending[~placed[pending]]
+        probe[pending] = (probe[pending] + 1) & (size - 1)
+    return slot_keys, slot_rows
+
+
+def _read_chunks(path, chunk_size):
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size))
+    return pd.read_csv(path, chunksize=chunk_size)
+
+
+def _upgrade(records):
+    """Eski biçimdeki (yılın ayı "month" alanlı) depo kayıtları; tek yıllık veride ay, yıl 0 dönemidir."""
+    if "period" in records.dtype.names:
+        return records
+    upgraded = np.empty(len(records), dtype=RECORD_DTYPE)
+    for name in RECORD_DTYPE.names:
+        upgraded[name] = records["month"] if name == "period" else records[name]
+    return upgraded
+
+
+def _current_records(root):
+    """Etkin sürümün kayıtları; depo yoksa None."""
+    try:
+        return _upgrade(FeatureStore.open(root).records)
+    except FileNotFoundError:
+        return None
+
+
+def _year_offset(max_month, latest):
+    """Yılsız dosyanın aylarına eklenecek dönem: son dönemin ayına ulaşıyorsa aynı yıl, ulaşmıyorsa ertesi yıl."""
+    year = latest // 12
+    return 12 * (year if max_month >= latest % 12 else year + 1)
+
+
+def build_store(chunks, root=FEATURE_STORE_DIR, source=None, keep=KEEP_VERSIONS, merge=True):
+    """
+    Parça akışından yeni bir depo sürümü kurar ve etkin sürüm yapar.
+
+    merge=True ise (aylık yenileme) kayıtlar etkin sürümün üzerine birleştirilir: akışta olmayan müşteriler
+    korunur, ikisinde de olan müşteride dönemi büyük (eşitse akıştaki) satır kalır. merge=False depoyu sadece
+    akıştan kurar.
+
+    Returns:
+        Yeni sürüm klasörünün yolu
+    """
+    os.makedirs(root, exist_ok=True)
+    current = _current_records(root) if merge else None
+    if current is not None and not len(current):
+        current = None
+    version = time.strftime("v-%Y%m%d-%H%M%S")
+    staging = os.path.join(root, f".build-{version}-{os.getpid()}")
+    os.makedirs(staging)
+    try:
+        # 1) Parça başına son aylar geçici ham dosyaya eklenir; bellekte sadece anahtar ve ay kalır
+        rows_path = os.path.join(staging, "rows.tmp")
+        keys, periods, rows, undated = [], [], 0, False
+        with open(rows_path, "wb") as f:
+            for chunk in chunks:
+                chunk_periods = dated_periods(chunk)
+                if chunk_periods is None:
+                    undated = True
+                    chunk_periods = month_index(chunk[MONTH_COL])
+                records = chunk_records(chunk, chunk_periods)
+                f.write(records.tobytes())
+                keys.append(records["key"])
+                periods.append(records["period"])
+                rows += len(chunk)
+        staged = np.memmap(rows_path, dtype=RECORD_DTYPE, mode="r+") if keys else np.empty(0, RECORD_DTYPE)
+        keys = np.concatenate(keys or [np.empty(0, np.uint64)])
+        periods = np.concatenate(periods or [np.empty(0, np.int32)])
+        if undated and current is not None and len(periods):
+            offset = _year_offset(int(periods.max()), int(current["period"].max()))
+            staged["period"] += offset
+            periods += offset
+
+        # 2) Müşteri başına son satır (birleştirmede önce etkin sürüm, sonra yeni kayıtlar), anahtar sırasıyla
+        n_current = 0 if current is None else len(current)
+        if current is not None:
+            keys = np.concatenate([current["key"], keys])
+            periods = np.concatenate([current["period"], periods])
+        last = _last_per_key(keys, periods)
+        features = np.lib.format.open_memmap(os.path.join(staging, "features.npy"), mode="w+",
+                                             dtype=RECORD_DTYPE, shape=(len(last),))
+        for start in range(0, len(last), CHUNK_ROWS):
+            rows_slice = last[start:start + CHUNK_ROWS]
+            block = np.empty(len(rows_slice), dtype=RECORD_DTYPE)
+            kept = rows_slice < n_current
+            if kept.any():
+                block[kept] = current[rows_slice[kept]]
+            block[~kept] = staged[rows_slice[~kept] - n_current]
+            features[start:start + CHUNK_ROWS] = block
+        features.flush()
+        slot_keys, slot_rows = build_index(np.asarray(features["key"]))
+        del features, staged
+        os.remove(rows_path)
+
+        np.save(os.path.join(staging, "index_keys.npy"), slot_keys)
+        np.save(os.path.join(staging, "index_rows.npy"), slot_rows)
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"version": version, "customers": int(len(last)), "source_rows": rows, "source": source,
+                       "merged_customers": n_current,
+                       "encoder_version": current_version(ENCODER_ARTIFACT),
+                       "created": time.strftime("%Y-%m-%dT%H:%M:%S")}, f, ensure_ascii=False, indent=1)
+
+        # Aynı saniyede birden fazla kurulum (ör. tam kurulumun hemen ardından yenileme) ayrı klasöre gider
+        path, attempt = os.path.join(root, version), 1
+        while os.path.exists(path):
+            path, attempt = os.path.join(root, f"{version}-{os.getpid()}-{attempt}"), attempt + 1
+        os.rename(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    activate(os.path.basename(path), root)
+    prune(root, keep)
+    return path
+
+
+def build_file(path, root=FEATURE_STORE_DIR, chunk_size=CHUNK_ROWS, keep=KEEP_VERSIONS, merge=True):
+    """CSV veya Parquet işlenmiş veri dosyasından depoyu parça parça kurar (merge: build_store)."""
+    return build_store(_read_chunks(path, chunk_size), root, source=os.path.basename(path), keep=keep,
+                       merge=merge)
+
+
+def activate(version, root=FEATURE_STORE_DIR):
+    """CURRENT dosyasını atomik olarak verilen sürüme çevirir (geri almak için de kullanılır)."""
+    if not os.path.isfile(os.path.join(root, version, "features.npy")):
+        raise FileNotFoundError(f"Depo sürümü bulunamadı: {version}")
+    tmp = os.path.join(root, f"{CURRENT_FILE}.tmp-{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+    os.replace(tmp, os.path.join(root, CURRENT_FILE))
+
+
+def active_path(root=FEATURE_STORE_DIR):
+    """Etkin sürüm klasörü; depo kurulmamışsa FileNotFoundError."""
+    with open(os.path.join(root, CURRENT_FILE), encoding="utf-8") as f:
+        return os.path.join(root, f.read().strip())
+
+
+def prune(root=FEATURE_STORE_DIR, keep=KEEP_VERSIONS):
+    """Etkin sürüm dahil en yeni keep sürüm dışındakileri siler (mmap ile açık dosyalar okunmaya devam eder)."""
+    current = os.path.basename(active_path(root))
+    versions = sorted(v for v in os.listdir(root) if v.startswith("v-") and v != current)
+    for version in versions[:max(len(versions) - (keep - 1), 0)]:
+        shutil.rmtree(os.path.join(root, version), ignore_errors=True)
+
+
+class FeatureStore:
+    """Bir depo sürümü üzerinde salt okunur ID araması; dosyalar mmap ile açılır."""
+
+    def __init__(self, path):
+        self.path = path
+        self.version = os.path.basename(path)
+        self.records = np.load(os.path.join(path, "features.npy"), mmap_mode="r")
+        self._period_field = "period" if "period" in self.records.dtype.names else "month"
+        self.slot_keys = np.load(os.path.join(path, "index_keys.npy"), mmap_mode="r")
+        self.slot_rows = np.load(os.path.join(path, "index_rows.npy"), mmap_mode="r")
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self._mask = len(self.slot_keys) - 1
+        self._shift = np.uint64(64 - self._mask.bit_length())
+
+    @classmethod
+    def open(cls, root=FEATURE_STORE_DIR):
+        return cls(active_path(root))
+
+    def __len__(self):
+        return len(self.records)
+
+    def rows(self, customer_ids):
+        """
+        ID'lerin depo satırları; bulunamayanlar -1.
+
+        Hash eşleşmesi ayrıca saklanan ID ile doğrulanır.
+        """
+        ids = _encode_ids(customer_ids)
+        keys = id_keys(customer_ids)
+        result = np.full(len(ids), -1, dtype=np.int64)
+        pending = np.arange(len(ids))
+        slot = (keys >> self._shift).astype(np.int64)
+        while len(pending):
+            rows = self.slot_rows[slot[pending]]
+            occupied = rows >= 0
+            pending, rows = pending[occupied], rows[occupied]
+            found = self.slot_keys[slot[pending]] == keys[pending]
+            found[found] = self.records[CUSTOMER_ID_COL][rows[found]] == ids[pending[found]]
+            result[pending[found]] = rows[found]
+            pending = pending[~found]
+            slot[pending] = (slot[pending] + 1) & self._mask
+        return result
+
+    def row(self, customer_id):
+        row = self.rows([customer_id])[0]
+        return None if row < 0 else int(row)
+
+    def blocks(self, rows):
+        """Depo satırlarından FeatureBlocks (model hatlarına doğrudan verilebilir)."""
+        records = self.records[np.asarray(rows)]
+        return FeatureBlocks(records["numeric"], records["engineered"], records["payment_of_min"],
+                             records["loans"], records["codes"])
+
+    def frame(self, customer_ids):
+        """
+        Bulunan müşterilerin son ayına ait ham başvuru satırları (Customer_ID ve Month ile).
+
+        Sayfalar bu satırı form girdisi gibi kullanır; bulunamayan ID'ler sonuçta yer almaz.
+        """
+        rows = self.rows(customer_ids)
+        rows = rows[rows >= 0]
+        records = self.records[rows]
+        df = decode_blocks(self.blocks(rows))
+        df.insert(0, CUSTOMER_ID_COL, np.char.decode(records[CUSTOMER_ID_COL], "utf-8").astype(object))
+        df.insert(1, MONTH_COL, np.asarray(MONTHS, dtype=object)[records[self._period_field] % 12])
+        return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Müşteri ID ile skorlama için özellik deposu.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="İşlenmiş veri dosyasından yeni depo sürümü kurar ve etkinleştirir")
+    build.add_argument("data", help="CSV veya Parquet (not_scaled_processed_data.csv biçiminde)")
+    build.add_argument("--root", default=FEATURE_STORE_DIR)
+    build.add_argument("--chunk-size", type=int, default=CHUNK_ROWS)
+    build.add_argument("--keep", type=int, default=KEEP_VERSIONS, help="Saklanacak sürüm sayısı")
+    build.add_argument("--full", action="store_true",
+                       help="Etkin sürümle birleştirme; depoyu sadece bu dosyadan kur")
+    score = sub.add_parser("score", help="Müşteri ID'lerini depodaki son ay özellikleriyle skorlar")
+    score.add_argument("ids", nargs="+")
+    score.add_argument("--root", default=FEATURE_STORE_DIR)
+    score.add_argument("--model", choices=sorted(PIPELINES), default="supervised")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        path = build_file(args.data, args.root, args.chunk_size, args.keep, merge=not args.full)
+        store = FeatureStore(path)
+        print(f"{store.meta['source_rows']:,} satır + {store.meta['merged_customers']:,} mevcut müşteri -> "
+              f"{len(store):,} müşteri | {path} "
+              f"({time.perf_counter() - start:.2f} sn)")
+        return
+
+    store = FeatureStore.open(args.root)
+    pipeline = PIPELINES[args.model].load()
+    rows = store.rows(args.ids)
+    found = rows >= 0
+    proba = pipeline.predict_proba(store.blocks(rows[found])) if found.any() else []
+    for customer_id, p in zip(np.asarray(args.ids)[found], proba):
+        print(f"{customer_id}: {p:.4f} {'Rejected' if p >= DECISION_THRESHOLD else 'Approved'}")
+    for customer_id in np.asarray(args.ids)[~found]:
+        print(f"{customer_id}: bulunamadı")
+
+
+if __name__ == "__main__":
+    main()
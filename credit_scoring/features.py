@@ -0,0 +1,128 @@
+"""
+Ham başvuru verisinden model girdilerine kompakt özellik hattı.
+
+Sayfalardaki float64 np.array vektörleri yerine özellikler tiplerine göre ayrı bloklarda tutulur:
+
+- float32: 17 sayısal alan ve 5 türetilmiş özellik
+- uint8:   9 kredi türü (one-hot)
+- int8:    meslek, ödeme davranışı, kredi karışımı kodları ve asgari ödeme durumu
+
+Bloklar, model girdisine (pipelines.py) tek bir önceden ayrılmış float32 matrise yazılarak çevrilir.
+Ağaç modelleri (sklearn, XGBoost, LightGBM) float32 ile çalıştığı için bu matris ek kopya olmadan kullanılır.
+"""
+import numpy as np
+import pandas as pd
+
+from credit_scoring.encoders import shared_encoder
+from credit_scoring.schema import ENGINEERED_COLS, LOAN_TYPES, NUMERIC_COLS, PAYMENT_OF_MIN_COL
+
+
+class FeatureBlocks:
+    """
+    Bir grup başvurunun tipine göre ayrılmış özellik blokları.
+
+    - numeric: (n, 17) float32
+    - engineered: (n, 5) float32
+    - payment_of_min: (n,) int8
+    - loans: (n, 9) uint8
+    - codes: (n, 3) int8 (Occupation, Payment_Behaviour, Credit_Mix)
+    """
+
+    def __init__(self, numeric, engineered, payment_of_min, loans, codes):
+        self.numeric = numeric
+        self.engineered = engineered
+        self.payment_of_min = payment_of_min
+        self.loans = loans
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.numeric)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.numeric, self.engineered, self.payment_of_min, self.loans, self.codes))
+
+    def take(self, rows):
+        """Satır indeksleri veya dilimi ile blokların alt kümesini döndürür."""
+        return FeatureBlocks(self.numeric[rows], self.engineered[rows], self.payment_of_min[rows],
+                             self.loans[rows], self.codes[rows])
+
+
+def engineered_features(numeric):
+    """
+    Notebook'taki türetilmiş özellikleri float32 sayısal bloktan hesaplar.
+
+    Hesap ya da gelir 0 ise oranlar sayfalardaki gibi 0 kabul edilir.
+    """
+    col = {name: numeric[:, i] for i, name in enumerate(NUMERIC_COLS)}
+    out = np.empty((len(numeric), len(ENGINEERED_COLS)), dtype=np.float32)
+    total_accounts = col["Num_Bank_Accounts"] + col["Num_Credit_Card"]
+    out[:, 0] = total_accounts
+    np.divide(col["Outstanding_Debt"], total_accounts, out=out[:, 1], where=total_accounts > 0)
+    out[total_accounts <= 0, 1] = 0
+    np.divide(col["Outstanding_Debt"], col["Annual_Income"], out=out[:, 2], where=col["Annual_Income"] > 0)
+    out[col["Annual_Income"] <= 0, 2] = 0
+    np.divide(col["Num_of_Delayed_Payment"], total_accounts, out=out[:, 3], where=total_accounts > 0)
+    out[total_accounts <= 0, 3] = 0
+    out[:, 4] = col["Amount_invested_monthly"] + col["Total_EMI_per_month"]
+    return out
+
+
+def encode_raw(df, encoder=None):
+    """
+    Ham başvuru DataFrame'ini (form alanları veya not_scaled_processed_data.csv satırları) bloklara çevirir.
+
+    Kategorik kodlar models/categorical_encoder.pkl kodlayıcısıyla (encoders.py) tek adımda hesaplanır.
+
+    Returns:
+        FeatureBlocks
+    """
+    numeric = df[NUMERIC_COLS].to_numpy(dtype=np.float32)
+    codes = (encoder or shared_encoder()).transform(df)
+    return FeatureBlocks(
+        numeric=numeric,
+        engineered=engineered_features(numeric),
+        payment_of_min=df[PAYMENT_OF_MIN_COL].to_numpy(dtype=np.int8),
+        loans=np.ascontiguousarray(df[LOAN_TYPES].to_numpy(dtype=np.uint8)),
+        codes=codes,
+    )
+
+
+def decode_blocks(blocks, encoder=None):
+    """
+    encode_raw'un tersi: bloklardan ham başvuru DataFrame'i (denetim kaydı ve karşılaştırma için).
+
+    Sayısal alanlar float32 değerleriyle döner; yeniden encode_raw aynı blokları üretir.
+    """
+    df = pd.DataFrame(blocks.numeric.astype(np.float64), columns=NUMERIC_COLS)
+    df[PAYMENT_OF_MIN_COL] = blocks.payment_of_min.astype(np.int64)
+    for col, values in (encoder or shared_encoder()).inverse_transform(blocks.codes).items():
+        df[col] = values
+    for j, loan_type in enumerate(LOAN_TYPES):
+        df[loan_type] = blocks.loans[:, j].astype(np.int64)
+    return df
+
+
+def compact_dtypes(df):
+    """
+    Notebook DataFrame'lerini kompakt tiplere indirger: float64 -> float32, 0/1 sütunlar -> uint8,
+    küçük tamsayı kodları -> int8.
+    """
+    out = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            out[col] = series.astype(np.uint8)
+        elif pd.api.types.is_integer_dtype(series):
+            lo, hi = series.min(), series.max()
+            if lo >= 0 and hi <= 1:
+                out[col] = series.astype(np.uint8)
+            elif lo >= -128 and hi <= 127:
+                out[col] = series.astype(np.int8)
+            else:
+                out[col] = series
+        elif pd.api.types.is_float_dtype(series):
+            out[col] = series.astype(np.float32)
+        else:
+            out[col] = series
+    return pd.DataFrame(out, index=df.index)
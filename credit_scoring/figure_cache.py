@@ -0,0 +1,119 @@
+"""
+Dataset Story grafikleri için oturumlar arası ortak figür önbelleği.
+
+Sidebar filtreleri birkaç saniye önce görülen bir duruma döndüğünde bile her px.bar/px.pie/px.imshow figürü
+baştan kuruluyordu. Önbellek anahtarı (veri sürümü, normalize filtre tuple'ı, grafik kimliği) şeklindedir;
+değer figürün JSON'udur (plotly'nin kendi serileştirmesi, UTF-8 bayt). Toplam bayt sınırı aşıldığında en
+uzun süredir kullanılmayan figürler atılır (LRU).
+
+Önbellek süreç geneli tektir (shared_figure_cache): analistlerin çoğu aynı birkaç filtre kombinasyonuna
+baktığından bir oturumun kurduğu figür diğerlerinde de kullanılır. İsabet oranları grafik başına tutulur
+(stats); boyut FIGURE_CACHE_MB ortam değişkeni ile ayarlanır.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+FIGURE_CACHE_MB = float(os.environ.get("FIGURE_CACHE_MB", 64))
+
+
+def dataset_version(path):
+    """Veri dosyasının sürümü (boyut, değişiklik zamanı); dosya değişince eski figürler kullanılmaz."""
+    stat = os.stat(path)
+    return os.path.basename(path), stat.st_size, stat.st_mtime_ns
+
+
+class FigureCache:
+    """Bayt sınırlı LRU figür önbelleği; anahtarın son elemanı grafik kimliğidir."""
+
+    def __init__(self, max_bytes=int(FIGURE_CACHE_MB * 2 ** 20)):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = {}
+        self._misses = {}
+        self.evictions = 0
+
+    def get(self, key):
+        """Önbellekteki figür JSON'u veya None; isabet/ıskalama grafik kimliğine göre sayılır."""
+        chart_id = key[-1]
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self._misses[chart_id] = self._misses.get(chart_id, 0) + 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits[chart_id] = self._hits.get(chart_id, 0) + 1
+            return payload.decode("utf-8")
+
+    def put(self, key, figure):
+        payload = figure.to_json().encode("utf-8")
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = payload
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def figure(self, key, build):
+        """
+        Önbellekteki figür; yoksa build() ile kurulup saklanır.
+
+        Figür kilit dışında kurulur; aynı anahtar için eşzamanlı iki ıskalama figürü iki kez kurabilir,
+        sonuç aynıdır.
+        """
+        payload = self.get(key)
+        if payload is not None:
+            return pio.from_json(payload)
+        figure = build()
+        self.put(key, figure)
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Toplam ve grafik başına isabet oranları, giriş sayısı ve bellek kullanımı."""
+        with self._lock:
+            hits, misses = sum(self._hits.values()), sum(self._misses.values())
+            charts = {}
+            for chart_id in sorted(set(self._hits) | set(self._misses)):
+                chart_hits, chart_misses = self._hits.get(chart_id, 0), self._misses.get(chart_id, 0)
+                charts[chart_id] = {
+                    "hits": chart_hits, "misses": chart_misses,
+                    "hit_rate": chart_hits / (chart_hits + chart_misses),
+                }
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "charts": charts,
+            }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def shared_figure_cache():
+    """Süreç genelinde tek figür önbelleği (tüm Streamlit oturumları paylaşır)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FigureCache()
+        return _shared_cache
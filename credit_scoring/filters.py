@@ -0,0 +1,41 @@
+"""
+Dataset Story sidebar filtreleri.
+
+Filtre durumu, önbellek anahtarı olarak kullanılabilmesi için sıralı bir tuple'a normalize edilir.
+"""
+import numpy as np
+
+ALL_OCCUPATIONS = "Tümü"
+
+
+def filter_key(credit_scores, age_range, occupation, months):
+    """
+    Filtre durumunu hashlenebilir ve sıradan bağımsız bir tuple'a çevirir.
+
+    Boş çoklu seçimler sayfadaki gibi "filtre yok" anlamına gelir ve None ile gösterilir.
+    """
+    return (
+        tuple(sorted(credit_scores)) if credit_scores else None,
+        (int(age_range[0]), int(age_range[1])),
+        None if occupation in (None, ALL_OCCUPATIONS) else occupation,
+        tuple(sorted(months)) if months else None,
+    )
+
+
+def filter_mask(df, key):
+    """filter_key ile normalize edilmiş filtreye uyan satırların boolean maskesi."""
+    credit_scores, age_range, occupation, months = key
+    mask = np.ones(len(df), dtype=bool)
+    if credit_scores is not None:
+        mask &= df["Credit_Score"].isin(credit_scores).to_numpy()
+    ages = df["Age"].to_numpy()
+    mask &= (ages >= age_range[0]) & (ages <= age_range[1])
+    if occupation is not None:
+        mask &= (df["Occupation"] == occupation).to_numpy()
+    if months is not None:
+        mask &= df["Month"].isin(months).to_numpy()
+    return mask
+
+
+def apply_filters(df, key):
+    return df[filter_mask(df, key)]
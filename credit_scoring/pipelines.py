@@ -0,0 +1,143 @@
+"""
+İki model için skorlama hatları: özellik bloklarından model girdisine ve tahmine.
+
+- SupervisedPipeline: classic_scaler + stack_supervised (35 özellik)
+- PseudoLabelPipeline: quantile_scaler + leaky_pca + pseudo_label_model (29 özellik)
+- SupervisedStudentPipeline / PseudoLabelStudentPipeline: aynı özellikler, model yerine damıtılmış küçük
+  LightGBM öğrencisi (distill.py; "hızlı" katman)
+
+Model girdisi önceden ayrılmış tek bir float32 matrise yazılır; np.hstack ile float64 ara kopyalar oluşmaz.
+"""
+import pickle
+import time
+
+import numpy as np
+from sklearn.ensemble import StackingClassifier
+
+from credit_scoring.schema import (
+    CLASSIC_SCALER_PATH, LEAKY_COLS, LEAKY_PCA_PATH, NUMERIC_COLS, PSEUDO_LABEL_FEATURES,
+    PSEUDO_LABEL_MODEL_PATH, PSEUDO_LABEL_STUDENT_PATH, QUANTILE_SCALER_PATH, STACK_MODEL_PATH,
+    SUPERVISED_FEATURES, SUPERVISED_STUDENT_PATH
+)
+
+MODEL_DTYPE = np.float32
+# Rejected olasılığı bu değere eşit veya büyükse karar Rejected
+DECISION_THRESHOLD = 0.5
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def mean_row_ms(score, X, rows):
+    """Seçilen satırlar tek tek skorlandığında (sayfalardaki kullanım) satır başına ortalama milisaniye."""
+    start = time.perf_counter()
+    for i in rows:
+        score(X[i:i + 1])
+    return 1000 * (time.perf_counter() - start) / len(rows)
+
+
+def single_threaded(model):
+    """Modelin (stack'te taban modellerin) kendi iş parçacıklarını kapatır; çekirdekler başka işlerle paylaşılırken."""
+    if "n_jobs" in model.get_params(deep=False):
+        model.set_params(n_jobs=1)
+    if isinstance(model, StackingClassifier):
+        for est in model.estimators_:
+            single_threaded(est)
+    return model
+
+
+class SupervisedPipeline:
+    """classic_scaler (23 sayısal) + 9 kredi türü + 3 kategorik kod -> stack_supervised."""
+
+    name = "supervised"
+    feature_names = SUPERVISED_FEATURES
+
+    def __init__(self, scaler, model):
+        self.scaler = scaler
+        self.model = model
+
+    @classmethod
+    def load(cls, scaler_path=CLASSIC_SCALER_PATH, model_path=STACK_MODEL_PATH):
+        return cls(load_pickle(scaler_path), load_pickle(model_path))
+
+    def transform(self, blocks, dtype=MODEL_DTYPE):
+        n = len(blocks)
+        n_numeric = blocks.numeric.shape[1] + blocks.engineered.shape[1] + 1
+        numeric = np.empty((n, n_numeric), dtype=np.float32)
+        numeric[:, :blocks.numeric.shape[1]] = blocks.numeric
+        numeric[:, blocks.numeric.shape[1]:-1] = blocks.engineered
+        numeric[:, -1] = blocks.payment_of_min
+
+        out = np.empty((n, len(self.feature_names)), dtype=dtype)
+        out[:, :n_numeric] = self.scaler.transform(numeric)
+        out[:, n_numeric:n_numeric + blocks.loans.shape[1]] = blocks.loans
+        out[:, n_numeric + blocks.loans.shape[1]:] = blocks.codes
+        return out
+
+    def predict_proba(self, blocks):
+        """Rejected (sınıf 1) olasılıkları."""
+        return self.model.predict_proba(self.transform(blocks))[:, 1]
+
+    def predict(self, blocks):
+        return self.model.predict(self.transform(blocks))
+
+
+class PseudoLabelPipeline:
+    """quantile_scaler (17 sayısal) -> EMI/kredi sayısı PCA ile sıkıştırılır -> pseudo_label_model."""
+
+    name = "pseudo_label"
+    feature_names = PSEUDO_LABEL_FEATURES
+    leaky_idx = [NUMERIC_COLS.index(c) for c in LEAKY_COLS]
+    kept_idx = [i for i in range(len(NUMERIC_COLS)) if NUMERIC_COLS[i] not in LEAKY_COLS]
+
+    def __init__(self, scaler, pca, model):
+        self.scaler = scaler
+        self.pca = pca
+        self.model = model
+
+    @classmethod
+    def load(cls, scaler_path=QUANTILE_SCALER_PATH, pca_path=LEAKY_PCA_PATH, model_path=PSEUDO_LABEL_MODEL_PATH):
+        return cls(load_pickle(scaler_path), load_pickle(pca_path), load_pickle(model_path))
+
+    def transform(self, blocks, dtype=MODEL_DTYPE):
+        scaled = self.scaler.transform(blocks.numeric)
+        n_kept = len(self.kept_idx)
+        n_codes = blocks.codes.shape[1]
+        n_loans = blocks.loans.shape[1]
+
+        out = np.empty((len(blocks), len(self.feature_names)), dtype=dtype)
+        out[:, :n_kept] = scaled[:, self.kept_idx]
+        out[:, n_kept:n_kept + n_codes] = blocks.codes
+        out[:, n_kept + n_codes:n_kept + n_codes + n_loans] = blocks.loans
+        out[:, -2] = blocks.payment_of_min
+        # PCA: ölçeklenmiş EMI (14) ve kredi sayısı (6) tek bileşene sıkıştırılır
+        out[:, -1] = self.pca.transform(scaled[:, self.leaky_idx])[:, 0]
+        return out
+
+    def predict_proba(self, blocks):
+        return self.model.predict_proba(self.transform(blocks))[:, 1]
+
+    def predict(self, blocks):
+        return self.model.predict(self.transform(blocks))
+
+
+class SupervisedStudentPipeline(SupervisedPipeline):
+    """classic_scaler + stack'ten damıtılmış öğrenci (supervised_student.pkl)."""
+
+    name = "supervised_fast"
+
+    @classmethod
+    def load(cls, scaler_path=CLASSIC_SCALER_PATH, model_path=SUPERVISED_STUDENT_PATH):
+        return cls(load_pickle(scaler_path), load_pickle(model_path))
+
+
+class PseudoLabelStudentPipeline(PseudoLabelPipeline):
+    """quantile_scaler + leaky_pca + pseudo label modelinden damıtılmış öğrenci (pseudo_label_student.pkl)."""
+
+    name = "pseudo_label_fast"
+
+    @classmethod
+    def load(cls, scaler_path=QUANTILE_SCALER_PATH, pca_path=LEAKY_PCA_PATH, model_path=PSEUDO_LABEL_STUDENT_PATH):
+        return cls(load_pickle(scaler_path), load_pickle(pca_path), load_pickle(model_path))
@@ -0,0 +1,239 @@
+"""
+Tek geçişte veri profili: sütun başına sayım, eksik değer, min/max, ortalama/varyans, yaklaşık kantiller ve
+yaklaşık farklı değer sayısı.
+
+Dosya parça parça okunur ve her parça tüm sütunların birleştirilebilir özetlerine eklenir:
+- Ortalama/varyans: parça istatistikleri Chan/Welford birleştirmesiyle toplanır
+- Kantiller: rastgele öncelikli rezervuar örneği (parça başına vektörel birleştirme)
+- Farklı değer sayısı: HyperLogLog (pd.util.hash_array ile 64 bit hash)
+- Az değerli sütunlar (ör. Credit_Score, Month) için değerler görülme sırasıyla tam sayılır
+
+Profil veri dosyasının yanına <dosya>.profile.json olarak yazılır; dosyanın boyutu/değişme zamanı değişmedikçe
+yeniden hesaplanmaz.
+
+Kullanım:
+    python -m credit_scoring.profiling data/not_scaled_processed_data.csv
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+PROFILE_SUFFIX = ".profile.json"
+CHUNK_ROWS = 200_000
+RESERVOIR_SIZE = 8192
+HLL_PRECISION = 12
+MAX_TRACKED_VALUES = 256
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+
+class HyperLogLog:
+    """Sabit bellekli (2^precision bayt) yaklaşık farklı değer sayacı."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        p = self.precision
+        idx = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        # Kalan bitlerin üst 32 biti: baştaki sıfır sayısı float64'te tam hesaplanır
+        rest = ((hashes << np.uint64(p)) >> np.uint64(32)).astype(np.float64)
+        rank = np.where(rest > 0, 32 - np.floor(np.log2(np.maximum(rest, 1))), 33).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+
+class ColumnProfiler:
+    """Bir sütunun birleştirilebilir özetleri; update her parça için bir kez çağrılır."""
+
+    def __init__(self, name, numeric, rng):
+        self.name = name
+        self.numeric = numeric
+        self.rng = rng
+        self.count = 0
+        self.nulls = 0
+        self.hll = HyperLogLog()
+        self.values = {}
+        if numeric:
+            self.min = np.inf
+            self.max = -np.inf
+            self.mean = 0.0
+            self.m2 = 0.0
+            self.reservoir = np.empty(0)
+            self.priorities = np.empty(0)
+
+    def update(self, series):
+        if self.numeric and not pd.api.types.is_numeric_dtype(series):
+            series = pd.to_numeric(series, errors="coerce")
+        present = series.dropna()
+        self.nulls += len(series) - len(present)
+        n = len(present)
+        if n == 0:
+            return
+        self.hll.add_hashes(pd.util.hash_array(present.to_numpy()))
+        self._update_values(present)
+        if self.numeric:
+            self._update_numeric(present.to_numpy(dtype=np.float64))
+        self.count += n
+
+    def _update_values(self, present):
+        if self.values is None:
+            return
+        codes, uniques = pd.factorize(present)
+        if len(uniques) > MAX_TRACKED_VALUES:
+            self.values = None
+            return
+        for value, count in zip(uniques, np.bincount(codes)):
+            key = value.item() if hasattr(value, "item") else value
+            self.values[key] = self.values.get(key, 0) + int(count)
+        if len(self.values) > MAX_TRACKED_VALUES:
+            self.values = None
+
+    def _update_numeric(self, x):
+        n, total = len(x), self.count + len(x)
+        chunk_mean = x.mean()
+        delta = chunk_mean - self.mean
+        self.m2 += ((x - chunk_mean) ** 2).sum() + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        self.min = min(self.min, x.min())
+        self.max = max(self.max, x.max())
+
+        # Rezervuar: her satıra rastgele öncelik, en küçük RESERVOIR_SIZE öncelik tutulur
+        priorities = np.concatenate([self.priorities, self.rng.random(n)])
+        sample = np.concatenate([self.reservoir, x])
+        if len(sample) > RESERVOIR_SIZE:
+            keep = np.argpartition(priorities, RESERVOIR_SIZE)[:RESERVOIR_SIZE]
+            priorities, sample = priorities[keep], sample[keep]
+        self.priorities, self.reservoir = priorities, sample
+
+    def result(self):
+        out = {
+            "dtype": "numeric" if self.numeric else "categorical",
+            "count": self.count,
+            "nulls": self.nulls,
+            "distinct": len(self.values) if self.values is not None else self.hll.estimate(),
+            "distinct_exact": self.values is not None,
+            "values": self.values,
+        }
+        if self.numeric and self.count:
+            out.update({
+                "min": float(self.min),
+                "max": float(self.max),
+                "mean": float(self.mean),
+                "var": float(self.m2 / (self.count - 1)) if self.count > 1 else 0.0,
+                "quantiles": dict(zip(map(str, QUANTILES), np.quantile(self.reservoir, QUANTILES).tolist())),
+            })
+        return out
+
+
+def profile_chunks(chunks, seed=42):
+    """
+    Parça akışından tek geçişte profil çıkarır.
+
+    Returns:
+        {"rows", "n_columns", "columns": {sütun: özet}, "dtypes": {sütun: pandas dtype}}
+    """
+    rng = np.random.default_rng(seed)
+    profilers, dtypes = {}, {}
+    rows = 0
+    for chunk in chunks:
+        if not profilers:
+            for col in chunk.columns:
+                numeric = pd.api.types.is_numeric_dtype(chunk[col]) and not pd.api.types.is_bool_dtype(chunk[col])
+                profilers[col] = ColumnProfiler(col, numeric, rng)
+                dtypes[col] = str(chunk[col].dtype)
+        for col, profiler in profilers.items():
+            profiler.update(chunk[col])
+        rows += len(chunk)
+    return {
+        "rows": rows,
+        "n_columns": len(profilers),
+        "columns": {col: profiler.result() for col, profiler in profilers.items()},
+        "dtypes": dtypes,
+    }
+
+
+def profile_frame(df, chunk_size=CHUNK_ROWS):
+    """Bellekteki bir DataFrame'in parçalar halinde profili."""
+    return profile_chunks(df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return {"path": os.path.basename(path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def profile_path(path):
+    return path + PROFILE_SUFFIX
+
+
+def profile_file(path, chunk_size=CHUNK_ROWS):
+    """CSV veya Parquet dosyasını parça parça okuyup tek geçişte profiller."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        chunks = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size))
+    else:
+        chunks = pd.read_csv(path, chunksize=chunk_size)
+    profile = profile_chunks(chunks)
+    profile["source"] = _source_signature(path)
+    return profile
+
+
+def load_profile(path, refresh=False):
+    """
+    Veri dosyasının önbellekteki profilini döndürür; dosya değişmişse veya profil yoksa yeniden hesaplar.
+    """
+    cache = profile_path(path)
+    if not refresh and os.path.exists(cache):
+        with open(cache, encoding="utf-8") as f:
+            profile = json.load(f)
+        if profile.get("source") == _source_signature(path):
+            return profile
+
+    profile = profile_file(path)
+    tmp = f"{cache}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, cache)
+    return profile
+
+
+def profile_table(profile):
+    """Profilin sütun başına tek satırlık özeti (notebook ve raporlar için)."""
+    rows = []
+    for col, stats in profile["columns"].items():
+        row = {"column": col, "dtype": profile["dtypes"][col], "count": stats["count"],
+               "nulls": stats["nulls"], "distinct": stats["distinct"]}
+        if stats["dtype"] == "numeric" and stats["count"]:
+            row.update({"mean": stats["mean"], "std": stats["var"] ** 0.5, "min": stats["min"],
+                        "p25": stats["quantiles"]["0.25"], "p50": stats["quantiles"]["0.5"],
+                        "p75": stats["quantiles"]["0.75"], "max": stats["max"]})
+        rows.append(row)
+    return pd.DataFrame(rows).set_index("column")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Veri dosyasının tek geçişte profilini çıkarır ve önbelleğe yazar.")
+    parser.add_argument("data", help="CSV veya Parquet veri dosyası")
+    parser.add_argument("--refresh", action="store_true", help="Önbellekteki profili yok say")
+    args = parser.parse_args(argv)
+
+    profile = load_profile(args.data, refresh=args.refresh)
+    print(f"{profile['rows']:,} satır -> {profile_path(args.data)}")
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(profile_table(profile))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Veri seti ve model girdileri için ortak sütun tanımları ve dosya yolları.
+"""
+import os
+
+# === Dosya yolları (Streamlit uygulaması proje kökünden çalıştırılır)
+DATA_DIR = "data"
+MODELS_DIR = "models"
+# Ortam değişkenleriyle değiştirilebilir (ör. yük testleri kayıtları geçici klasöre yazar)
+AUDIT_LOG_DIR = os.environ.get("AUDIT_LOG_DIR", os.path.join("logs", "audit"))
+SHADOW_LOG_DIR = os.environ.get("SHADOW_LOG_DIR", os.path.join("logs", "shadow"))
+
+PROCESSED_DATA_PATH = os.path.join(DATA_DIR, "not_scaled_processed_data.csv")
+# Model verisi sütunlu klasörler olarak yazılır (dataset_io)
+MODEL_DATA_PATH = os.path.join(DATA_DIR, "df_for_model")
+PREPROCESSED_DATA_PATH = os.path.join(DATA_DIR, "preprocessed_data")
+TEMPORAL_STATE_PATH = os.path.join(DATA_DIR, "temporal_state.parquet")
+FEATURE_STORE_DIR = os.path.join(DATA_DIR, "feature_store")
+
+# === Hedef sütunlar
+CREDIT_SCORE_COL = "Credit_Score"
+MODEL_TARGET_COL = "target"
+CREDIT_SCORES = ["Good", "Poor", "Standard"]
+
+# === Kimlik ve zaman sütunları
+CUSTOMER_ID_COL = "Customer_ID"
+MONTH_COL = "Month"
+# İsteğe bağlı; yıl sınırını aşan veride ay sırası yıl * 12 + ay ile kurulur (temporal.period_index)
+YEAR_COL = "Year"
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+# === Kredi türleri (one-hot / multi-hot sütunlar, MultiLabelBinarizer sırası)
+LOAN_TYPES = [
+    "Auto Loan", "Credit-Builder Loan", "Debt Consolidation Loan", "Home Equity Loan",
+    "Mortgage Loan", "Not Specified", "Payday Loan", "Personal Loan", "Student Loan"
+]
+
+# === Model dosyaları
+CLASSIC_SCALER_PATH = os.path.join(MODELS_DIR, "classic_scaler.pkl")
+QUANTILE_SCALER_PATH = os.path.join(MODELS_DIR, "quantile_scaler.pkl")
+LEAKY_PCA_PATH = os.path.join(MODELS_DIR, "leaky_pca.pkl")
+STACK_MODEL_PATH = os.path.join(MODELS_DIR, "stack_supervised.pkl")
+PSEUDO_LABEL_MODEL_PATH = os.path.join(MODELS_DIR, "pseudo_label_model.pkl")
+CATEGORICAL_ENCODER_PATH = os.path.join(MODELS_DIR, "categorical_encoder.pkl")
+CASCADE_FIRST_STAGE_PATH = os.path.join(MODELS_DIR, "cascade_first_stage.pkl")
+SUPERVISED_STUDENT_PATH = os.path.join(MODELS_DIR, "supervised_student.pkl")
+PSEUDO_LABEL_STUDENT_PATH = os.path.join(MODELS_DIR, "pseudo_label_student.pkl")
+
+# === Ham başvuru alanları (modellerde kullanılan sırayla 17 sayısal özellik)
+NUMERIC_COLS = [
+    "Age", "Annual_Income", "Monthly_Inhand_Salary", "Num_Bank_Accounts", "Num_Credit_Card",
+    "Interest_Rate", "Num_of_Loan", "Delay_from_due_date", "Num_of_Delayed_Payment",
+    "Changed_Credit_Limit", "Num_Credit_Inquiries", "Outstanding_Debt",
+    "Credit_Utilization_Ratio", "Credit_History_Age", "Total_EMI_per_month",
+    "Amount_invested_monthly", "Monthly_Balance"
+]
+ENGINEERED_COLS = [
+    "Total_Num_Accounts", "Debt_Per_Account", "Debt_to_Income_Ratio",
+    "Delayed_Payments_Per_Account", "Total_Monthly_Expenses"
+]
+PAYMENT_OF_MIN_COL = "Payment_of_Min_Amount"
+
+# === Kategorik alanlar ve model kodları
+OCCUPATIONS = [
+    'Accountant', 'Architect', 'Developer', 'Doctor', 'Engineer',
+    'Entrepreneur', 'Journalist', 'Lawyer', 'Manager', 'Mechanic',
+    'Media_Manager', 'Musician', 'Scientist', 'Teacher', 'Writer', 'Other'
+]
+PAYMENT_BEHAVIOURS = [
+    "Low_spent_Small_value_payments",
+    "Low_spent_Medium_value_payments",
+    "Low_spent_Large_value_payments",
+    "High_spent_Small_value_payments",
+    "High_spent_Medium_value_payments",
+    "High_spent_Large_value_payments"
+]
+CREDIT_MIXES = ["Bad", "Standard", "Good"]
+CATEGORICAL_VOCABULARIES = {
+    "Occupation": OCCUPATIONS,
+    "Payment_Behaviour": PAYMENT_BEHAVIOURS,
+    "Credit_Mix": CREDIT_MIXES,
+}
+CATEGORICAL_LABEL_COLS = ["Occupation_label", "Payment_Behaviour_Mapped", "Credit_Mix_Mapped"]
+
+# === Model girdi düzenleri
+# Supervised stack: 23 ölçeklenmiş sayısal + 9 kredi türü + 3 kategorik kod = 35
+SUPERVISED_FEATURES = NUMERIC_COLS + ENGINEERED_COLS + [PAYMENT_OF_MIN_COL] + LOAN_TYPES + CATEGORICAL_LABEL_COLS
+# Pseudo label: 15 ölçeklenmiş sayısal (EMI ve kredi sayısı hariç) + 3 kod + 9 kredi türü + asgari ödeme + PCA = 29
+LEAKY_COLS = ["Total_EMI_per_month", "Num_of_Loan"]
+PSEUDO_LABEL_FEATURES = (
+    [c for c in NUMERIC_COLS if c not in LEAKY_COLS] + CATEGORICAL_LABEL_COLS + LOAN_TYPES
+    + [PAYMENT_OF_MIN_COL, "Leaky_PCA"]
+)
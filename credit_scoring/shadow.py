@@ -0,0 +1,291 @@
+"""
+Gölge skorlama: aday modelin canlı trafikte, kullanıcıya cevap vermeden denenmesi.
+
+stack_supervised.pkl, pseudo_label_model.pkl veya hızlı öğrenciler yenilenirken yeni sürüm önce --no-promote ile
+kaydedilir (training.py, distill.py); manifestte etkin sürümden yeni olan en son sürüm adaydır. Kullanıcıya
+etkin model (şampiyon) cevap verir; sayfa aynı özellik bloklarını ve şampiyonun olasılığını sınırlı kuyruğa
+put_nowait ile bırakır. Kuyruk doluysa istek gölgede skorlanmaz ve dropped sayacı artar: yük altında kuyruk
+büyümez, tahmin yolu hiçbir zaman beklemez.
+
+Arka plan işçisi ilk istekten sonra en fazla batch_wait saniye bekleyerek batch_rows satıra kadar istek toplar,
+şampiyonun dönüşümüyle tek matrise çevirir ve adayla tek bir predict_proba çağrısında skorlar: ağaç modellerinde
+satır başı maliyet tek satırlık çağrıların çok altındadır, işçi şampiyonla daha az CPU için yarışır. Aday tek iş
+parçacığıyla çalışır; çekirdekler sayfalardaki şampiyonla paylaşılır.
+
+Karar uyuşmazlığı, olasılık farkı ve iki modelin satır başı gecikmeleri (ShadowStats) en fazla STATS_INTERVAL
+saniyede bir logs/shadow/ altına JSON olarak yazılır; toplu skorlama (batch.py --shadow) aynı biçimde kendi
+dosyasını yazar. SHADOW_SCORING=0 gölge skorlamayı kapatır.
+
+Kullanım (durum):
+    python -m credit_scoring.shadow
+"""
+import argparse
+import atexit
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from credit_scoring.artifacts import current_version, read_manifest, version_path
+from credit_scoring.pipelines import DECISION_THRESHOLD, load_pickle, single_threaded
+from credit_scoring.schema import MODELS_DIR, SHADOW_LOG_DIR
+from credit_scoring.training import ARTIFACT_NAMES, PIPELINES, STUDENT_PIPELINES
+
+SHADOW_ENABLED = os.environ.get("SHADOW_SCORING", "1") != "0"
+SHADOW_QUEUE_SIZE = int(os.environ.get("SHADOW_QUEUE_SIZE", 1000))
+SHADOW_BATCH_ROWS = 256
+SHADOW_BATCH_WAIT = 0.5
+STATS_INTERVAL = 5.0
+# Yüzdelikler için saklanan son gecikme sayısı
+LATENCY_WINDOW = 10_000
+# Modeli doğrudan tek bir artifact olan hatlar; kademelide karar iki modelden geldiğinden gölge uygulanmaz
+SHADOW_PIPELINES = {*PIPELINES, *(pipeline.name for pipeline in STUDENT_PIPELINES.values())}
+
+
+def candidate_version(name, models_dir=MODELS_DIR):
+    """Etkin sürümden yeni, henüz etkinleştirilmemiş en son sürüm; yoksa None."""
+    entry = read_manifest(models_dir).get(name)
+    if not entry:
+        return None
+    newest = max(v["version"] for v in entry["versions"])
+    return newest if newest > (entry["current"] or 0) else None
+
+
+def stats_path(name, version, source, directory=SHADOW_LOG_DIR):
+    return os.path.join(directory, f"{name}-v{version:04d}-{source}-{os.getpid()}.json")
+
+
+class ShadowStats:
+    """Şampiyon ve aday arasında karar uyuşmazlığı, olasılık farkı ve satır başı gecikme sayaçları."""
+
+    def __init__(self, name, candidate_version, champion_version=None):
+        self.name = name
+        self.candidate_version = candidate_version
+        self.champion_version = champion_version
+        self.rows = 0
+        self.disagreements = 0
+        self.abs_gap_sum = 0.0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+        self._champion_ms = deque(maxlen=LATENCY_WINDOW)
+        self._candidate_ms = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def update(self, champion_proba, candidate_proba, champion_ms, candidate_ms):
+        """Olasılıklar satır başına; gecikmeler satır başı milisaniye (dizi veya tek değer)."""
+        champion_proba = np.asarray(champion_proba, dtype=np.float64)
+        candidate_proba = np.asarray(candidate_proba, dtype=np.float64)
+        disagree = (champion_proba >= DECISION_THRESHOLD) != (candidate_proba >= DECISION_THRESHOLD)
+        n = len(champion_proba)
+        with self._lock:
+            self.rows += n
+            self.disagreements += int(disagree.sum())
+            self.abs_gap_sum += float(np.abs(champion_proba - candidate_proba).sum())
+            self.batches += 1
+            self._champion_ms.extend(np.broadcast_to(champion_ms, n).tolist())
+            self._candidate_ms.extend(np.broadcast_to(candidate_ms, n).tolist())
+
+    def drop(self, n):
+        with self._lock:
+            self.dropped += n
+
+    def fail(self, n):
+        with self._lock:
+            self.errors += n
+
+    def summary(self):
+        with self._lock:
+            summary = {
+                "model": self.name,
+                "champion_version": self.champion_version,
+                "candidate_version": self.candidate_version,
+                "rows": self.rows,
+                "disagreements": self.disagreements,
+                "disagreement_rate": round(self.disagreements / self.rows, 4) if self.rows else None,
+                "mean_abs_gap": round(self.abs_gap_sum / self.rows, 4) if self.rows else None,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+            for role, latencies in (("champion", self._champion_ms), ("candidate", self._candidate_ms)):
+                for q in (50, 95):
+                    summary[f"{role}_p{q}_ms"] = (
+                        round(float(np.percentile(latencies, q)), 3) if latencies else None
+                    )
+        return summary
+
+    def write(self, path):
+        """Özeti atomik olarak JSON dosyasına yazar."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp-{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"updated": time.time(), **self.summary()}, f, indent=1)
+        os.replace(tmp, path)
+
+
+class ShadowScorer:
+    """Sınırlı kuyruk + arka plan işçisi; submit çağrısı hiçbir zaman aday modeli beklemez."""
+
+    def __init__(self, pipeline, candidate, candidate_version, max_queue=SHADOW_QUEUE_SIZE,
+                 batch_rows=SHADOW_BATCH_ROWS, batch_wait=SHADOW_BATCH_WAIT, directory=SHADOW_LOG_DIR):
+        self.pipeline = pipeline
+        self.candidate = single_threaded(candidate)
+        name = ARTIFACT_NAMES[pipeline.name]
+        self.stats = ShadowStats(name, candidate_version, current_version(name))
+        self.batch_rows = batch_rows
+        self.batch_wait = batch_wait
+        self.path = stats_path(name, candidate_version, "page", directory)
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._last_export = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def for_pipeline(cls, pipeline, models_dir=MODELS_DIR, **kwargs):
+        """Hattın artifact'i için aday varsa gölge skorlayıcı, yoksa None."""
+        name = ARTIFACT_NAMES[pipeline.name]
+        version = candidate_version(name, models_dir)
+        if version is None:
+            return None
+        return cls(pipeline, load_pickle(version_path(name, version, models_dir)), version, **kwargs)
+
+    def submit(self, blocks, champion_proba, champion_ms):
+        """
+        Şampiyonun skorladığı özellik bloklarını gölge kuyruğuna bırakır; kuyruk doluysa istek düşürülür.
+
+        blocks çağrıdan sonra değiştirilmemelidir (dönüşüm işçi iş parçacığında yapılır).
+
+        Returns:
+            İstek kuyruğa alındıysa True
+        """
+        try:
+            self.queue.put_nowait((blocks, np.asarray(champion_proba), champion_ms))
+            return True
+        except queue.Full:
+            self.stats.drop(len(blocks))
+            return False
+
+    def close(self, timeout=10.0):
+        """
+        Kuyruğu boşaltır ve son istatistikleri yazar.
+
+        İşçi ölmüşse veya kuyruk timeout içinde boşalmazsa beklemeden döner (kapanışı kilitlemez).
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if not self._thread.is_alive():
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    # === Arka plan işçisi
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            items, rows = [], 0
+            deadline = time.monotonic() + self.batch_wait
+            while item is not None:
+                items.append(item)
+                rows += len(item[0])
+                if rows >= self.batch_rows:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                except queue.Empty:
+                    break
+            if items:
+                self._score(items)
+            self._export(force=item is None)
+            if item is None:
+                return
+
+    def _score(self, items):
+        rows = sum(len(blocks) for blocks, _, _ in items)
+        try:
+            X = np.concatenate([self.pipeline.transform(blocks) for blocks, _, _ in items])
+            start = time.perf_counter()
+            candidate_proba = self.candidate.predict_proba(X)[:, 1]
+            candidate_ms = 1000 * (time.perf_counter() - start) / rows
+        except Exception:
+            # Uyumsuz aday (ör. farklı özellik sayısı) işçiyi durdurmaz; hatalar sayılır
+            self.stats.fail(rows)
+            return
+        champion_proba = np.concatenate([proba for _, proba, _ in items])
+        champion_ms = np.concatenate([np.full(len(blocks), ms / len(blocks)) for blocks, _, ms in items])
+        self.stats.update(champion_proba, candidate_proba, champion_ms, candidate_ms)
+
+    def _export(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_export < STATS_INTERVAL:
+            return
+        self._last_export = now
+        self.stats.write(self.path)
+
+
+_shared_scorers = {}
+_shared_lock = threading.Lock()
+
+
+def shared_shadow(pipeline):
+    """
+    Süreç genelinde hat başına tek gölge skorlayıcı; aday yoksa, gölge kapalıysa veya hat desteklenmiyorsa None.
+
+    Aday uygulama başlarken (hattın ilk kullanımında) belirlenir; çıkışta kuyruk boşaltılıp istatistikler yazılır.
+    """
+    if not SHADOW_ENABLED or pipeline.name not in SHADOW_PIPELINES:
+        return None
+    with _shared_lock:
+        if pipeline.name not in _shared_scorers:
+            scorer = ShadowScorer.for_pipeline(pipeline)
+            if scorer is not None:
+                atexit.register(scorer.close)
+            _shared_scorers[pipeline.name] = scorer
+        return _shared_scorers[pipeline.name]
+
+
+def read_stats(directory=SHADOW_LOG_DIR):
+    """logs/shadow altındaki tüm özetler (süreç ve kaynak başına bir satır)."""
+    rows = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            rows.append({"file": os.path.basename(path), **json.load(f)})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gölge skorlama adaylarını ve istatistiklerini gösterir.")
+    parser.add_argument("--dir", default=SHADOW_LOG_DIR)
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    args = parser.parse_args(argv)
+
+    for name in sorted(set(ARTIFACT_NAMES[p] for p in SHADOW_PIPELINES)):
+        current, candidate = current_version(name, args.models_dir), candidate_version(name, args.models_dir)
+        print(f"{name}: etkin {f'v{current}' if current else '-'} | aday {f'v{candidate}' if candidate else 'yok'}")
+    rows = read_stats(args.dir)
+    if not rows:
+        print("\nGölge istatistiği yok.")
+        return
+    print(f"\n{'Dosya':<48}{'Satır':>8}{'Uyuşmazlık':>12}{'|Fark|':>8}{'Düşen':>7}{'Şamp. p95':>11}"
+          f"{'Aday p95':>10}")
+    for row in rows:
+        rate = "-" if row["disagreement_rate"] is None else f"{row['disagreement_rate']:.2%}"
+        gap = "-" if row["mean_abs_gap"] is None else f"{row['mean_abs_gap']:.4f}"
+        champion = "-" if row["champion_p95_ms"] is None else f"{row['champion_p95_ms']:.2f}"
+        candidate = "-" if row["candidate_p95_ms"] is None else f"{row['candidate_p95_ms']:.2f}"
+        print(f"{row['file']:<48}{row['rows']:>8}{rate:>12}{gap:>8}{row['dropped']:>7}{champion:>11}"
+              f"{candidate:>10}")
+
+
+if __name__ == "__main__":
+    main()
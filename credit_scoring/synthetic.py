@@ -0,0 +1,367 @@
+"""
+İşlenmiş veri setinden şema-uyumlu sentetik veri üretimi.
+
+Üretim canlı müşteri verisi paylaşılamadığı için ölçek ve yük testlerinde kullanılır:
+
+- Sütunlar, veri tipleri ve kategorik sözlükler (meslek, ödeme davranışı, kredi türleri) kaynak veriden alınır.
+- Her sınıf (Credit_Score / target) için ayrı bir Gaussian copula kurulur; böylece sınıf dengesi,
+  sınıf bazlı marjinal dağılımlar ve sütunlar arası korelasyonlar korunur.
+- Satırlar parça parça, çok çekirdekli olarak üretilip CSV veya Parquet dosyasına akıtılır.
+
+Kullanım:
+    python -m credit_scoring.synthetic data/not_scaled_processed_data.csv data/synthetic.parquet --rows 10000000
+"""
+import argparse
+import os
+import pickle
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+from credit_scoring.schema import CREDIT_SCORE_COL, MODEL_TARGET_COL
+
+QUANTILE_GRID = np.linspace(0.0, 1.0, 1001)
+
+
+class SyntheticModel:
+    """
+    Kaynak veriden öğrenilen marjinal ve ortak istatistikler.
+
+    - numeric: sınıf bazlı quantile tablosu (ters CDF ile örnekleme)
+    - categorical: sınıf bazlı kategori olasılıkları
+    - id: yüksek kardinaliteli kimlik sütunları (ör. Customer_ID), önek + sıra numarasıyla üretilir
+    """
+
+    def __init__(self, columns, dtypes, target, classes, priors, kinds, integer_columns,
+                 id_columns, class_params):
+        self.columns = columns
+        self.dtypes = dtypes
+        self.target = target
+        self.classes = classes
+        self.priors = priors
+        self.kinds = kinds
+        self.integer_columns = integer_columns
+        self.id_columns = id_columns
+        self.class_params = class_params
+
+    @property
+    def copula_columns(self):
+        return [c for c in self.columns if self.kinds[c] in ("numeric", "categorical")]
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+def default_target(df):
+    """İşlenmiş veri için Credit_Score, model verisi için target sütununu seçer."""
+    for col in (CREDIT_SCORE_COL, MODEL_TARGET_COL):
+        if col in df.columns:
+            return col
+    raise ValueError(f"Hedef sütun bulunamadı: {CREDIT_SCORE_COL} / {MODEL_TARGET_COL}")
+
+
+def _column_kind(series, max_categories):
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return "numeric"
+    if series.nunique(dropna=True) > max_categories:
+        return "id"
+    return "categorical"
+
+
+def _is_integer_valued(values):
+    values = values[~np.isnan(values)]
+    return values.size > 0 and bool(np.all(values == np.round(values)))
+
+
+def _normal_scores_numeric(values):
+    """Boş olmayan değerleri sıra istatistiği ile standart normal skorlara çevirir."""
+    z = np.zeros(len(values))
+    mask = ~np.isnan(values)
+    n = mask.sum()
+    if n > 1:
+        ranks = pd.Series(values[mask]).rank(method="average").to_numpy()
+        z[mask] = ndtri((ranks - 0.5) / n)
+    return z
+
+
+def _normal_scores_categorical(codes, cum_probs, rng):
+    """Her kategoriyi kendi CDF aralığında rastgele bir noktaya yerleştirir."""
+    z = np.zeros(len(codes))
+    mask = codes >= 0
+    lower = np.concatenate([[0.0], cum_probs[:-1]])[codes[mask]]
+    upper = cum_probs[codes[mask]]
+    u = lower + (upper - lower) * rng.random(mask.sum())
+    z[mask] = ndtri(np.clip(u, 1e-9, 1 - 1e-9))
+    return z
+
+
+def _nearest_correlation(corr):
+    """Sayısal hatalardan dolayı pozitif tanımlı olmayan korelasyon matrisini düzeltir."""
+    corr = np.nan_to_num(corr)
+    np.fill_diagonal(corr, 1.0)
+    eigvals, eigvecs = np.linalg.eigh(corr)
+    eigvals = np.clip(eigvals, 1e-6, None)
+    corr = eigvecs @ np.diag(eigvals) @ eigvecs.T
+    d = np.sqrt(np.diag(corr))
+    return corr / np.outer(d, d)
+
+
+def fit_synthetic_model(df, target=None, max_categories=64, seed=42):
+    """
+    Kaynak DataFrame'den sentetik veri modelini öğrenir.
+
+    Returns:
+        SyntheticModel
+    """
+    target = target or default_target(df)
+    rng = np.random.default_rng(seed)
+
+    columns = df.columns.tolist()
+    dtypes = {c: str(df[c].dtype) for c in columns}
+    kinds = {c: _column_kind(df[c], max_categories) for c in columns if c != target}
+    kinds[target] = "target"
+
+    integer_columns = set()
+    id_columns = {}
+    for col in columns:
+        if kinds[col] == "numeric" and _is_integer_valued(df[col].to_numpy(dtype=float)):
+            integer_columns.add(col)
+        elif kinds[col] == "id":
+            values = df[col].dropna().astype(str)
+            prefix = os.path.commonprefix(values.head(1000).tolist())
+            prefix = prefix[:prefix.index("0x") + 2] if "0x" in prefix else prefix.rstrip("0123456789")
+            rows_per_id = max(1, int(round(len(values) / max(values.nunique(), 1))))
+            id_columns[col] = (prefix, rows_per_id)
+
+    class_counts = df[target].value_counts(dropna=True).sort_index()
+    classes = class_counts.index.to_numpy()
+    priors = (class_counts / class_counts.sum()).to_numpy()
+
+    copula_columns = [c for c in columns if kinds[c] in ("numeric", "categorical")]
+    class_params = []
+    for cls in classes:
+        part = df[df[target] == cls]
+        marginals = {}
+        null_rates = {}
+        scores = np.empty((len(part), len(copula_columns)))
+        for j, col in enumerate(copula_columns):
+            series = part[col]
+            null_rates[col] = float(series.isna().mean())
+            if kinds[col] == "numeric":
+                values = series.to_numpy(dtype=float)
+                non_null = values[~np.isnan(values)]
+                quantiles = np.quantile(non_null, QUANTILE_GRID) if non_null.size else None
+                marginals[col] = quantiles
+                scores[:, j] = _normal_scores_numeric(values)
+            else:
+                freqs = series.value_counts(normalize=True, dropna=True)
+                cum_probs = np.array(freqs.cumsum(), dtype=float)
+                if cum_probs.size:
+                    cum_probs[-1] = 1.0
+                marginals[col] = (freqs.index.to_numpy(), cum_probs)
+                codes = pd.Categorical(series, categories=freqs.index).codes
+                scores[:, j] = _normal_scores_categorical(codes, cum_probs, rng)
+
+        corr = np.corrcoef(scores, rowvar=False) if len(part) > 1 else np.eye(len(copula_columns))
+        chol = np.linalg.cholesky(_nearest_correlation(np.atleast_2d(corr)))
+        class_params.append({"marginals": marginals, "null_rates": null_rates, "chol": chol})
+
+    return SyntheticModel(columns, dtypes, target, classes, priors, kinds, integer_columns,
+                          id_columns, class_params)
+
+
+def sample_chunk(model, n_rows, rng, row_offset=0):
+    """
+    Modelden n_rows satırlık bir DataFrame üretir.
+
+    row_offset, kimlik sütunlarının parçalar arasında tekrar etmemesi için global satır başlangıcıdır.
+    """
+    copula_columns = model.copula_columns
+    class_idx = rng.choice(len(model.classes), size=n_rows, p=model.priors)
+
+    out = {}
+    for col in copula_columns:
+        if model.kinds[col] == "numeric":
+            out[col] = np.full(n_rows, np.nan)
+        else:
+            out[col] = np.empty(n_rows, dtype=object)
+
+    for k, params in enumerate(model.class_params):
+        rows = np.flatnonzero(class_idx == k)
+        if rows.size == 0:
+            continue
+        z = rng.standard_normal((rows.size, len(copula_columns))) @ params["chol"].T
+        u = ndtr(z)
+        for j, col in enumerate(copula_columns):
+            marginal = params["marginals"][col]
+            if model.kinds[col] == "numeric":
+                if marginal is None:
+                    continue
+                values = np.interp(u[:, j], QUANTILE_GRID, marginal)
+            else:
+                categories, cum_probs = marginal
+                if categories.size == 0:
+                    continue
+                codes = np.minimum(np.searchsorted(cum_probs, u[:, j], side="right"), categories.size - 1)
+                values = categories[codes]
+            null_rate = params["null_rates"][col]
+            if null_rate > 0:
+                values[rng.random(rows.size) < null_rate] = np.nan if model.kinds[col] == "numeric" else None
+            out[col][rows] = values
+
+    out[model.target] = model.classes[class_idx]
+
+    row_numbers = np.arange(row_offset, row_offset + n_rows)
+    for col, (prefix, rows_per_id) in model.id_columns.items():
+        ids = row_numbers // rows_per_id
+        if prefix.endswith("0x"):
+            out[col] = np.char.add(prefix, np.char.mod("%x", ids))
+        else:
+            out[col] = np.char.add(prefix, ids.astype(str))
+
+    df = pd.DataFrame(out, columns=model.columns)
+    for col in model.integer_columns:
+        df[col] = np.round(df[col])
+        if df[col].notna().all():
+            df[col] = df[col].astype(model.dtypes[col])
+    return df
+
+
+# === Çoklu işlem (her işçi modeli bir kez alır)
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _generate_part(args):
+    chunk_index, n_rows, row_offset, seed_seq, fmt = args
+    rng = np.random.default_rng(seed_seq)
+    df = sample_chunk(_worker_model, n_rows, rng, row_offset)
+    if fmt == "csv":
+        return df.to_csv(index=False, header=chunk_index == 0).encode("utf-8")
+    return df
+
+
+def _chunk_plan(n_rows, chunk_size, seed, fmt):
+    n_chunks = (n_rows + chunk_size - 1) // chunk_size
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    for i in range(n_chunks):
+        offset = i * chunk_size
+        yield i, min(chunk_size, n_rows - offset), offset, seeds[i], fmt
+
+
+def _ordered_window(pool, fn, items, window):
+    """
+    pool.map gibi sıralı sonuçlar; ancak aynı anda en fazla `window` parça gönderilir.
+
+    pool.map tüm parçaları baştan kuyruğa aldığından yazıcı işçilerden yavaşsa (Parquet'te olağan durum) biten
+    parçalar bellekte sınırsız birikirdi. Burada en eski parça yazılmadan yenisi gönderilmez.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def parquet_schema(model):
+    """
+    Tüm parçalar için sabit Parquet şeması; kaynak verinin sütun tiplerinden (model.dtypes) kurulur.
+
+    Şema ilk parçadan çıkarılsaydı, o parçada tamamen boş kalan sütun null tipinde, eksik değer çıkmayan tam sayı
+    sütunu int olarak sabitlenir ve sonraki parçalar bu şemaya çevrilemezdi. Arrow tam sayıları eksik değer
+    taşıyabildiği için kaynaktaki tam sayı tipi eksik değerli parçalarda da korunur.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for col in model.columns:
+        dtype = pd.api.types.pandas_dtype(model.dtypes[col])
+        dtype = getattr(dtype, "numpy_dtype", dtype)
+        if model.kinds[col] == "id" or dtype.kind not in "biufM":
+            fields.append(pa.field(col, pa.string()))
+        else:
+            fields.append(pa.field(col, pa.from_numpy_dtype(dtype)))
+    return pa.schema(fields)
+
+
+def generate(model, n_rows, path, chunk_size=250_000, n_jobs=None, seed=42, fmt=None):
+    """
+    Sentetik satırları parça parça üretip dosyaya akıtır.
+
+    - fmt: "csv" veya "parquet" (verilmezse dosya uzantısından çıkarılır)
+    - Parçalar işçi süreçlerde üretilir, ana süreç sadece sıralı olarak diske yazar.
+    - Aynı anda en fazla 2 × n_jobs parça üretimde veya yazılmayı bekler; bellek satır sayısından bağımsızdır.
+    - Parquet şeması baştan kaynak tiplerinden kurulur (parquet_schema); her parça bu şemaya çevrilir.
+
+    Returns:
+        dict (satır sayısı, süre, saniyedeki satır)
+    """
+    fmt = fmt or ("parquet" if path.endswith(".parquet") else "csv")
+    n_jobs = n_jobs or os.cpu_count()
+    start = time.perf_counter()
+
+    writer = None
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = parquet_schema(model)
+        writer = pq.ParquetWriter(path, schema)
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(model,)) as pool, \
+            open(path, "wb") if fmt == "csv" else nullcontext() as f:
+        parts = _ordered_window(pool, _generate_part, _chunk_plan(n_rows, chunk_size, seed, fmt), 2 * n_jobs)
+        for part in parts:
+            if fmt == "csv":
+                f.write(part)
+                continue
+            writer.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False))
+    if writer is not None:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {"rows": n_rows, "seconds": elapsed, "rows_per_second": n_rows / elapsed if elapsed else float("inf")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="İşlenmiş veri setinden şema-uyumlu sentetik veri üretir.")
+    parser.add_argument("source", help="Kaynak CSV (ör. data/not_scaled_processed_data.csv) veya kayıtlı model (.pkl)")
+    parser.add_argument("output", help="Çıktı dosyası (.csv veya .parquet)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Üretilecek satır sayısı")
+    parser.add_argument("--chunk-size", type=int, default=250_000, help="İşçi başına parça büyüklüğü")
+    parser.add_argument("--jobs", type=int, default=None, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--target", default=None, help="Sınıf sütunu (varsayılan: Credit_Score veya target)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save-model", default=None, help="Öğrenilen modeli bu yola kaydet")
+    args = parser.parse_args(argv)
+
+    if args.source.endswith(".pkl"):
+        model = SyntheticModel.load(args.source)
+    else:
+        model = fit_synthetic_model(pd.read_csv(args.source), target=args.target, seed=args.seed)
+    if args.save_model:
+        model.save(args.save_model)
+
+    stats = generate(model, args.rows, args.output, chunk_size=args.chunk_size, n_jobs=args.jobs, seed=args.seed)
+    print(f"{stats['rows']:,} satır {stats['seconds']:.1f} sn'de yazıldı "
+          f"({stats['rows_per_second']:,.0f} satır/sn) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Müşteri geçmişinden zamansal özellikler: önceki ay değeri (lag), aylık değişim (delta) ve son aylar ortalaması.
+
+Veri bir kez (Customer_ID, ay sırası) ile sıralanır; grup başlangıçları sıralı müşteri kodlarından bulunur ve
+tüm özellikler tek seferde vektörel hesaplanır:
+- lag1 / delta1: bir satır kaydırma, müşterinin ilk ayında NaN
+- rollmean: son WINDOW ayın (mevcut ay dahil) eksik değerleri atlayan ortalaması; pencere küçük olduğundan
+  WINDOW adet kaydırılmış dizinin toplamıdır (uzun veride kümülatif toplam farklarının yuvarlama hatası olmaz)
+
+Müşteri başına Python döngüsü yoktur. Her müşterinin son durumu (son dönem, gözlem sayısı ve son
+WINDOW - 1 değer) ayrıca saklanır; yeni ay geldiğinde özellikler tüm geçmiş yeniden okunmadan bu durumdan
+hesaplanır (update).
+
+Sıralama ve Months_Since_Prev yılın ayı değil, monoton artan dönem anahtarıyla (yıl * 12 + ay, period_index)
+yapılır; Aralık'tan sonra gelen Ocak bir sonraki dönemdir. Yıl bilgisi olmayan yeni ay verisi durumdaki son
+dönemden sonraki ilk o aya yerleştirilir.
+
+Kullanım:
+    python -m credit_scoring.temporal build data/not_scaled_processed_data.csv data/temporal_features.parquet
+    python -m credit_scoring.temporal update data/yeni_ay.csv data/temporal_yeni_ay.parquet
+    python -m credit_scoring.temporal update data/2027-01.csv data/temporal_2027-01.parquet --year 2027
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from credit_scoring.schema import CUSTOMER_ID_COL, MONTH_COL, MONTHS, TEMPORAL_STATE_PATH, YEAR_COL
+from credit_scoring.training import read_frame
+
+TEMPORAL_COLS = [
+    "Num_of_Delayed_Payment", "Delay_from_due_date", "Outstanding_Debt", "Credit_Utilization_Ratio",
+    "Monthly_Balance", "Num_Credit_Inquiries",
+]
+WINDOW = 3
+PERIOD_COL = "Period"
+
+
+def month_index(months):
+    """Ay adlarını (January=0 ...) veya sayısal ay sırasını tamsayı diziye çevirir."""
+    if pd.api.types.is_numeric_dtype(months):
+        return months.to_numpy(dtype=np.int64)
+    codes = pd.Categorical(months, categories=MONTHS).codes.astype(np.int64)
+    if (codes < 0).any():
+        unknown = sorted(set(months[codes < 0].astype(str)))
+        raise ValueError(f"Bilinmeyen ay değerleri: {unknown}")
+    return codes
+
+
+def dated_periods(df):
+    """Yıl bilgisi olan verinin dönem anahtarları; yıl bilinmiyorsa None."""
+    months = df[MONTH_COL]
+    if pd.api.types.is_datetime64_any_dtype(months):
+        return (months.dt.year * 12 + months.dt.month - 1).to_numpy(dtype=np.int64)
+    if pd.api.types.is_numeric_dtype(months) and YEAR_COL not in df.columns:
+        # Sayısal ay sırası zaten monoton bir dönem anahtarı kabul edilir
+        return months.to_numpy(dtype=np.int64)
+    if YEAR_COL in df.columns:
+        return df[YEAR_COL].to_numpy(dtype=np.int64) * 12 + month_index(months)
+    if not months.isin(MONTHS).all():
+        dated = pd.to_datetime(months, format="%Y-%m", errors="coerce")
+        if dated.notna().all():
+            return (dated.dt.year * 12 + dated.dt.month - 1).to_numpy(dtype=np.int64)
+    return None
+
+
+def period_index(df):
+    """
+    Monoton artan dönem anahtarı: yıl * 12 + ay (January=0).
+
+    Yıl Year sütunundan veya tarih / "YYYY-MM" biçimli Month'tan alınır; sayısal Month olduğu gibi kullanılır.
+    Sadece ay adı varsa (tek yıllık özgün veri) yıl 0 kabul edilir.
+    """
+    periods = dated_periods(df)
+    return month_index(df[MONTH_COL]) if periods is None else periods
+
+
+def _next_periods(months, latest):
+    """Yılsız ay sıralarını durumdaki son dönemden (latest) sonraki, o aya denk gelen ilk döneme yerleştirir."""
+    periods = latest - latest % 12 + months
+    # Son dönemden önceki aylar ertesi yıldır; son dönemle aynı ay aynı dönemdir (tekrar çalıştırma yakalanır)
+    return np.where(periods < latest, periods + 12, periods)
+
+
+def feature_names(columns=TEMPORAL_COLS, window=WINDOW):
+    names = ["History_Months", "Months_Since_Prev"]
+    for col in columns:
+        names += [f"{col}_lag1", f"{col}_delta1", f"{col}_rollmean{window}"]
+    return names
+
+
+def _sorted_history(df, columns):
+    """(müşteri, dönem) sıralaması ve sıralı diziler; pos müşterinin kaçıncı gözlemi olduğudur (0'dan)."""
+    codes, uniques = pd.factorize(df[CUSTOMER_ID_COL])
+    months = period_index(df)
+    order = np.lexsort((months, codes))
+    codes_sorted = codes[order]
+    n = len(order)
+    is_start = np.ones(n, dtype=bool)
+    is_start[1:] = codes_sorted[1:] != codes_sorted[:-1]
+    start = np.maximum.accumulate(np.where(is_start, np.arange(n), 0))
+    return {
+        "order": order,
+        "ids": np.asarray(uniques)[codes_sorted],
+        "months": months[order],
+        "values": df[columns].to_numpy(dtype=np.float64)[order],
+        "start": start,
+        "pos": np.arange(n) - start,
+    }
+
+
+def _assemble(n, index, history, months_since, values, lag1, window_sum, window_count, columns, window):
+    out = np.empty((n, 2 + 3 * len(columns)))
+    out[:, 0] = history
+    out[:, 1] = months_since
+    out[:, 2::3] = lag1
+    out[:, 3::3] = values - lag1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out[:, 4::3] = np.where(window_count > 0, window_sum / window_count, np.nan)
+    return pd.DataFrame(out, index=index, columns=feature_names(columns, window))
+
+
+def temporal_features(df, columns=TEMPORAL_COLS, window=WINDOW):
+    """
+    Tüm geçmiş için zamansal özellikler.
+
+    Returns:
+        df ile aynı index ve sırada DataFrame (feature_names sütunları)
+    """
+    h = _sorted_history(df, columns)
+    n = len(h["order"])
+    has_prev = h["pos"] >= 1
+
+    lag1 = np.full_like(h["values"], np.nan)
+    lag1[1:] = h["values"][:-1]
+    lag1[~has_prev] = np.nan
+    months_since = np.full(n, np.nan)
+    months_since[1:] = h["months"][1:] - h["months"][:-1]
+    months_since[~has_prev] = np.nan
+
+    # Kayan pencere: k ay önceki değer, müşterinin k'dan az önceki gözlemi varsa pencereye girmez
+    finite_values = np.where(np.isnan(h["values"]), 0.0, h["values"])
+    finite = ~np.isnan(h["values"])
+    window_sum = finite_values.copy()
+    window_count = finite.astype(np.float64)
+    for k in range(1, window):
+        in_window = (h["pos"][k:] >= k)[:, None]
+        window_sum[k:] += np.where(in_window, finite_values[:-k], 0.0)
+        window_count[k:] += in_window & finite[:-k]
+    sorted_features = _assemble(
+        n, df.index[h["order"]], h["pos"], months_since, h["values"], lag1,
+        window_sum, window_count, columns, window,
+    )
+    return sorted_features.reindex(df.index)
+
+
+def build_state(df, columns=TEMPORAL_COLS, window=WINDOW):
+    """
+    Müşteri başına son durum: son dönem (PERIOD_COL), gözlem sayısı ve en yeniden eskiye son
+    max(WINDOW - 1, 1) değer.
+    """
+    h = _sorted_history(df, columns)
+    n = len(h["order"])
+    is_last = np.ones(n, dtype=bool)
+    is_last[:-1] = h["start"][1:] != h["start"][:-1]
+    last = np.flatnonzero(is_last)
+
+    state = pd.DataFrame({
+        CUSTOMER_ID_COL: h["ids"][last],
+        PERIOD_COL: h["months"][last],
+        "Observations": h["pos"][last] + 1,
+    })
+    for k in range(max(window - 1, 1)):
+        valid = h["pos"][last] >= k
+        past = np.where(valid[:, None], h["values"][np.maximum(last - k, 0)], np.nan)
+        for j, col in enumerate(columns):
+            state[f"{col}_t{k}"] = past[:, j]
+    return state
+
+
+def update(state, new_df, columns=TEMPORAL_COLS, window=WINDOW):
+    """
+    Yeni ayın başvuruları için özellikleri önceki durumdan hesaplar ve durumu ilerletir.
+
+    new_df'de yıl yoksa (sadece ay adı) dönem, durumdaki son dönemden sonraki ilk o ay kabul edilir.
+
+    Returns:
+        (özellikler DataFrame'i (new_df index'i ile), yeni durum)
+    """
+    if new_df[CUSTOMER_ID_COL].duplicated().any():
+        raise ValueError("Yeni ay verisinde her müşteri bir kez bulunmalıdır")
+    depth = max(window - 1, 1)
+    ids = new_df[CUSTOMER_ID_COL].to_numpy()
+    months = dated_periods(new_df)
+    if months is None:
+        latest = int(state[PERIOD_COL].max()) if len(state) else 0
+        months = _next_periods(month_index(new_df[MONTH_COL]), latest)
+    values = new_df[columns].to_numpy(dtype=np.float64)
+
+    loc = pd.Index(state[CUSTOMER_ID_COL]).get_indexer(ids)
+    known = loc >= 0
+    last_month = np.where(known, state[PERIOD_COL].to_numpy()[loc], -1)
+    if (known & (months <= last_month)).any():
+        raise ValueError("Yeni ay verisi, müşterinin durumdaki son ayından sonra olmalıdır")
+
+    past = np.full((len(new_df), depth, len(columns)), np.nan)
+    for k in range(depth):
+        stored = state[[f"{col}_t{k}" for col in columns]].to_numpy()
+        past[known, k] = stored[loc[known]]
+
+    window_values = np.concatenate([values[:, None, :], past[:, :window - 1]], axis=1)
+    finite = ~np.isnan(window_values)
+    history = np.where(known, state["Observations"].to_numpy()[loc], 0)
+    features = _assemble(
+        len(new_df), new_df.index, history, np.where(known, months - last_month, np.nan), values, past[:, 0],
+        np.where(finite, window_values, 0.0).sum(axis=1), finite.sum(axis=1), columns, window,
+    )
+
+    advanced = pd.DataFrame({CUSTOMER_ID_COL: ids, PERIOD_COL: months, "Observations": history + 1})
+    shifted = np.concatenate([values[:, None, :], past[:, :depth - 1]], axis=1)
+    for k in range(depth):
+        for j, col in enumerate(columns):
+            advanced[f"{col}_t{k}"] = shifted[:, k, j]
+    new_state = pd.concat([state[~state[CUSTOMER_ID_COL].isin(ids)], advanced], ignore_index=True)
+    return features, new_state
+
+
+def load_state(path=TEMPORAL_STATE_PATH):
+    # Eski durum dosyalarındaki yılın ayı (0-11) tek yıllık veride yıl 0 dönemidir
+    return pd.read_parquet(path).rename(columns={"Month_Index": PERIOD_COL})
+
+
+def save_state(state, path=TEMPORAL_STATE_PATH):
+    tmp = f"{path}.tmp-{os.getpid()}"
+    state.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _write(df, path):
+    if path.endswith(".parquet"):
+        df.to_parquet(path)
+    else:
+        df.to_csv(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Müşteri geçmişinden zamansal özellikler üretir.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Tüm geçmişten özellikler ve müşteri durumu")
+    build.add_argument("data")
+    build.add_argument("output")
+    build.add_argument("--state", default=TEMPORAL_STATE_PATH)
+    build.add_argument("--year", type=int, default=None, help="Year sütunu yoksa verinin yılı")
+    step = sub.add_parser("update", help="Yeni ay için durumdan artımlı özellikler")
+    step.add_argument("data")
+    step.add_argument("output")
+    step.add_argument("--state", default=TEMPORAL_STATE_PATH)
+    step.add_argument("--year", type=int, default=None, help="Year sütunu yoksa yeni ayın yılı")
+    args = parser.parse_args(argv)
+
+    df = read_frame(args.data)
+    if args.year is not None and YEAR_COL not in df.columns:
+        df[YEAR_COL] = args.year
+    if args.command == "build":
+        features, state = temporal_features(df), build_state(df)
+    else:
+        features, state = update(load_state(args.state), df)
+    _write(features, args.output)
+    save_state(state, args.state)
+    print(f"{len(features):,} satır -> {args.output} | {len(state):,} müşteri durumu -> {args.state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Model eğitim hattı: tam eğitim ve yeni aylık veriyle artımlı güncelleme.
+
+Tam eğitim notebook'taki StackingClassifier (XGBoost, RandomForest, LightGBM + LogisticRegression) kurulumunu
+kullanır. Artımlı modda mevcut modeller sıfırdan eğitilmez:
+
+- XGBoost ve LightGBM mevcut booster'dan devam ederek yeni veriyle ağaç ekler.
+- RandomForest warm_start ile yeni veriden ağaç ekler, eski ağaçlar korunur.
+- Stack'in LogisticRegression meta modeli, güncellenen taban modellerin yeni veri üzerindeki
+  out-of-fold tahminleriyle yeniden eğitilir.
+- Kademeli skorlamanın ilk aşaması (cascade.py) kayıtlıysa aynı veriyle ağaç ekler ve yeni stack sürümüyle
+  kaydedilir.
+
+Böylece eğitim süresi tüm geçmişle değil, yeni verinin büyüklüğüyle orantılıdır. Her çalıştırma models/ altında
+yeni bir sürüm olarak kaydedilir (artifacts.py).
+
+Veri ham başvurular (CSV, Parquet, sütunlu klasör) veya notebook'un kaydettiği hazır model girdisi klasörü
+(df_for_model, preprocessed_data) olabilir; ikincisi kodlanmadan ve ölçeklenmeden doğrudan okunur (model_input).
+
+Kullanım:
+    python -m credit_scoring.training data/2026-10.csv --model supervised --mode incremental --new-trees 50
+    python -m credit_scoring.training data/train.csv --mode full --distill   # ardından hızlı öğrenci (distill.py)
+    python -m credit_scoring.training data/df_for_model --mode full   # hazır model girdisi
+"""
+import argparse
+import copy
+import json
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, StackingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+
+from credit_scoring.artifacts import current_version, save_versioned
+from credit_scoring.dataset_io import column_names, is_columnar, is_model_matrix, load_model_matrix, read_table
+from credit_scoring.encoders import ENCODER_ARTIFACT
+from credit_scoring.features import encode_raw
+from credit_scoring.pipelines import (
+    PseudoLabelPipeline, PseudoLabelStudentPipeline, SupervisedPipeline, SupervisedStudentPipeline, load_pickle
+)
+from credit_scoring.schema import (
+    CASCADE_FIRST_STAGE_PATH, CATEGORICAL_VOCABULARIES, CLASSIC_SCALER_PATH, CREDIT_SCORE_COL, MODEL_TARGET_COL,
+    SUPERVISED_FEATURES
+)
+
+POSITIVE_CLASS = "Poor"
+PIPELINES = {"supervised": SupervisedPipeline, "pseudo_label": PseudoLabelPipeline}
+# Damıtılmış öğrenciler (distill.py): öğretmen hattının adıyla anahtarlanır
+STUDENT_PIPELINES = {"supervised": SupervisedStudentPipeline, "pseudo_label": PseudoLabelStudentPipeline}
+# Kademeli skorlamanın (cascade.py) denetim kaydındaki sürümü, belirsiz kararları veren stack'in sürümüdür
+ARTIFACT_NAMES = {
+    "supervised": "stack_supervised", "pseudo_label": "pseudo_label_model", "cascade": "stack_supervised",
+    "supervised_fast": "supervised_student", "pseudo_label_fast": "pseudo_label_student",
+}
+# Kademeli skorlamanın ilk aşaması; tam eğitimde stack ile birlikte eğitilir
+FIRST_STAGE_ARTIFACT = "cascade_first_stage"
+# Öğrenci modelin ağaç/derinlik bütçesi (distill.py --trees/--depth/--leaves ile değiştirilebilir)
+STUDENT_BUDGET = {"n_estimators": 100, "max_depth": 4, "num_leaves": 15}
+
+
+def build_stack(params=None):
+    """
+    Notebook'taki stacking kurulumu.
+
+    params verilirse (ör. tuning.py'nin best_params.json çıktısı) set_params ile uygulanır:
+    {"xgb__max_depth": 4, "rf__n_estimators": 300, ...}
+    """
+    from lightgbm import LGBMClassifier
+    from xgboost import XGBClassifier
+
+    stack = StackingClassifier(
+        estimators=[
+            ("xgb", XGBClassifier(n_estimators=200, learning_rate=0.05, max_depth=6,
+                                  eval_metric="logloss", random_state=42)),
+            ("rf", RandomForestClassifier(n_estimators=200, max_depth=10, class_weight="balanced",
+                                          random_state=42)),
+            ("lgbm", LGBMClassifier(n_estimators=200, learning_rate=0.05, max_depth=6,
+                                    class_weight="balanced", random_state=42, verbose=-1)),
+        ],
+        final_estimator=LogisticRegression(max_iter=1000, random_state=42),
+        passthrough=True,
+        cv=5,
+        n_jobs=-1,
+    )
+    return stack.set_params(**params) if params else stack
+
+
+def build_first_stage():
+    """Kademeli skorlamanın ilk aşaması: stack ile aynı 35 özellikte tek, sığ bir LightGBM."""
+    from lightgbm import LGBMClassifier
+
+    return LGBMClassifier(n_estimators=60, learning_rate=0.1, max_depth=3, num_leaves=7,
+                          class_weight="balanced", random_state=42, verbose=-1)
+
+
+def build_student(budget=None):
+    """
+    Damıtma öğrencisi: bütçesi sınırlı tek bir LightGBM (STUDENT_BUDGET; budget verilen anahtarları değiştirir).
+
+    Tek iş parçacığı: tek başvuruluk tahminlerde iş parçacığı başlatma maliyeti ağaç gezinmesinden büyüktür.
+    """
+    from lightgbm import LGBMClassifier
+
+    return LGBMClassifier(learning_rate=0.1, min_child_samples=20, random_state=42, n_jobs=1, verbose=-1,
+                          **{**STUDENT_BUDGET, **(budget or {})})
+
+
+def binary_target(df, target_col=None):
+    """
+    İkili hedef: target sütunu varsa o, yoksa Credit_Score == "Poor" (notebook'taki target_binary).
+    """
+    if target_col:
+        return df[target_col].to_numpy(dtype=int)
+    if MODEL_TARGET_COL in df.columns:
+        return df[MODEL_TARGET_COL].to_numpy(dtype=int)
+    return (df[CREDIT_SCORE_COL] == POSITIVE_CLASS).to_numpy(dtype=int)
+
+
+def read_frame(path):
+    """
+    Ham başvurular: CSV, Parquet veya sütunlu klasör (dataset_io, mmap ile açılır).
+
+    Hazır model girdisi klasörlerinde ham kategorik alanlar yoktur; encode_raw'da KeyError yerine burada açık bir
+    hata verilir (bu klasörleri read_data / model_input okur).
+    """
+    if is_columnar(path) and not set(CATEGORICAL_VOCABULARIES) <= set(column_names(path)):
+        raise ValueError(f"{path} ham başvuru değil, hazır model girdisi (ölçeklenmiş ve kodlanmış sütunlar); "
+                         "sadece training, tuning ve batch bu klasörleri okur")
+    return read_table(path)
+
+
+def read_data(path, feature_names=SUPERVISED_FEATURES):
+    """Hazır model girdisi klasörüyse yolun kendisi (model_input mmap ile açar), değilse ham veri DataFrame'i."""
+    return path if is_model_matrix(path, feature_names) else read_frame(path)
+
+
+def model_input(pipeline, data, target_col=None):
+    """
+    Model girdisi ve ikili hedef.
+
+    data ham başvuru DataFrame'i ise kodlanıp pipeline.transform ile ölçeklenir; hazır model girdisi klasörünün
+    yolu ise (read_data) sütunlar pipeline.feature_names sırasıyla doğrudan matrise okunur.
+
+    Returns:
+        (X, y); veride hedef yoksa y None
+    """
+    if isinstance(data, str):
+        return load_model_matrix(data, pipeline.feature_names, target_col or MODEL_TARGET_COL)
+    labelled = bool(target_col) or MODEL_TARGET_COL in data.columns or CREDIT_SCORE_COL in data.columns
+    return pipeline.transform(encode_raw(data)), binary_target(data, target_col) if labelled else None
+
+
+def update_estimator(estimator, X, y, new_trees):
+    """
+    Eğitilmiş bir modeli yeni veriyle yerinde günceller.
+
+    - XGBoost / LightGBM: mevcut booster'dan devam ederek new_trees tur ekler
+    - RandomForest / ExtraTrees: warm_start ile new_trees ağaç ekler
+    - StackingClassifier: refresh_stack
+    """
+    kind = type(estimator).__name__
+    if kind == "XGBClassifier":
+        booster = estimator.get_booster()
+        estimator.set_params(n_estimators=new_trees)
+        estimator.fit(X, y, xgb_model=booster)
+    elif kind == "LGBMClassifier":
+        booster = estimator.booster_
+        estimator.set_params(n_estimators=new_trees)
+        estimator.fit(X, y, init_model=booster)
+    elif kind in ("RandomForestClassifier", "ExtraTreesClassifier"):
+        estimator.set_params(warm_start=True, n_estimators=len(estimator.estimators_) + new_trees)
+        estimator.fit(X, y)
+    elif isinstance(estimator, StackingClassifier):
+        refresh_stack(estimator, X, y, new_trees)
+    else:
+        raise TypeError(f"{kind} için artımlı güncelleme desteklenmiyor")
+    return estimator
+
+
+def refresh_stack(stack, X, y, new_trees, cv=5, random_state=42):
+    """
+    Stack'i yeni veriyle günceller.
+
+    Meta model için yeni verinin her katmanı, taban modellerin o katman hariç güncellenmiş kopyalarıyla
+    tahminlenir (out-of-fold); ardından taban modeller tüm yeni veriyle güncellenir ve sadece
+    LogisticRegression meta modeli bu tahminlerle (önceki katsayılardan başlayarak) yeniden eğitilir.
+    """
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    meta_features = None
+    for train_idx, test_idx in folds.split(X, y):
+        fold_stack = copy.copy(stack)
+        fold_stack.estimators_ = [
+            update_estimator(copy.deepcopy(est), X[train_idx], y[train_idx], new_trees)
+            for est in stack.estimators_
+        ]
+        fold_meta = fold_stack.transform(X[test_idx])
+        if meta_features is None:
+            meta_features = np.empty((len(X), fold_meta.shape[1]), dtype=fold_meta.dtype)
+        meta_features[test_idx] = fold_meta
+
+    for est in stack.estimators_:
+        update_estimator(est, X, y, new_trees)
+
+    final = stack.final_estimator_
+    if "warm_start" in final.get_params():
+        final.set_params(warm_start=True)
+    final.fit(meta_features, y)
+    return stack
+
+
+def train(df, model="supervised", mode="incremental", new_trees=50, target_col=None, eval_df=None,
+          promote=True, stack_params=None):
+    """
+    Modeli eğitir veya günceller ve yeni sürüm olarak kaydeder.
+
+    Tam eğitim sadece supervised stack için yapılabilir; pseudo label modeli etiketleme hattı
+    notebook dışında olduğundan yalnızca artımlı güncellenir. Kademeli skorlamanın ilk aşaması tam eğitimde aynı
+    veriyle eğitilir, artımlı modda (kayıtlıysa) stack ile birlikte güncellenir; yeni stack sürümüyle kaydedilir.
+    df ham başvuru DataFrame'i veya hazır model girdisi klasörüdür (read_data).
+
+    Returns:
+        dict (sürüm, süre, satır sayısı, F1)
+    """
+    if mode == "full":
+        if model != "supervised":
+            raise ValueError("Tam eğitim sadece supervised stack için desteklenir")
+        # Mevcut stack kullanılmayacağı için açılmaz; dönüşüm için ölçekleyici yeterli (kodlayıcı: encode_raw)
+        pipeline = SupervisedPipeline(load_pickle(CLASSIC_SCALER_PATH), None)
+    else:
+        pipeline = PIPELINES[model].load()
+    X, y = model_input(pipeline, df, target_col)
+    if y is None:
+        raise ValueError("Eğitim verisinde hedef sütunu yok")
+
+    start = time.perf_counter()
+    first_stage = None
+    if mode == "full":
+        pipeline.model = build_stack(stack_params).fit(X, y)
+        first_stage = build_first_stage().fit(X, y)
+    else:
+        update_estimator(pipeline.model, X, y, new_trees)
+        if model == "supervised":
+            try:
+                first_stage = update_estimator(load_pickle(CASCADE_FIRST_STAGE_PATH), X, y, new_trees)
+            except FileNotFoundError:
+                pass  # Kademeli skorlama kurulmamış (cascade.py train)
+    seconds = time.perf_counter() - start
+
+    report = {"mode": mode, "rows": int(len(X)), "train_seconds": round(seconds, 3),
+              "encoder_version": current_version(ENCODER_ARTIFACT)}
+    if mode == "full" and stack_params:
+        report["stack_params"] = stack_params
+    if mode == "incremental":
+        report["new_trees"] = new_trees
+    if eval_df is not None:
+        X_eval, y_eval = model_input(pipeline, eval_df, target_col)
+        y_pred = pipeline.model.predict(X_eval)
+        report["eval_f1"] = round(float(f1_score(y_eval, y_pred)), 4)
+
+    version, path = save_versioned(pipeline.model, ARTIFACT_NAMES[model], report, promote=promote)
+    if first_stage is not None:
+        report["first_stage_version"], _ = save_versioned(
+            first_stage, FIRST_STAGE_ARTIFACT, {"stack_version": version, "rows": report["rows"], "mode": mode},
+            promote=promote,
+        )
+    return {"version": version, "path": path, **report}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Modeli tam veya artımlı olarak eğitir, sürümlü kaydeder.")
+    parser.add_argument("data", help="Eğitim verisi (not_scaled_processed_data.csv biçiminde CSV/Parquet)")
+    parser.add_argument("--model", choices=sorted(PIPELINES), default="supervised")
+    parser.add_argument("--mode", choices=["incremental", "full"], default="incremental")
+    parser.add_argument("--new-trees", type=int, default=50, help="Artımlı modda her ağaç modeline eklenecek ağaç")
+    parser.add_argument("--target-col", default=None, help="İkili hedef sütunu (ör. pseudo etiketler)")
+    parser.add_argument("--eval-data", default=None, help="F1 raporu için değerlendirme verisi")
+    parser.add_argument("--stack-params", default=None, help="Tam eğitimde kullanılacak parametreler (JSON, tuning)")
+    parser.add_argument("--no-promote", action="store_true", help="Sürümü kaydet ama models/<ad>.pkl'i değiştirme")
+    parser.add_argument("--distill", action="store_true", help="Yeni modelden hızlı öğrenciyi de damıt (distill.py)")
+    args = parser.parse_args(argv)
+    if args.distill and args.no_promote:
+        parser.error("--distill etkin modeli öğretmen olarak kullanır; --no-promote ile birlikte kullanılamaz")
+
+    stack_params = None
+    if args.stack_params:
+        with open(args.stack_params, encoding="utf-8") as f:
+            stack_params = json.load(f)
+    feature_names = PIPELINES[args.model].feature_names
+    df = read_data(args.data, feature_names)
+    eval_df = read_data(args.eval_data, feature_names) if args.eval_data else None
+    report = train(
+        df, model=args.model, mode=args.mode, new_trees=args.new_trees, target_col=args.target_col,
+        eval_df=eval_df, promote=not args.no_promote, stack_params=stack_params,
+    )
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+    if args.distill:
+        from credit_scoring.distill import distill
+
+        student = distill(df, model=args.model, eval_df=eval_df)
+        for key, value in student.items():
+            print(f"student_{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Stacking modeli için paralel ardışık yarılama (successive halving) hiperparametre araması.
+
+Notebook'taki gibi her aday için tam 5 katlı cross_val_score yerine adaylar artan tur sayısıyla (XGBoost,
+RandomForest ve LightGBM n_estimators) değerlendirilir: her basamakta en iyi 1/eta aday bir sonraki, daha
+pahalı basamağa geçer. Sadece son basamak tam tur sayısıyla eğitilir.
+
+- Model girdisi (pipeline.transform) ve katman atamaları bir kez hesaplanıp çalışma klasörüne .npy olarak
+  yazılır; aynı veriyle sonraki aramalar bu önbelleği kullanır. İşçi süreçler dosyaları mmap ile açar.
+  Hazır model girdisi klasörü (notebook'un df_for_model'i) verilirse sütunları doğrudan matrise okunur.
+- (aday, tur, katman) eğitimleri süreç havuzunda koşar; her eğitim tek iş parçacıklıdır.
+- Biten her eğitim checkpoint.json'a atomik olarak yazılır; yarıda kalan arama aynı komutla kaldığı yerden
+  devam eder.
+
+Sonuç: en iyi parametreler (best_params.json, training --stack-params ile kullanılır) ve basamak başına süre /
+skor raporu.
+
+Kullanım:
+    python -m credit_scoring.tuning data/not_scaled_processed_data.csv --candidates 27 --jobs 8
+    python -m credit_scoring.training data/not_scaled_processed_data.csv --mode full \\
+        --stack-params data/tuning/best_params.json
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+
+from credit_scoring.pipelines import MODEL_DTYPE
+from credit_scoring.schema import DATA_DIR
+from credit_scoring.training import PIPELINES, build_stack, model_input, read_data
+
+TUNING_DIR = os.path.join(DATA_DIR, "tuning")
+SEARCH_SPACE = {
+    "xgb__max_depth": [4, 6, 8],
+    "xgb__learning_rate": [0.05, 0.1],
+    "rf__max_depth": [8, 10, 14],
+    "rf__min_samples_leaf": [1, 5],
+    "lgbm__num_leaves": [15, 31, 63],
+    "lgbm__learning_rate": [0.05, 0.1],
+}
+# Notebook'taki elle seçilmiş ayarlar her aramada ilk aday olarak yer alır
+BASELINE_PARAMS = {
+    "xgb__max_depth": 6, "xgb__learning_rate": 0.05, "rf__max_depth": 10, "rf__min_samples_leaf": 1,
+    "lgbm__num_leaves": 31, "lgbm__learning_rate": 0.05,
+}
+RESOURCE_PARAMS = ["xgb__n_estimators", "rf__n_estimators", "lgbm__n_estimators"]
+SINGLE_THREAD_PARAMS = {"n_jobs": 1, "xgb__n_jobs": 1, "rf__n_jobs": 1, "lgbm__n_jobs": 1}
+
+# İşçi süreç durumu (_init_worker ile bir kez doldurulur)
+_worker = {}
+
+
+def sample_candidates(n_candidates, space=SEARCH_SPACE, seed=42):
+    """Arama uzayından tekrarsız rastgele adaylar; ilk aday notebook ayarlarıdır."""
+    names = list(space)
+    grid = [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+    rest = [params for params in grid if params != BASELINE_PARAMS]
+    rng = np.random.default_rng(seed)
+    picked = rng.choice(len(rest), size=min(n_candidates - 1, len(rest)), replace=False)
+    return [dict(BASELINE_PARAMS)] + [rest[i] for i in sorted(picked)]
+
+
+def resource_schedule(min_resource, max_resource, eta):
+    """Basamakların tur sayıları: min_resource * eta^k, son basamak max_resource."""
+    schedule = []
+    resource = min_resource
+    while resource < max_resource:
+        schedule.append(int(resource))
+        resource *= eta
+    return schedule + [max_resource]
+
+
+def make_candidate(params, resource):
+    """Adayın parametreleri ve basamağın tur sayısıyla tek iş parçacıklı stack."""
+    return build_stack({**params, **dict.fromkeys(RESOURCE_PARAMS, resource), **SINGLE_THREAD_PARAMS})
+
+
+def _signature(path, model, n_splits, seed):
+    stat = os.stat(path)
+    key = json.dumps([os.path.abspath(path), stat.st_size, stat.st_mtime, model, n_splits, seed])
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def prepare_cache(data_path, work_dir=TUNING_DIR, model="supervised", n_splits=5, seed=42):
+    """
+    Model girdisi (float32), hedef ve katman numaralarını bir kez hesaplayıp work_dir altına yazar.
+
+    Returns:
+        Önbellek klasörü (X.npy, y.npy, folds.npy)
+    """
+    cache_dir = os.path.join(work_dir, f"cache-{_signature(data_path, model, n_splits, seed)}")
+    if os.path.exists(os.path.join(cache_dir, "folds.npy")):
+        return cache_dir
+    os.makedirs(cache_dir, exist_ok=True)
+    data = read_data(data_path, PIPELINES[model].feature_names)
+    # Hazır model girdisinde sadece özellik adları gerekir; model dosyaları yüklenmez
+    pipeline = PIPELINES[model] if isinstance(data, str) else PIPELINES[model].load()
+    X, y = model_input(pipeline, data)
+    if y is None:
+        raise ValueError(f"{data_path}: hedef sütunu yok")
+    X = X.astype(MODEL_DTYPE, copy=False)
+    folds = np.empty(len(y), dtype=np.int8)
+    for k, (_, test_idx) in enumerate(StratifiedKFold(n_splits, shuffle=True, random_state=seed).split(X, y)):
+        folds[test_idx] = k
+    np.save(os.path.join(cache_dir, "X.npy"), X)
+    np.save(os.path.join(cache_dir, "y.npy"), y)
+    # folds.npy en son yazılır: varlığı önbelleğin tamamlandığını gösterir
+    np.save(os.path.join(cache_dir, "folds.npy"), folds)
+    return cache_dir
+
+
+def _init_worker(cache_dir):
+    _worker["X"] = np.load(os.path.join(cache_dir, "X.npy"), mmap_mode="r")
+    _worker["y"] = np.load(os.path.join(cache_dir, "y.npy"))
+    _worker["folds"] = np.load(os.path.join(cache_dir, "folds.npy"))
+
+
+def _fit_fold(task):
+    candidate, params, resource, fold = task
+    X, y, folds = _worker["X"], _worker["y"], _worker["folds"]
+    train_idx, test_idx = np.flatnonzero(folds != fold), np.flatnonzero(folds == fold)
+    start = time.perf_counter()
+    stack = make_candidate(params, resource).fit(X[train_idx], y[train_idx])
+    score = f1_score(y[test_idx], stack.predict(X[test_idx]))
+    return candidate, resource, fold, float(score), time.perf_counter() - start
+
+
+def _task_key(candidate, resource, fold):
+    return f"{candidate}:{resource}:{fold}"
+
+
+def _save_checkpoint(state, path):
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path, settings):
+    """Aynı ayarlarla başlatılmış aramanın kayıtlı sonuçları; ayarlar farklıysa ValueError."""
+    if not os.path.exists(path):
+        return {"settings": settings, "results": {}}
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state["settings"] != settings:
+        raise ValueError(f"{path} farklı ayarlarla başlatılmış bir aramaya ait; başka bir --work-dir kullanın")
+    return state
+
+
+def successive_halving(data_path, work_dir=TUNING_DIR, model="supervised", n_candidates=27, eta=3,
+                       min_resource=25, max_resource=200, n_splits=5, jobs=None, seed=42):
+    """
+    Ardışık yarılama araması; checkpoint'te sonucu olan eğitimler tekrar çalıştırılmaz.
+
+    Returns:
+        rapor dict (en iyi parametreler, basamaklar, süreler)
+    """
+    jobs = jobs or os.cpu_count()
+    os.makedirs(work_dir, exist_ok=True)
+    start = time.perf_counter()
+    cache_dir = prepare_cache(data_path, work_dir, model, n_splits, seed)
+    prepare_seconds = time.perf_counter() - start
+
+    candidates = sample_candidates(n_candidates, seed=seed)
+    schedule = resource_schedule(min_resource, max_resource, eta)
+    settings = {"cache": os.path.basename(cache_dir), "candidates": candidates, "schedule": schedule,
+                "eta": eta, "n_splits": n_splits}
+    checkpoint_path = os.path.join(work_dir, "checkpoint.json")
+    state = load_checkpoint(checkpoint_path, settings)
+    results = state["results"]
+
+    rungs = []
+    alive = list(range(len(candidates)))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(cache_dir,)) as pool:
+        for rung, resource in enumerate(schedule):
+            rung_start = time.perf_counter()
+            tasks = [(c, candidates[c], resource, k) for c in alive for k in range(n_splits)
+                     if _task_key(c, resource, k) not in results]
+            for future in as_completed([pool.submit(_fit_fold, task) for task in tasks]):
+                candidate, res, fold, score, seconds = future.result()
+                results[_task_key(candidate, res, fold)] = {"f1": score, "seconds": seconds}
+                _save_checkpoint(state, checkpoint_path)
+
+            scores = {c: np.mean([results[_task_key(c, resource, k)]["f1"] for k in range(n_splits)])
+                      for c in alive}
+            fit_seconds = [results[_task_key(c, resource, k)]["seconds"] for c in alive for k in range(n_splits)]
+            ranked = sorted(alive, key=lambda c: -scores[c])
+            rungs.append({
+                "rung": rung, "resource": resource, "candidates": len(alive), "fits": len(fit_seconds),
+                "resumed_fits": len(fit_seconds) - len(tasks),
+                "wall_seconds": round(time.perf_counter() - rung_start, 3),
+                "mean_fit_seconds": round(float(np.mean(fit_seconds)), 3),
+                "best_candidate": ranked[0], "best_f1": round(float(scores[ranked[0]]), 4),
+                "baseline_f1": round(float(scores[0]), 4) if 0 in scores else None,
+            })
+            if rung < len(schedule) - 1:
+                alive = ranked[:max(math.ceil(len(alive) / eta), 1)]
+
+    best = ranked[0]
+    best_params = {**candidates[best], **dict.fromkeys(RESOURCE_PARAMS, max_resource)}
+    grid_size = math.prod(len(v) for v in SEARCH_SPACE.values())
+    report = {
+        "best_candidate": best,
+        "best_f1": rungs[-1]["best_f1"],
+        "best_params": best_params,
+        "rungs": rungs,
+        "prepare_seconds": round(prepare_seconds, 3),
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "jobs": jobs,
+        # Aynı katmanlarla tüm ızgaranın tam turla değerlendirilmesinin tahmini süresi (tek çekirdek)
+        "full_grid_estimate_seconds": round(grid_size * n_splits * rungs[-1]["mean_fit_seconds"], 1),
+    }
+    with open(os.path.join(work_dir, "best_params.json"), "w", encoding="utf-8") as f:
+        json.dump(best_params, f, indent=1)
+    with open(os.path.join(work_dir, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stacking modeli için ardışık yarılama hiperparametre araması.")
+    parser.add_argument("data", help="Etiketli veri (not_scaled_processed_data.csv biçiminde CSV/Parquet)")
+    parser.add_argument("--work-dir", default=TUNING_DIR, help="Önbellek, checkpoint ve sonuç klasörü")
+    parser.add_argument("--model", choices=sorted(PIPELINES), default="supervised",
+                        help="Girdi düzeni (özellik dönüşümü) bu hattan alınır")
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--eta", type=int, default=3, help="Her basamakta kalan aday oranı 1/eta")
+    parser.add_argument("--min-resource", type=int, default=25, help="İlk basamağın tur (ağaç) sayısı")
+    parser.add_argument("--max-resource", type=int, default=200, help="Son basamağın tur (ağaç) sayısı")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=None, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    report = successive_halving(
+        args.data, args.work_dir, args.model, args.candidates, args.eta, args.min_resource, args.max_resource,
+        args.folds, args.jobs, args.seed,
+    )
+    for rung in report.pop("rungs"):
+        print(f"basamak {rung['rung']}: {rung['resource']} tur, {rung['candidates']} aday, "
+              f"{rung['wall_seconds']} sn (devralınan {rung['resumed_fits']} eğitim) | en iyi F1 {rung['best_f1']}")
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    print(f"en iyi parametreler -> {os.path.join(args.work_dir, 'best_params.json')}")
+
+
+if __name__ == "__main__":
+    main()
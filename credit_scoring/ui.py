@@ -0,0 +1,131 @@
+"""
+Sayfalar arasında paylaşılan Streamlit bileşenleri.
+"""
+import pandas as pd
+import streamlit as st
+
+from credit_scoring.encoders import shared_encoder
+from credit_scoring.feature_store import FeatureStore, active_path
+from credit_scoring.schema import FEATURE_STORE_DIR, LOAN_TYPES, MONTH_COL
+
+APPLICATION_SOURCES = ["Form", "Müşteri ID"]
+
+
+def application_form():
+    """
+    Başvuru formu; iki modelin de ihtiyaç duyduğu tüm ham alanları toplar.
+
+    Kategorik seçenekler modellerin kullandığı kodlayıcının (encoders.py) sözlükleridir.
+
+    Returns:
+        Tek satırlık ham başvuru DataFrame'i (features.encode_raw girdisi)
+    """
+    vocabularies = shared_encoder().vocabularies
+    age = st.slider("Yaş", 18, 85, 30)
+    annual_income = st.number_input("Yıllık Gelir (₺)", min_value=0.0, value=50000.0)
+    monthly_salary = st.number_input("Aylık Maaş", min_value=0.0, value=4000.0)
+    num_accounts = st.slider("Banka Hesap Sayısı", 0, 10, 2)
+    num_credit_cards = st.slider("Kredi Kartı Sayısı", 0, 10, 2)
+    interest_rate = st.slider("Kredi Faiz Oranı (%)", 0.0, 50.0, 10.0)
+    num_loans = st.slider("Kredi Sayısı", 0, 10, 1)
+    delay_from_due = st.slider("Vade Gecikme Süresi (gün)", 0, 60, 5)
+    num_delayed_payments = st.slider("Gecikmiş Ödeme Sayısı", 0, 20, 2)
+    changed_credit_limit = st.slider("Kredi Limit Değişimi (%)", -100.0, 100.0, 10.0)
+    num_credit_inquiries = st.slider("Kredi Sorgusu Sayısı", 0, 20, 1)
+    outstanding_debt = st.number_input("Kalan Borç (₺)", min_value=0.0, value=20000.0)
+    credit_utilization_ratio = st.slider("Kredi Kullanım Oranı (%)", 0.0, 100.0, 45.0)
+    credit_history_age = st.slider("Kredi Geçmişi (Ay)", 0, 500, 12)
+    payment_of_min = st.selectbox("Asgari Ödeme Yapıldı mı?", ["Yes", "No"])
+    monthly_investment = st.number_input("Aylık Yatırım (₺)", min_value=0.0, value=500.0)
+    total_emi = st.number_input("Aylık EMI (₺)", min_value=0.0, value=1000.0)
+    monthly_balance = st.number_input("Aylık Bakiye (₺)", min_value=0.0, value=3000.0)
+    occupation = st.selectbox("Meslek", vocabularies["Occupation"])
+    payment_behaviour = st.selectbox("Ödeme Davranışı", vocabularies["Payment_Behaviour"])
+    credit_mix = st.selectbox("Kredi Karışımı", vocabularies["Credit_Mix"],
+                              index=vocabularies["Credit_Mix"].index("Standard"))
+    loan_selected = st.multiselect("Kredi Tür(leri)", LOAN_TYPES, default=["Not Specified"])
+
+    return pd.DataFrame([{
+        "Age": age, "Annual_Income": annual_income, "Monthly_Inhand_Salary": monthly_salary,
+        "Num_Bank_Accounts": num_accounts, "Num_Credit_Card": num_credit_cards,
+        "Interest_Rate": interest_rate, "Num_of_Loan": num_loans, "Delay_from_due_date": delay_from_due,
+        "Num_of_Delayed_Payment": num_delayed_payments, "Changed_Credit_Limit": changed_credit_limit,
+        "Num_Credit_Inquiries": num_credit_inquiries, "Outstanding_Debt": outstanding_debt,
+        "Credit_Utilization_Ratio": credit_utilization_ratio, "Credit_History_Age": credit_history_age,
+        "Total_EMI_per_month": total_emi, "Amount_invested_monthly": monthly_investment,
+        "Monthly_Balance": monthly_balance, "Payment_of_Min_Amount": {"Yes": 1, "No": 0}[payment_of_min],
+        "Occupation": occupation, "Payment_Behaviour": payment_behaviour, "Credit_Mix": credit_mix,
+        **{loan_type: int(loan_type in loan_selected) for loan_type in LOAN_TYPES}
+    }])
+
+
+@st.cache_resource
+def _open_feature_store(path):
+    return FeatureStore(path)
+
+
+def feature_store(root=FEATURE_STORE_DIR):
+    """
+    Etkin sürümdeki özellik deposu; aylık yenileme CURRENT dosyasını değiştirince yeni sürüm açılır.
+
+    Returns:
+        FeatureStore veya depo kurulmamışsa None
+    """
+    try:
+        return _open_feature_store(active_path(root))
+    except FileNotFoundError:
+        return None
+
+
+def customer_application(store):
+    """
+    Müşteri ID'si ile depodaki son ayın ham başvuru satırı.
+
+    Returns:
+        Tek satırlık ham başvuru DataFrame'i (Customer_ID ile) veya None
+    """
+    if store is None:
+        st.info("Özellik deposu bulunamadı. Kurulum: "
+                "python -m credit_scoring.feature_store build data/not_scaled_processed_data.csv")
+        return None
+    customer_id = st.text_input("Müşteri ID", placeholder="CUS_0xd40").strip()
+    if not customer_id:
+        return None
+    application = store.frame([customer_id])
+    if application.empty:
+        st.warning(f"{customer_id} özellik deposunda bulunamadı.")
+        return None
+    st.caption(f"Son kayıt: {application[MONTH_COL].iloc[0]} | Depo sürümü: {store.version}")
+    st.dataframe(application.drop(columns=MONTH_COL), hide_index=True)
+    return application
+
+
+def optional_explainer(load):
+    """
+    Açıklayıcıyı yükler; yüklenemezse (ör. desteklenmeyen model tipinde make_explainer'ın TypeError'ı) None döner.
+
+    Açıklamalar ikincildir: skorlama sayfası durmaz, neden tablosu yerine "açıklama yok" gösterilir.
+    """
+    try:
+        return load()
+    except Exception:
+        return None
+
+
+def audit_health(logger):
+    """Denetim kaydı yazıcısı durduysa veya yazamadığı kayıt varsa (audit.AuditLogger.stats) uyarı gösterir."""
+    stats = logger.stats()
+    if not stats["writer_alive"]:
+        st.error("Denetim kaydı yazıcısı çalışmıyor; kararlar diske kaydedilmiyor.")
+    elif stats["errors"]:
+        st.warning(f"Denetim kaydında {stats['errors']} yazım hatası: {stats['dead_lettered']} satır _dead_letter/ "
+                   f"altında, {stats['lost']} satır kayıp. Son hata: {stats['last_error']}")
+
+
+def substitution_notice(application):
+    """Eksik veya bilinmeyen kategorik değerler yedek kategoriye atandıysa (encoders.CategoricalEncoder) uyarır."""
+    substituted = shared_encoder().substitutions(application)
+    if substituted:
+        st.warning("Yedek kategoriye atanan değerler: " + "; ".join(
+            f"{col}: {', '.join(map(str, values))} → {fallback}" for col, (values, fallback) in substituted.items()
+        ))
@@ -6,8 +6,45 @@ import matplotlib.pyplot as plt
 import numpy as np
 import streamlit.components.v1 as components
 
+from credit_scoring.chart_data import box_figure, histogram_figure, sample_for_chart, violin_figure
+from credit_scoring.correlation import CorrelationCells, strongest_pairs
+from credit_scoring.figure_cache import dataset_version, shared_figure_cache
+from credit_scoring.filters import ALL_OCCUPATIONS, apply_filters, filter_key
+from credit_scoring.loan_analytics import LoanStatistics
+from credit_scoring.profiling import load_profile
+from credit_scoring.schema import PROCESSED_DATA_PATH
+
 st.set_page_config(page_title="Kredi Skoru Analizi", layout="wide")
 
+
+@st.cache_data
+def load_processed_data(path):
+    return pd.read_csv(path)
+
+
+@st.cache_data
+def load_data_profile(path):
+    # Tek geçişte çıkarılan sütun profili; veri dosyasının yanındaki .profile.json'dan okunur
+    return load_profile(path)
+
+
+@st.cache_resource
+def load_correlation_cells(path, columns):
+    # Filtre hücresi başına korelasyon istatistikleri tüm oturumlar için bir kez hesaplanır
+    return CorrelationCells.build(load_processed_data(path), columns)
+
+
+@st.cache_data
+def load_loan_statistics(path, active_filters):
+    # Kredi türü istatistikleri filtre durumu başına bir kez hesaplanır
+    return LoanStatistics.from_frame(apply_filters(load_processed_data(path), active_filters))
+
+
+def plot_cached(cache_key, chart_id, build, **kwargs):
+    # Aynı veri sürümü ve filtre durumundaki figür oturumlar arası ortak önbellekten gelir; yoksa build() kurar
+    st.plotly_chart(shared_figure_cache().figure((*cache_key, chart_id), build), **kwargs)
+
+
 # Renk paleti tanımlamaları
 color_palette = px.colors.sequential.PuBu_r  ## kategorik veriler için renk paleti
 color_continuous_scale = px.colors.cyclical.Twilight  ## sayısal veriler için renk paleti
@@ -106,59 +143,15 @@ css = """
 """
 st.markdown(css, unsafe_allow_html=True)
 
-# Veri dosyasını yükle
-try:
-    preprocessed_data = pd.read_csv("data/not_scaled_processed_data.csv")
-except Exception as e:
-    st.error(f"Veri yüklenirken hata oluştu: {e}")
-    preprocessed_data = None
-
-if preprocessed_data is not None:
-    # Sidebar filtreleri
-    with st.sidebar:
-        st.image("logo.png")
-        st.subheader("Filtreleme")
+# Bölümler sekmelerde durur; sadece açık sekmenin fonksiyonu çalışır (st.tabs on_change="rerun" ve tab.open).
+# Her bölüm bir fragment'tır: kendi widget'ı değiştiğinde sadece o bölüm yeniden çalışır. Sidebar filtresi
+# değiştiğinde sayfa baştan çalışır ama yine yalnızca açık bölüm hesaplanır.
+# Fragment yeniden çalışırken son tam çalıştırmadaki argümanları kullanır; bu yüzden filtered_data
+# bölümler içinde değiştirilmez (yeni sütunlar ayrı Series olarak üretilir).
 
-        # Kredi skoru filtreleme
-        credit_options = preprocessed_data['Credit_Score'].unique().tolist()
-        credit_score = st.multiselect("Kredi Skoru", options=credit_options, default=credit_options)
-
-        # Yaş aralığı filtresi
-        min_age = int(preprocessed_data["Age"].min())
-        max_age = int(preprocessed_data["Age"].max())
-        age_range = st.slider("Yaş Aralığı", min_age, max_age, (min_age, max_age))
-
-        # Meslek filtresi
-        occupations = preprocessed_data['Occupation'].unique().tolist()
-        selected_occupation = st.selectbox("Meslek", ["Tümü"] + occupations)
-
-        # Ay filtresi
-        months = preprocessed_data['Month'].unique().tolist()
-        selected_month = st.multiselect("Ay", options=months, default=months)
-
-        # Veri özeti
-        st.divider()
-        st.caption("📊 Veri Özeti")
-        st.caption(f"Toplam kayıt: {preprocessed_data.shape[0]}")
-        st.caption(f"Toplam özellik: {preprocessed_data.shape[1]}")
-
-    # Filtreleme işlemleri
-    filtered_data = preprocessed_data.copy()
-
-    if credit_score:
-        filtered_data = filtered_data[filtered_data["Credit_Score"].isin(credit_score)]
-
-    filtered_data = filtered_data[(filtered_data["Age"] >= age_range[0]) &
-                                  (filtered_data["Age"] <= age_range[1])]
-
-    if selected_occupation != "Tümü":
-        filtered_data = filtered_data[filtered_data['Occupation'] == selected_occupation]
-
-    if selected_month:
-        filtered_data = filtered_data[filtered_data["Month"].isin(selected_month)]
-
-    st.info(f"📊 Gösterilen kayıt sayısı: {len(filtered_data)}")
 
+@st.fragment
+def customer_profile_section(filtered_data, profile, cache_key):
     # İLK BÖLÜM: Müşteri Profili
     st.markdown('<div class="section-header"><h2>📱 Bölüm 1: Müşteri Profili</h2></div>', unsafe_allow_html=True)
 
@@ -166,67 +159,78 @@ if preprocessed_data is not None:
     st.subheader("Temel Finansal Göstergeler")
     col1, col2, col3, col4 = st.columns(4)
 
+    # Filtre tüm veriyi kapsıyorsa ortalamalar profilden, aksi halde filtrelenmiş veriden
+    metric_cols = ["Age", "Annual_Income", "Outstanding_Debt", "Debt_to_Income_Ratio"]
+    if len(filtered_data) == profile["rows"]:
+        means = {col: profile["columns"][col]["mean"] for col in metric_cols}
+    else:
+        means = filtered_data[metric_cols].mean().to_dict()
+
     with col1:
-        st.metric("Ortalama Yaş", f"{filtered_data['Age'].mean():.1f}")
+        st.metric("Ortalama Yaş", f"{means['Age']:.1f}")
 
     with col2:
-        st.metric("Ortalama Gelir", f"${filtered_data['Annual_Income'].mean():,.0f}")
+        st.metric("Ortalama Gelir", f"${means['Annual_Income']:,.0f}")
 
     with col3:
-        st.metric("Ortalama Borç", f"${filtered_data['Outstanding_Debt'].mean():,.0f}")
+        st.metric("Ortalama Borç", f"${means['Outstanding_Debt']:,.0f}")
 
     with col4:
-        ratio = (filtered_data['Outstanding_Debt'] / filtered_data['Annual_Income']).mean()
-        st.metric("Borç-Gelir Oranı", f"{ratio:.2f}")
+        st.metric("Borç-Gelir Oranı", f"{means['Debt_to_Income_Ratio']:.2f}")
 
     # Yaş dağılımı ve kredi skoru ilişkisi
     st.subheader("Yaş Gruplarına Göre Müşteri Dağılımı")
 
-    # Yaş grubu oluştur
-    filtered_data['Yaş Grubu'] = pd.cut(
-        filtered_data['Age'],
-        bins=[17, 25, 35, 45, 55, 65, 100],
-        labels=['18-25', '26-35', '36-45', '46-55', '56-65', '65+']
-    )
-
     col1, col2 = st.columns(2)
     with col1:
         # Yaş grubu dağılımı
-        age_group_counts = filtered_data['Yaş Grubu'].value_counts().reset_index()
-        age_group_counts.columns = ['Yaş Grubu', 'Sayı']
-        age_group_counts = age_group_counts.sort_values('Yaş Grubu')
-
-        fig = px.bar(
-            age_group_counts,
-            x='Yaş Grubu',
-            y='Sayı',
-            title='Yaş Grubu Dağılımı',
-            color='Yaş Grubu',
-            color_discrete_sequence=color_palette,
-            text_auto=True
-        )
-        fig.update_layout(template="plotly_dark", yaxis_title="Müşteri Sayısı")
-        st.plotly_chart(fig, use_container_width=True)
+        def build():
+            # Yaş grubu oluştur
+            age_groups = pd.cut(
+                filtered_data['Age'],
+                bins=[17, 25, 35, 45, 55, 65, 100],
+                labels=['18-25', '26-35', '36-45', '46-55', '56-65', '65+']
+            )
+            age_group_counts = age_groups.value_counts().reset_index()
+            age_group_counts.columns = ['Yaş Grubu', 'Sayı']
+            age_group_counts = age_group_counts.sort_values('Yaş Grubu')
+
+            fig = px.bar(
+                age_group_counts,
+                x='Yaş Grubu',
+                y='Sayı',
+                title='Yaş Grubu Dağılımı',
+                color='Yaş Grubu',
+                color_discrete_sequence=color_palette,
+                text_auto=True
+            )
+            fig.update_layout(template="plotly_dark", yaxis_title="Müşteri Sayısı")
+            return fig
+
+        plot_cached(cache_key, "age_groups", build, use_container_width=True)
 
     with col2:
         # Credit Mix ve Kredi Skoru İlişkisi
-        credit_mix_score = filtered_data.groupby(['Credit_Mix', 'Credit_Score']).size().reset_index(name='Count')
-
-        fig = px.bar(
-            credit_mix_score,
-            x='Credit_Mix',
-            y='Count',
-            color='Credit_Score',
-            title='Kredi Türü Çeşitliliği ve Kredi Skoru',
-            color_discrete_sequence=color_palette,
-            barmode='group'
-        )
-        fig.update_layout(
-            template="plotly_dark",
-            xaxis_title="Kredi Türü Çeşitliliği",
-            yaxis_title="Müşteri Sayısı"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def build():
+            credit_mix_score = filtered_data.groupby(['Credit_Mix', 'Credit_Score']).size().reset_index(name='Count')
+
+            fig = px.bar(
+                credit_mix_score,
+                x='Credit_Mix',
+                y='Count',
+                color='Credit_Score',
+                title='Kredi Türü Çeşitliliği ve Kredi Skoru',
+                color_discrete_sequence=color_palette,
+                barmode='group'
+            )
+            fig.update_layout(
+                template="plotly_dark",
+                xaxis_title="Kredi Türü Çeşitliliği",
+                yaxis_title="Müşteri Sayısı"
+            )
+            return fig
+
+        plot_cached(cache_key, "credit_mix_by_score", build, use_container_width=True)
 
     # Meslek dağılımı
     st.subheader("Mesleklere Göre Müşteri Analizi")
@@ -234,35 +238,44 @@ if preprocessed_data is not None:
     col1, col2 = st.columns(2)
     with col1:
         # Meslek bazında kredi skoru dağılımı
-        occupation_score = filtered_data.groupby(['Occupation', 'Credit_Score']).size().reset_index(name='Count')
-
-        fig = px.bar(
-            occupation_score,
-            x='Occupation',
-            y='Count',
-            color='Credit_Score',
-            title='Mesleklere Göre Kredi Skoru Dağılımı',
-            color_discrete_sequence=color_palette,
-            barmode='stack'
-        )
-        fig.update_layout(template="plotly_dark", xaxis_title="Meslek", yaxis_title="Müşteri Sayısı",
-                          xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+        def build():
+            occupation_score = filtered_data.groupby(['Occupation', 'Credit_Score']).size().reset_index(name='Count')
+
+            fig = px.bar(
+                occupation_score,
+                x='Occupation',
+                y='Count',
+                color='Credit_Score',
+                title='Mesleklere Göre Kredi Skoru Dağılımı',
+                color_discrete_sequence=color_palette,
+                barmode='stack'
+            )
+            fig.update_layout(template="plotly_dark", xaxis_title="Meslek", yaxis_title="Müşteri Sayısı",
+                              xaxis_tickangle=-45)
+            return fig
+
+        plot_cached(cache_key, "occupation_scores", build, use_container_width=True)
 
     with col2:
         # Meslekler ve Kredi Kartı Sayısı
-        fig = px.bar(
-            filtered_data.groupby('Occupation')['Num_Credit_Card'].mean().reset_index(),
-            x='Occupation',
-            y='Num_Credit_Card',
-            title='Mesleklere Göre Ortalama Kredi Kartı Sayısı',
-            color_discrete_sequence=[color_palette[2]],
-            text_auto=True
-        )
-        fig.update_layout(template="plotly_dark", xaxis_title="Meslek", yaxis_title="Ortalama Kredi Kartı Sayısı",
-                          xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
-
+        def build():
+            fig = px.bar(
+                filtered_data.groupby('Occupation')['Num_Credit_Card'].mean().reset_index(),
+                x='Occupation',
+                y='Num_Credit_Card',
+                title='Mesleklere Göre Ortalama Kredi Kartı Sayısı',
+                color_discrete_sequence=[color_palette[2]],
+                text_auto=True
+            )
+            fig.update_layout(template="plotly_dark", xaxis_title="Meslek",
+                              yaxis_title="Ortalama Kredi Kartı Sayısı", xaxis_tickangle=-45)
+            return fig
+
+        plot_cached(cache_key, "occupation_credit_cards", build, use_container_width=True)
+
+
+@st.fragment
+def credit_score_section(filtered_data, cache_key):
     # İKİNCİ BÖLÜM: Kredi Skoru Dinamiği
     st.markdown('<div class="section-header"><h2>📈 Bölüm 2: Kredi Skoru Dinamiği</h2></div>', unsafe_allow_html=True)
     st.markdown("""
@@ -272,90 +285,112 @@ if preprocessed_data is not None:
 
     col1, col2 = st.columns(2)
     with col1:
-        # Kredi skoru dağılımı
-        fig = px.histogram(
-            filtered_data,
-            x='Credit_Score',
-            title='Kredi Skoru Dağılımı',
-            color='Credit_Score',
-            text_auto=True,
-            color_discrete_sequence=color_palette,
-            nbins=len(filtered_data['Credit_Score'].unique())
-        )
-        fig.update_layout(
-            template="plotly_dark",
-            bargap=0.2,
-            xaxis_title="Kredi Skoru",
-            yaxis_title="Müşteri Sayısı"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        # Kredi skoru dağılımı (sayımlar sunucuda hesaplanır)
+        def build():
+            credit_score_counts = filtered_data['Credit_Score'].value_counts(sort=False).reset_index(name='Count')
+            fig = px.histogram(
+                credit_score_counts,
+                x='Credit_Score',
+                y='Count',
+                title='Kredi Skoru Dağılımı',
+                color='Credit_Score',
+                text_auto=True,
+                color_discrete_sequence=color_palette
+            )
+            fig.update_layout(
+                template="plotly_dark",
+                bargap=0.2,
+                xaxis_title="Kredi Skoru",
+                yaxis_title="Müşteri Sayısı"
+            )
+            return fig
+
+        plot_cached(cache_key, "credit_score_counts", build, use_container_width=True)
 
     with col2:
         # Credit Mix ve Kredi Skoru İlişkisi - Sunburst
-        fig = px.sunburst(
-            filtered_data,
-            path=['Credit_Score', 'Credit_Mix'],
-            title='Kredi Skoru ve Kredi Karması Dağılımı',
-            color='Credit_Score',
-            color_discrete_sequence=color_palette
-        )
-        fig.update_layout(margin=dict(t=30, b=0, l=0, r=0), template="plotly_dark")
-        fig.update_traces(textinfo='label+percent entry')
-        st.plotly_chart(fig, use_container_width=True)
+        def build():
+            credit_score_mix = filtered_data.groupby(['Credit_Score', 'Credit_Mix']).size().reset_index(name='Count')
+            fig = px.sunburst(
+                credit_score_mix,
+                path=['Credit_Score', 'Credit_Mix'],
+                values='Count',
+                title='Kredi Skoru ve Kredi Karması Dağılımı',
+                color='Credit_Score',
+                color_discrete_sequence=color_palette
+            )
+            fig.update_layout(margin=dict(t=30, b=0, l=0, r=0), template="plotly_dark")
+            fig.update_traces(textinfo='label+percent entry')
+            return fig
+
+        plot_cached(cache_key, "credit_score_mix_sunburst", build, use_container_width=True)
 
     # Ay bazında kredi skoru
     st.subheader("Zaman İçinde Kredi Skoru Değişimi")
 
     # Ay bazında kredi skoru dağılımı
-    month_score = filtered_data.groupby(['Month', 'Credit_Score']).size().reset_index(name='Count')
-
-    fig = px.bar(
-        month_score,
-        x='Month',
-        y='Count',
-        color='Credit_Score',
-        title='Aylara Göre Kredi Skoru Dağılımı',
-        color_discrete_sequence=color_palette,
-        barmode='stack'
-    )
-    fig.update_layout(template="plotly_dark", xaxis_title="Ay", yaxis_title="Müşteri Sayısı")
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Diğer kategorik değişkenler
-    col1, col2 = st.columns(2)
-    with col1:
-        # Kredi Karması ve Kredi Skoru
-        credit_mix_score = filtered_data.groupby(['Credit_Mix', 'Credit_Score']).size().reset_index(name='Count')
+    def build():
+        month_score = filtered_data.groupby(['Month', 'Credit_Score']).size().reset_index(name='Count')
 
         fig = px.bar(
-            credit_mix_score,
-            x='Credit_Mix',
+            month_score,
+            x='Month',
             y='Count',
             color='Credit_Score',
-            title='Kredi Karmasına Göre Kredi Skoru Dağılımı',
+            title='Aylara Göre Kredi Skoru Dağılımı',
             color_discrete_sequence=color_palette,
             barmode='stack'
         )
-        fig.update_layout(template="plotly_dark", xaxis_title="Kredi Karması", yaxis_title="Müşteri Sayısı")
-        st.plotly_chart(fig, use_container_width=True)
+        fig.update_layout(template="plotly_dark", xaxis_title="Ay", yaxis_title="Müşteri Sayısı")
+        return fig
 
-    with col2:
-        # Ödeme davranışına göre kredi skoru dağılımı
-        payment_score = filtered_data.groupby(['Payment_Behaviour', 'Credit_Score']).size().reset_index(name='Count')
+    plot_cached(cache_key, "month_scores", build, use_container_width=True)
 
-        fig = px.bar(
-            payment_score,
-            x='Payment_Behaviour',
-            y='Count',
-            color='Credit_Score',
-            title='Ödeme Davranışına Göre Kredi Skoru Dağılımı',
-            color_discrete_sequence=color_palette,
-            barmode='stack'
-        )
-        fig.update_layout(template="plotly_dark", xaxis_title="Ödeme Davranışı", yaxis_title="Müşteri Sayısı",
-                          xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+    # Diğer kategorik değişkenler
+    col1, col2 = st.columns(2)
+    with col1:
+        # Kredi Karması ve Kredi Skoru
+        def build():
+            credit_mix_score = filtered_data.groupby(['Credit_Mix', 'Credit_Score']).size().reset_index(name='Count')
+
+            fig = px.bar(
+                credit_mix_score,
+                x='Credit_Mix',
+                y='Count',
+                color='Credit_Score',
+                title='Kredi Karmasına Göre Kredi Skoru Dağılımı',
+                color_discrete_sequence=color_palette,
+                barmode='stack'
+            )
+            fig.update_layout(template="plotly_dark", xaxis_title="Kredi Karması", yaxis_title="Müşteri Sayısı")
+            return fig
+
+        plot_cached(cache_key, "credit_mix_scores", build, use_container_width=True)
 
+    with col2:
+        # Ödeme davranışına göre kredi skoru dağılımı
+        def build():
+            payment_score = filtered_data.groupby(['Payment_Behaviour', 'Credit_Score']).size().reset_index(
+                name='Count')
+
+            fig = px.bar(
+                payment_score,
+                x='Payment_Behaviour',
+                y='Count',
+                color='Credit_Score',
+                title='Ödeme Davranışına Göre Kredi Skoru Dağılımı',
+                color_discrete_sequence=color_palette,
+                barmode='stack'
+            )
+            fig.update_layout(template="plotly_dark", xaxis_title="Ödeme Davranışı",
+                              yaxis_title="Müşteri Sayısı", xaxis_tickangle=-45)
+            return fig
+
+        plot_cached(cache_key, "payment_behaviour_scores", build, use_container_width=True)
+
+
+@st.fragment
+def debt_payment_section(filtered_data, cache_key):
     # ÜÇÜNCÜ BÖLÜM: Borç ve Ödeme Analizi
     st.markdown('<div class="section-header"><h2>💰 Bölüm 3: Borç ve Ödeme Analizi</h2></div>', unsafe_allow_html=True)
     st.markdown("""
@@ -367,33 +402,39 @@ if preprocessed_data is not None:
     col1, col2 = st.columns(2)
     with col1:
         # Minimum ödeme durumu ve Kredi Skoru
-        min_payment_score = filtered_data.groupby(['Payment_of_Min_Amount', 'Credit_Score']).size().reset_index(
-            name='Count')
-
-        fig = px.bar(
-            min_payment_score,
-            x='Payment_of_Min_Amount',
-            y='Count',
-            color='Credit_Score',
-            title='Minimum Ödeme Durumuna Göre Kredi Skoru',
-            color_discrete_sequence=color_palette,
-            barmode='stack'
-        )
-        fig.update_layout(template="plotly_dark", xaxis_title="Minimum Ödeme Durumu", yaxis_title="Müşteri Sayısı")
-        st.plotly_chart(fig, use_container_width=True)
+        def build():
+            min_payment_score = filtered_data.groupby(['Payment_of_Min_Amount', 'Credit_Score']).size().reset_index(
+                name='Count')
+
+            fig = px.bar(
+                min_payment_score,
+                x='Payment_of_Min_Amount',
+                y='Count',
+                color='Credit_Score',
+                title='Minimum Ödeme Durumuna Göre Kredi Skoru',
+                color_discrete_sequence=color_palette,
+                barmode='stack'
+            )
+            fig.update_layout(template="plotly_dark", xaxis_title="Minimum Ödeme Durumu",
+                              yaxis_title="Müşteri Sayısı")
+            return fig
+
+        plot_cached(cache_key, "min_payment_scores", build, use_container_width=True)
 
     with col2:
-        # Kredi Skoruna Göre Borç-Gelir Oranı
-        fig = px.box(
-            filtered_data,
-            x="Credit_Score",
-            y="Debt_to_Income_Ratio",
-            color="Credit_Score",
-            title="Kredi Skoruna Göre Borç-Gelir Oranı",
-            color_discrete_sequence=color_palette
-        )
-        fig.update_layout(template="plotly_dark", yaxis_title="Borç-Gelir Oranı")
-        st.plotly_chart(fig, use_container_width=True)
+        # Kredi Skoruna Göre Borç-Gelir Oranı (çeyrekler sunucuda hesaplanır)
+        def build():
+            fig = box_figure(
+                filtered_data,
+                x="Credit_Score",
+                y="Debt_to_Income_Ratio",
+                title="Kredi Skoruna Göre Borç-Gelir Oranı",
+                color_discrete_sequence=color_palette
+            )
+            fig.update_layout(template="plotly_dark", yaxis_title="Borç-Gelir Oranı")
+            return fig
+
+        plot_cached(cache_key, "debt_income_box", build, use_container_width=True)
 
     # Gecikme ve borç ilişkisi
     st.subheader("Gecikmeli Ödemeler ve Borçlar")
@@ -401,47 +442,58 @@ if preprocessed_data is not None:
     col1, col2 = st.columns(2)
     with col1:
         # Gecikme Günleri Kredi Skoru İlişkisi
-        fig = px.box(
-            filtered_data,
-            x="Credit_Score",
-            y="Delay_from_due_date",
-            color="Credit_Score",
-            title="Kredi Skoruna Göre Gecikme Günleri",
-            color_discrete_sequence=color_palette
-        )
-        fig.update_layout(template="plotly_dark", yaxis_title="Gecikme Günleri")
-        st.plotly_chart(fig, use_container_width=True)
+        def build():
+            fig = box_figure(
+                filtered_data,
+                x="Credit_Score",
+                y="Delay_from_due_date",
+                title="Kredi Skoruna Göre Gecikme Günleri",
+                color_discrete_sequence=color_palette
+            )
+            fig.update_layout(template="plotly_dark", yaxis_title="Gecikme Günleri")
+            return fig
+
+        plot_cached(cache_key, "delay_box", build, use_container_width=True)
 
     with col2:
-        # Gecikme sayısı ve borç ilişkisi
-        fig = px.scatter(
+        # Gecikme sayısı ve borç ilişkisi (eşik üzerinde tabakalı örneklem gönderilir)
+        def build():
+            fig = px.scatter(
+                sample_for_chart(filtered_data, stratify="Credit_Score"),
+                x="Num_of_Delayed_Payment",
+                y="Outstanding_Debt",
+                color="Credit_Score",
+                title="Gecikme Sayısı ve Borç İlişkisi",
+                color_discrete_sequence=color_palette,
+                opacity=0.7,
+                size="Annual_Income",
+                size_max=15,
+                hover_data=["Age", "Occupation"]
+            )
+            fig.update_layout(template="plotly_dark", xaxis_title="Gecikme Sayısı", yaxis_title="Borç ($)")
+            return fig
+
+        plot_cached(cache_key, "delay_debt_scatter", build, use_container_width=True)
+
+    # Borç-Gelir Oranı Dağılımı (kutular sunucuda sayılır)
+    def build():
+        fig = histogram_figure(
             filtered_data,
-            x="Num_of_Delayed_Payment",
-            y="Outstanding_Debt",
+            x="Debt_to_Income_Ratio",
             color="Credit_Score",
-            title="Gecikme Sayısı ve Borç İlişkisi",
+            title="Borç-Gelir Oranı Dağılımı",
             color_discrete_sequence=color_palette,
-            opacity=0.7,
-            size="Annual_Income",
-            size_max=15,
-            hover_data=["Age", "Occupation"]
+            barmode="overlay",
+            nbins=30
         )
-        fig.update_layout(template="plotly_dark", xaxis_title="Gecikme Sayısı", yaxis_title="Borç ($)")
-        st.plotly_chart(fig, use_container_width=True)
-
-    # Borç-Gelir Oranı Dağılımı
-    fig = px.histogram(
-        filtered_data,
-        x="Debt_to_Income_Ratio",
-        color="Credit_Score",
-        title="Borç-Gelir Oranı Dağılımı",
-        color_discrete_sequence=color_palette,
-        barmode="overlay",
-        nbins=30
-    )
-    fig.update_layout(template="plotly_dark", xaxis_title="Borç-Gelir Oranı", yaxis_title="Müşteri Sayısı")
-    st.plotly_chart(fig, use_container_width=True)
+        fig.update_layout(template="plotly_dark", xaxis_title="Borç-Gelir Oranı", yaxis_title="Müşteri Sayısı")
+        return fig
 
+    plot_cached(cache_key, "debt_income_histogram", build, use_container_width=True)
+
+
+@st.fragment
+def financial_products_section(filtered_data, active_filters, cache_key):
     # DÖRDÜNCÜ BÖLÜM: Finansal Ürün Kullanımı
     st.markdown('<div class="section-header"><h2>💳 Bölüm 4: Finansal Ürün Kullanımı</h2></div>', unsafe_allow_html=True)
     st.markdown("""
@@ -455,155 +507,152 @@ if preprocessed_data is not None:
     col1, col2 = st.columns(2)
     with col1:
         # Kredi Kartı Sayısı ve Banka Hesabı Sayısı Dağılımı
-        card_account_avg = filtered_data.groupby('Credit_Score')[
-            ['Num_Credit_Card', 'Num_Bank_Accounts']].mean().reset_index()
-
-        # Veriyi uzun formata dönüştür
-        card_account_melt = pd.melt(
-            card_account_avg,
-            id_vars=['Credit_Score'],
-            value_vars=['Num_Credit_Card', 'Num_Bank_Accounts'],
-            var_name='Account_Type',
-            value_name='Average_Count'
-        )
-
-        # Değişken isimlerini Türkçeye çevir
-        card_account_melt['Account_Type'] = card_account_melt['Account_Type'].replace({
-            'Num_Credit_Card': 'Kredi Kartı Sayısı',
-            'Num_Bank_Accounts': 'Banka Hesabı Sayısı'
-        })
-
-        fig = px.bar(
-            card_account_melt,
-            x='Credit_Score',
-            y='Average_Count',
-            color='Account_Type',
-            title='Kredi Skoruna Göre Ortalama Kredi Kartı ve Banka Hesabı Sayısı',
-            color_discrete_sequence=color_palette,
-            barmode='group'
-        )
-        fig.update_layout(template="plotly_dark", yaxis_title="Ortalama Sayı")
-        st.plotly_chart(fig, use_container_width=True)
+        def build():
+            card_account_avg = filtered_data.groupby('Credit_Score')[
+                ['Num_Credit_Card', 'Num_Bank_Accounts']].mean().reset_index()
+
+            # Veriyi uzun formata dönüştür
+            card_account_melt = pd.melt(
+                card_account_avg,
+                id_vars=['Credit_Score'],
+                value_vars=['Num_Credit_Card', 'Num_Bank_Accounts'],
+                var_name='Account_Type',
+                value_name='Average_Count'
+            )
+
+            # Değişken isimlerini Türkçeye çevir
+            card_account_melt['Account_Type'] = card_account_melt['Account_Type'].replace({
+                'Num_Credit_Card': 'Kredi Kartı Sayısı',
+                'Num_Bank_Accounts': 'Banka Hesabı Sayısı'
+            })
+
+            fig = px.bar(
+                card_account_melt,
+                x='Credit_Score',
+                y='Average_Count',
+                color='Account_Type',
+                title='Kredi Skoruna Göre Ortalama Kredi Kartı ve Banka Hesabı Sayısı',
+                color_discrete_sequence=color_palette,
+                barmode='group'
+            )
+            fig.update_layout(template="plotly_dark", yaxis_title="Ortalama Sayı")
+            return fig
+
+        plot_cached(cache_key, "card_account_means", build, use_container_width=True)
 
     with col2:
-        # Aylık Bakiye Dağılımı
-        fig = px.violin(
-            filtered_data,
-            x="Credit_Score",
-            y="Monthly_Balance",
-            color="Credit_Score",
-            box=True,
-            title="Kredi Skoruna Göre Aylık Bakiye",
-            color_discrete_sequence=color_palette
-        )
-        fig.update_layout(template="plotly_dark", yaxis_title="Aylık Bakiye ($)")
-        st.plotly_chart(fig, use_container_width=True)
+        # Aylık Bakiye Dağılımı (yoğunluk ızgarası sunucuda hesaplanır)
+        def build():
+            fig = violin_figure(
+                filtered_data,
+                x="Credit_Score",
+                y="Monthly_Balance",
+                title="Kredi Skoruna Göre Aylık Bakiye",
+                color_discrete_sequence=color_palette
+            )
+            fig.update_layout(template="plotly_dark", yaxis_title="Aylık Bakiye ($)")
+            return fig
+
+        plot_cached(cache_key, "monthly_balance_violin", build, use_container_width=True)
 
     # Kredi Tipleri Analizi
     st.subheader("Kredi Tipleri ve Kullanım Analizi")
 
-    # Kredi tiplerini içeren sütunlar
-    loan_types = ["Auto Loan", "Credit-Builder Loan", "Debt Consolidation Loan",
-                  "Home Equity Loan", "Mortgage Loan", "Not Specified",
-                  "Payday Loan", "Personal Loan", "Student Loan"]
-
-    # Kredi tiplerinin dağılımını hesapla
-    loan_counts = []
-    for loan_type in loan_types:
-        loan_counts.append({
-            'Kredi Tipi': loan_type,
-            'Sayı': filtered_data[loan_type].sum()
-        })
-
-    loan_df = pd.DataFrame(loan_counts)
+    # Tüm kredi tipi istatistikleri uint8 kredi matrisinden tek seferde hesaplanır
+    loan_stats = load_loan_statistics(PROCESSED_DATA_PATH, active_filters)
+    loan_df = loan_stats.usage_frame()
 
     # Kredi tipleri dağılımı - ana bar chart
-    fig = px.bar(
-        loan_df,
-        x='Kredi Tipi',
-        y='Sayı',
-        title='Kredi Tipleri Dağılımı',
-        color='Kredi Tipi',
-        color_discrete_sequence=px.colors.sequential.Cividis,
-        text_auto=True
-    )
-    fig.update_layout(template="plotly_dark", xaxis_tickangle=-45)
-    st.plotly_chart(fig, use_container_width=True)
+    def build():
+        fig = px.bar(
+            loan_df,
+            x='Kredi Tipi',
+            y='Sayı',
+            title='Kredi Tipleri Dağılımı',
+            color='Kredi Tipi',
+            color_discrete_sequence=px.colors.sequential.Cividis,
+            text_auto=True
+        )
+        fig.update_layout(template="plotly_dark", xaxis_tickangle=-45)
+        return fig
+
+    plot_cached(cache_key, "loan_type_counts", build, use_container_width=True)
 
     col1, col2 = st.columns(2)
     with col1:
-        # Her kredi tipinin kullanım oranını hesapla
-        loan_usage = pd.DataFrame()
-
-        for loan_type in loan_types:
-            # Her bir kredi türü için kullanım sayılarını al
-            loan_users_by_score = filtered_data.groupby('Credit_Score')[loan_type].sum().reset_index()
-            loan_users_by_score.rename(columns={loan_type: 'Count'}, inplace=True)
-            loan_users_by_score['Loan_Type'] = loan_type
-
-            # Toplam data frame'e ekle
-            loan_usage = pd.concat([loan_usage, loan_users_by_score])
-
-        # Grafik oluştur
-        fig = px.bar(
-            loan_usage,
-            x='Loan_Type',
-            y='Count',
-            color='Credit_Score',
-            title='Kredi Tipine Göre Kredi Skoru Dağılımı',
-            color_discrete_sequence=color_palette,
-            barmode='group'
-        )
-        fig.update_layout(template="plotly_dark", xaxis_title="Kredi Tipi", yaxis_title="Kullanıcı Sayısı",
-                          xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+        # Her kredi tipinin kredi skoruna göre kullanımı
+        def build():
+            loan_usage = loan_stats.usage_by_score_frame()
+
+            # Grafik oluştur
+            fig = px.bar(
+                loan_usage,
+                x='Loan_Type',
+                y='Count',
+                color='Credit_Score',
+                title='Kredi Tipine Göre Kredi Skoru Dağılımı',
+                color_discrete_sequence=color_palette,
+                barmode='group'
+            )
+            fig.update_layout(template="plotly_dark", xaxis_title="Kredi Tipi", yaxis_title="Kullanıcı Sayısı",
+                              xaxis_tickangle=-45)
+            return fig
+
+        plot_cached(cache_key, "loan_type_scores", build, use_container_width=True)
 
     with col2:
         # Her kredi tipi için ortalama kredi kartı ve banka hesabı sayısı
-        account_by_loan = pd.DataFrame()
-
-        for loan_type in loan_types:
-            # Her bir kredi türünü kullananların ortalama hesap sayıları
-            loan_users = filtered_data[filtered_data[loan_type] == 1]
-
-            if not loan_users.empty:
-                avg_accounts = {
-                    'Loan_Type': loan_type,
-                    'Avg_Credit_Cards': loan_users['Num_Credit_Card'].mean(),
-                    'Avg_Bank_Accounts': loan_users['Num_Bank_Accounts'].mean()
-                }
-
-                account_by_loan = pd.concat([account_by_loan, pd.DataFrame([avg_accounts])])
-
-        # Veriyi uzun formata dönüştür
-        account_melt = pd.melt(
-            account_by_loan,
-            id_vars=['Loan_Type'],
-            value_vars=['Avg_Credit_Cards', 'Avg_Bank_Accounts'],
-            var_name='Account_Type',
-            value_name='Average'
+        def build():
+            account_by_loan = loan_stats.account_means_frame()
+
+            # Veriyi uzun formata dönüştür
+            account_melt = pd.melt(
+                account_by_loan,
+                id_vars=['Loan_Type'],
+                value_vars=['Avg_Credit_Cards', 'Avg_Bank_Accounts'],
+                var_name='Account_Type',
+                value_name='Average'
+            )
+
+            # Değişken isimlerini Türkçeye çevir
+            account_melt['Account_Type'] = account_melt['Account_Type'].replace({
+                'Avg_Credit_Cards': 'Ortalama Kredi Kartı Sayısı',
+                'Avg_Bank_Accounts': 'Ortalama Banka Hesabı Sayısı'
+            })
+
+            # Grafik oluştur
+            fig = px.bar(
+                account_melt,
+                x='Loan_Type',
+                y='Average',
+                color='Account_Type',
+                title='Kredi Tipine Göre Ortalama Hesap Sayıları',
+                color_discrete_sequence=[color_palette[1], color_palette[4]],
+                barmode='group'
+            )
+            fig.update_layout(template="plotly_dark", xaxis_title="Kredi Tipi", yaxis_title="Ortalama Sayı",
+                              xaxis_tickangle=-45)
+            return fig
+
+        plot_cached(cache_key, "loan_type_accounts", build, use_container_width=True)
+
+    # Kredi tiplerinin birlikte kullanımı (Lᵀ·L)
+    def build():
+        fig = px.imshow(
+            loan_stats.co_occurrence_frame(),
+            text_auto=True,
+            color_continuous_scale="GnBu",
+            title='Kredi Tiplerinin Birlikte Kullanımı',
+            labels=dict(color="Kullanıcı Sayısı")
         )
+        fig.update_layout(template="plotly_dark", height=600, xaxis_tickangle=-45)
+        return fig
 
-        # Değişken isimlerini Türkçeye çevir
-        account_melt['Account_Type'] = account_melt['Account_Type'].replace({
-            'Avg_Credit_Cards': 'Ortalama Kredi Kartı Sayısı',
-            'Avg_Bank_Accounts': 'Ortalama Banka Hesabı Sayısı'
-        })
+    plot_cached(cache_key, "loan_co_occurrence", build, use_container_width=True)
 
-        # Grafik oluştur
-        fig = px.bar(
-            account_melt,
-            x='Loan_Type',
-            y='Average',
-            color='Account_Type',
-            title='Kredi Tipine Göre Ortalama Hesap Sayıları',
-            color_discrete_sequence=[color_palette[1], color_palette[4]],
-            barmode='group'
-        )
-        fig.update_layout(template="plotly_dark", xaxis_title="Kredi Tipi", yaxis_title="Ortalama Sayı",
-                          xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
 
+@st.fragment
+def factor_relations_section(filtered_data, active_filters, numeric_features, cache_key):
     # BEŞİNCİ BÖLÜM: Faktörler Arası İlişkiler
     st.markdown('<div class="section-header"><h2>🔗 Bölüm 5: Faktörler Arası İlişkiler</h2></div>',
                 unsafe_allow_html=True)
@@ -616,33 +665,36 @@ if preprocessed_data is not None:
     st.subheader("Kredi Skoru ve Kredi Karması İlişkisi")
 
     # Donut Chart için veri hazırlama
-    donut_data = filtered_data.groupby(['Credit_Score', 'Credit_Mix']).size().reset_index(name='Count')
-    donut_data['Percentage'] = donut_data['Count'] / donut_data['Count'].sum() * 100
-    donut_data['Label'] = donut_data['Credit_Score'] + ' - ' + donut_data['Credit_Mix']
-
-    # Donut Chart
-    fig = px.pie(
-        donut_data,
-        names='Label',
-        values='Percentage',
-        title='Kredi Skoru ve Kredi Karması Dağılımı',
-        color='Credit_Score',
-        color_discrete_sequence=color_palette,
-        hole=0.03
-    )
-    fig.update_traces(
-        texttemplate='%{label}<br>%{percent}',
-        textposition='inside',
-        textfont=dict(size=14, family="Arial", color="white", weight="bold")  # Yazılar daha büyük ve kalın
-    )
-    # Genel görünüm ayarları
-    fig.update_layout(
-        template="plotly_dark",
-        width=1900,  # genislik
-        height=1200,  # yükseklik
-        font=dict(size=14, family="Arial", color="white")  # Genel yazı fontu
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    def build():
+        donut_data = filtered_data.groupby(['Credit_Score', 'Credit_Mix']).size().reset_index(name='Count')
+        donut_data['Percentage'] = donut_data['Count'] / donut_data['Count'].sum() * 100
+        donut_data['Label'] = donut_data['Credit_Score'] + ' - ' + donut_data['Credit_Mix']
+
+        # Donut Chart
+        fig = px.pie(
+            donut_data,
+            names='Label',
+            values='Percentage',
+            title='Kredi Skoru ve Kredi Karması Dağılımı',
+            color='Credit_Score',
+            color_discrete_sequence=color_palette,
+            hole=0.03
+        )
+        fig.update_traces(
+            texttemplate='%{label}<br>%{percent}',
+            textposition='inside',
+            textfont=dict(size=14, family="Arial", color="white", weight="bold")  # Yazılar daha büyük ve kalın
+        )
+        # Genel görünüm ayarları
+        fig.update_layout(
+            template="plotly_dark",
+            width=1900,  # genislik
+            height=1200,  # yükseklik
+            font=dict(size=14, family="Arial", color="white")  # Genel yazı fontu
+        )
+        return fig
+
+    plot_cached(cache_key, "credit_score_mix_donut", build, use_container_width=True)
 
     # Korelasyon Matrisi
     st.subheader("Faktörler Arası Korelasyon Analizi")
@@ -658,49 +710,46 @@ if preprocessed_data is not None:
         "Payday Loan", "Personal Loan", "Student Loan"
     ]
 
-    # Mevcut sütunları kontrol et
-    numeric_features = filtered_data.select_dtypes(include=['float64', 'int64']).columns.tolist()
+    # Mevcut sayısal sütunları kontrol et
     selected_cols = [col for col in important_cols if col in numeric_features]
 
-    # Korelasyon matrisinin hesaplanması ve yuvarlanması
-    corr_matrix = filtered_data[selected_cols].corr().round(2)
+    # Korelasyon matrisi, önceden hesaplanmış filtre hücrelerinin birleştirilmesiyle elde edilir
+    correlation_cells = load_correlation_cells(PROCESSED_DATA_PATH, tuple(selected_cols))
+    corr_matrix = correlation_cells.correlation(*active_filters).round(2)
 
     # Plotly ile korelasyon matrisi görselleştirmesi
-    fig = px.imshow(
-        corr_matrix,
-        text_auto=True,
-        color_continuous_scale="GnBu",
-        title='Değişkenler Arası Korelasyon Matrisi',
-        labels=dict(color="Korelasyon")
-    )
-
-    # Grafik boyut ayarları
-    fig.update_layout(
-        height=60 * len(selected_cols),  # Her değişken için 60 yükseklik
-        width=120 * len(selected_cols),  # Her değişken için 120px genişlik
-        template="plotly_dark"
-    )
-
-    # Grafiğin Streamlit üzerinde gösterilmesi
-    st.plotly_chart(fig, use_container_width=True)
+    def build():
+        fig = px.imshow(
+            corr_matrix,
+            text_auto=True,
+            color_continuous_scale="GnBu",
+            title='Değişkenler Arası Korelasyon Matrisi',
+            labels=dict(color="Korelasyon")
+        )
+
+        # Grafik boyut ayarları
+        fig.update_layout(
+            height=60 * len(selected_cols),  # Her değişken için 60 yükseklik
+            width=120 * len(selected_cols),  # Her değişken için 120px genişlik
+            template="plotly_dark"
+        )
+
+        # Grafiğin Streamlit üzerinde gösterilmesi
+        return fig
+
+    plot_cached(cache_key, "correlation_matrix", build, use_container_width=True)
 
     # En Güçlü Korelasyonların Tablosu
     st.subheader("En Güçlü Korelasyonlar")
 
-    # Üçgen matrisin açılması ve sıralanması
-    corr_pairs = corr_matrix.unstack().sort_values(ascending=False)
+    # Eşik değiştiğinde sadece bu bölüm yeniden çalışır (korelasyon matrisi önbellekten gelir)
+    threshold = st.slider("Korelasyon eşiği (|r|)", 0.1, 0.9, 0.3, step=0.05, key="corr_threshold")
 
-    # Kendisiyle olan korelasyonlar (1.0) kaldırılır
-    corr_pairs = corr_pairs[corr_pairs < 0.99]
-
-    # Güçlü korelasyonların (|r| > 0.3) filtrelenmesi
-    strong_corr = corr_pairs[abs(corr_pairs) > 0.3]
+    # Güçlü korelasyonlar (|r| > eşik, kendisiyle olanlar hariç) kısmi sıralama ile seçilir
+    strong_corr_df = strongest_pairs(corr_matrix, threshold=threshold, upper=0.99, top_n=30)
 
     # Sonuç varsa tablo olarak gösterilir
-    if not strong_corr.empty:
-        strong_corr_df = pd.DataFrame(strong_corr).reset_index()
-        strong_corr_df.columns = ['Değişken 1', 'Değişken 2', 'Korelasyon']
-
+    if not strong_corr_df.empty:
         # Korelasyon tablosunun Streamlit üzerinde gösterimi
         styled_df = strong_corr_df.style \
             .background_gradient(cmap='Blues', subset=['Korelasyon']) \
@@ -724,6 +773,9 @@ if preprocessed_data is not None:
     else:
         st.info("Belirtilen eşik değerine göre güçlü bir korelasyon bulunmamaktadır.")
 
+
+@st.fragment
+def summary_section(filtered_data, cache_key):
     # SONUÇ BÖLÜMÜ
     st.markdown('<div class="section-header"><h2>🏁 Kredi Skor Analiz Sonucu</h2></div>', unsafe_allow_html=True)
     st.markdown("""
@@ -737,95 +789,105 @@ if preprocessed_data is not None:
     """)
 
     # Kredi skoru dağılımı - Pasta grafik
-    fig = px.pie(
-        filtered_data,
-        names='Credit_Score',
-        title='Kredi Skoru Dağılımı Özeti',
-        color='Credit_Score',
-        color_discrete_sequence=color_palette,
-        hole=0.2  # Donut efekti istersen
-    )
-    fig.update_traces(
-        textinfo='percent+label',
-        textfont_size=16,  # İç yazı fontu
-        pull=[0.05] * len(filtered_data['Credit_Score'].unique())  # Dilimleri hafifçe çek
-    )
-    fig.update_layout(
-        template="plotly_dark",
-        width=800,  # Grafik genişliği
-        height=600,  # Grafik yüksekliği
-        title_font_size=16,
-        legend=dict(
-            font=dict(size=16),  # Sağdaki yazılar (legend)
-            orientation="v",
-            yanchor="middle",
-            y=0.5,
-            xanchor="left",
-            x=1.02  # Sağ tarafa yasla
-        ),
-        margin=dict(t=50, b=50, l=50, r=50)
-    )
-    st.plotly_chart(fig, use_container_width=False)
+    def build():
+        credit_score_counts = filtered_data['Credit_Score'].value_counts().reset_index(name='Sayı')
+        fig = px.pie(
+            credit_score_counts,
+            names='Credit_Score',
+            values='Sayı',
+            title='Kredi Skoru Dağılımı Özeti',
+            color='Credit_Score',
+            color_discrete_sequence=color_palette,
+            hole=0.2  # Donut efekti istersen
+        )
+        fig.update_traces(
+            textinfo='percent+label',
+            textfont_size=16,  # İç yazı fontu
+            pull=[0.05] * len(credit_score_counts)  # Dilimleri hafifçe çek
+        )
+        fig.update_layout(
+            template="plotly_dark",
+            width=800,  # Grafik genişliği
+            height=600,  # Grafik yüksekliği
+            title_font_size=16,
+            legend=dict(
+                font=dict(size=16),  # Sağdaki yazılar (legend)
+                orientation="v",
+                yanchor="middle",
+                y=0.5,
+                xanchor="left",
+                x=1.02  # Sağ tarafa yasla
+            ),
+            margin=dict(t=50, b=50, l=50, r=50)
+        )
+        return fig
+
+    plot_cached(cache_key, "credit_score_pie", build, use_container_width=False)
 
     # Ödeme davranışı özeti - Pasta grafik
-    payment_counts = filtered_data['Payment_Behaviour'].value_counts().reset_index()
-    payment_counts.columns = ['Ödeme Davranışı', 'Sayı']
-
-    fig = px.pie(
-        payment_counts,
-        names='Ödeme Davranışı',
-        values='Sayı',
-        title='Ödeme Davranışı Özeti',
-        color_discrete_sequence=color_palette,
-        hole=0.1
-    )
-
-    fig.update_traces(
-        textinfo='percent+label',
-        textfont_size=18,  # Dilim üzerindeki yazılar
-        pull=[0.03] * len(payment_counts)  # Dilimleri biraz daha dışarı çek
-    )
-
-    fig.update_layout(
-        template="plotly_dark",
-        width=1800,  # Daha büyük grafik
-        height=1000,  # Daha uzun grafik
-        legend=dict(
-            font=dict(size=18),
-            orientation="v",
-            yanchor="middle",
-            y=0.5,
-            xanchor="left",
-            x=2.50  # Legend'ı grafikten daha uzağa koy
-        ),
-        margin=dict(t=80, b=60, l=60, r=100)  # Sağ boşluk artırıldı
-    )
-
-    st.plotly_chart(fig, use_container_width=False)
+    def build():
+        payment_counts = filtered_data['Payment_Behaviour'].value_counts().reset_index()
+        payment_counts.columns = ['Ödeme Davranışı', 'Sayı']
+
+        fig = px.pie(
+            payment_counts,
+            names='Ödeme Davranışı',
+            values='Sayı',
+            title='Ödeme Davranışı Özeti',
+            color_discrete_sequence=color_palette,
+            hole=0.1
+        )
+
+        fig.update_traces(
+            textinfo='percent+label',
+            textfont_size=18,  # Dilim üzerindeki yazılar
+            pull=[0.03] * len(payment_counts)  # Dilimleri biraz daha dışarı çek
+        )
+
+        fig.update_layout(
+            template="plotly_dark",
+            width=1800,  # Daha büyük grafik
+            height=1000,  # Daha uzun grafik
+            legend=dict(
+                font=dict(size=18),
+                orientation="v",
+                yanchor="middle",
+                y=0.5,
+                xanchor="left",
+                x=2.50  # Legend'ı grafikten daha uzağa koy
+            ),
+            margin=dict(t=80, b=60, l=60, r=100)  # Sağ boşluk artırıldı
+        )
+        return fig
+
+    plot_cached(cache_key, "payment_behaviour_pie", build, use_container_width=False)
 
     # Borç-gelir oranı gruplandırması - Bar grafik
+    def build():
+
+        debt_income_groups = pd.cut(
+            filtered_data['Debt_to_Income_Ratio'],
+            bins=[0, 0.1, 0.2, 0.3, 0.4, 0.5, 1, 1.5, 2, 10],
+            labels=['0-0.1', '0.1-0.2', '0.2-0.3', '0.3-0.4', '0.4-0.5', '0.5-1.0', '1.0-1.5', '1.5-2.0', '2.0+']
+        )
+
+        debt_income_counts = debt_income_groups.value_counts().reset_index()
+        debt_income_counts.columns = ['Borç-Gelir Grubu', 'Sayı']
+
+        fig = px.bar(
+            debt_income_counts,
+            x='Borç-Gelir Grubu',
+            y='Sayı',
+            title='Borç-Gelir Oranı Dağılımı Özeti',
+            color='Borç-Gelir Grubu',
+            color_discrete_sequence=color_palette,
+            text_auto=True
+        )
+        fig.update_layout(template="plotly_dark", width=1900, height=600, xaxis_title="Borç-Gelir Grubu",
+                          yaxis_title="Müşteri Sayısı")
+        return fig
 
-    filtered_data['Borç-Gelir Grubu'] = pd.cut(
-        filtered_data['Debt_to_Income_Ratio'],
-        bins=[0, 0.1, 0.2, 0.3, 0.4, 0.5, 1, 1.5, 2, 10],
-        labels=['0-0.1', '0.1-0.2', '0.2-0.3', '0.3-0.4', '0.4-0.5', '0.5-1.0', '1.0-1.5', '1.5-2.0', '2.0+']
-    )
-
-    debt_income_counts = filtered_data['Borç-Gelir Grubu'].value_counts().reset_index()
-    debt_income_counts.columns = ['Borç-Gelir Grubu', 'Sayı']
-
-    fig = px.bar(
-        debt_income_counts,
-        x='Borç-Gelir Grubu',
-        y='Sayı',
-        title='Borç-Gelir Oranı Dağılımı Özeti',
-        color='Borç-Gelir Grubu',
-        color_discrete_sequence=color_palette,
-        text_auto=True
-    )
-    fig.update_layout(template="plotly_dark", width=1900, height=600, xaxis_title="Borç-Gelir Grubu",
-                      yaxis_title="Müşteri Sayısı")
-    st.plotly_chart(fig, use_container_width=True)
+    plot_cached(cache_key, "debt_income_groups", build, use_container_width=True)
 
     # Dashboard sonucu
     st.success("""
@@ -841,4 +903,74 @@ if preprocessed_data is not None:
     """)
 
     # Footer
-    st.markdown("---")
\ No newline at end of file
+    st.markdown("---")
+
+# Veri dosyasını yükle
+try:
+    preprocessed_data = load_processed_data(PROCESSED_DATA_PATH)
+    profile = load_data_profile(PROCESSED_DATA_PATH)
+except Exception as e:
+    st.error(f"Veri yüklenirken hata oluştu: {e}")
+    preprocessed_data = None
+
+if preprocessed_data is not None:
+    # Sidebar filtreleri
+    with st.sidebar:
+        st.image("logo.png")
+        st.subheader("Filtreleme")
+
+        # Filtre seçenekleri ve özet profilden okunur (veriyi yeniden taramadan)
+        columns = profile["columns"]
+
+        # Kredi skoru filtreleme
+        credit_options = list(columns['Credit_Score']['values'])
+        credit_score = st.multiselect("Kredi Skoru", options=credit_options, default=credit_options)
+
+        # Yaş aralığı filtresi
+        min_age = int(columns["Age"]["min"])
+        max_age = int(columns["Age"]["max"])
+        age_range = st.slider("Yaş Aralığı", min_age, max_age, (min_age, max_age))
+
+        # Meslek filtresi
+        occupations = list(columns['Occupation']['values'])
+        selected_occupation = st.selectbox("Meslek", [ALL_OCCUPATIONS] + occupations)
+
+        # Ay filtresi
+        months = list(columns['Month']['values'])
+        selected_month = st.multiselect("Ay", options=months, default=months)
+
+        # Veri özeti
+        st.divider()
+        st.caption("📊 Veri Özeti")
+        st.caption(f"Toplam kayıt: {profile['rows']}")
+        st.caption(f"Toplam özellik: {profile['n_columns']}")
+
+        # Oturumlar arası figür önbelleği (boyutlandırma için isabet oranı)
+        figure_stats = shared_figure_cache().stats()
+        st.caption(f"Grafik önbelleği: %{100 * figure_stats['hit_rate']:.0f} isabet, "
+                   f"{figure_stats['entries']} figür, {figure_stats['bytes'] / 2 ** 20:.1f} MB")
+
+    # Filtreleme işlemleri (normalize edilmiş filtre durumu önbellek anahtarı olarak da kullanılır)
+    active_filters = filter_key(credit_score, age_range, selected_occupation, selected_month)
+    filtered_data = apply_filters(preprocessed_data, active_filters)
+
+    st.info(f"📊 Gösterilen kayıt sayısı: {len(filtered_data)}")
+
+    # Sadece açık sekme hesaplanır; sekme değişimi sayfayı yeniden çalıştırır, diğer bölümler çalışmaz
+    numeric_features = preprocessed_data.select_dtypes(include=['float64', 'int64']).columns.tolist()
+    # Figür önbelleği anahtarı: (veri sürümü, normalize filtre durumu) + grafik kimliği
+    cache_key = (dataset_version(PROCESSED_DATA_PATH), active_filters)
+    sections = [
+        ("📱 Müşteri Profili", customer_profile_section, (filtered_data, profile, cache_key)),
+        ("📈 Kredi Skoru Dinamiği", credit_score_section, (filtered_data, cache_key)),
+        ("💰 Borç ve Ödeme", debt_payment_section, (filtered_data, cache_key)),
+        ("💳 Finansal Ürünler", financial_products_section, (filtered_data, active_filters, cache_key)),
+        ("🔗 Faktörler Arası İlişkiler", factor_relations_section,
+         (filtered_data, active_filters, numeric_features, cache_key)),
+        ("🏁 Sonuç", summary_section, (filtered_data, cache_key)),
+    ]
+    tabs = st.tabs([title for title, _, _ in sections], key="story_section", on_change="rerun")
+    for tab, (_, section, args) in zip(tabs, sections):
+        if tab.open:
+            with tab:
+                section(*args)
@@ -0,0 +1,95 @@
+import io
+
+import streamlit as st
+import pandas as pd
+
+from credit_scoring.artifacts import current_version
+from credit_scoring.audit import shared_logger
+from credit_scoring.compare import compare_models, disagreement_rows
+from credit_scoring.pipelines import PseudoLabelPipeline, SupervisedPipeline
+from credit_scoring.training import ARTIFACT_NAMES
+from credit_scoring.ui import (
+    application_form, audit_health, customer_application, feature_store, substitution_notice
+)
+
+st.set_page_config(page_title="Model Karşılaştırma", page_icon="⚖️")
+st.title("⚖️ Supervised Stack ve Pseudo Label Modellerinin Karşılaştırması")
+
+st.write("Aynı başvuru iki modelle birlikte skorlanır. Ortak özellikler bir kez hesaplanır, modeller eşzamanlı çalışır.")
+
+MODEL_LABELS = {"supervised": "📚 Supervised Stack", "pseudo_label": "🤖 Pseudo Label"}
+
+
+# === Modeller (tüm oturumlar için bir kez)
+@st.cache_resource
+def load_pipelines():
+    return [SupervisedPipeline.load(), PseudoLabelPipeline.load()]
+
+
+@st.cache_data(max_entries=4, show_spinner="İki modelle skorlanıyor...")
+def compare_upload(data, name, _pipelines):
+    """Yüklenen dosyayı okuyup iki modelle skorlar; aynı içerik (bayt) her etkileşimde yeniden skorlanmaz."""
+    buffer = io.BytesIO(data)
+    df = pd.read_parquet(buffer) if name.endswith(".parquet") else pd.read_csv(buffer)
+    if not len(df):
+        return df, None, None
+    return (df, *compare_models(df, _pipelines))
+
+
+try:
+    pipelines = load_pipelines()
+    audit_logger = shared_logger()
+except Exception as e:
+    st.error(f"❌ Model dosyaları yüklenemedi:\n\n{e}")
+    st.stop()
+audit_health(audit_logger)
+
+mode = st.radio("Karşılaştırma", ["Tek başvuru", "Müşteri ID", "Toplu (dosya)"], horizontal=True)
+
+# === Tek başvuru: formdan veya özellik deposundan iki modelin kararı ve süresi
+if mode != "Toplu (dosya)":
+    application = application_form() if mode == "Tek başvuru" else customer_application(feature_store())
+    if st.button("🎯 İki Modelle Skorla", disabled=application is None):
+        scores, report = compare_models(application, pipelines)
+        # Gösterilen her karar, model sayfalarındaki gibi denetim kaydına bırakılır
+        for pipeline in pipelines:
+            audit_logger.log(application, pipeline.name, scores[f"{pipeline.name}_proba"],
+                             scores[f"{pipeline.name}_decision"], 1000 * report[f"{pipeline.name}_seconds"],
+                             current_version(ARTIFACT_NAMES[pipeline.name]), source="comparison")
+        for col, pipeline in zip(st.columns(len(pipelines)), pipelines):
+            rejected = scores[f"{pipeline.name}_decision"].iloc[0] == 1
+            col.metric(
+                MODEL_LABELS[pipeline.name],
+                "❌ Rejected" if rejected else "✅ Approved",
+                f"{1000 * report[f'{pipeline.name}_seconds']:.1f} ms",
+                delta_color="off",
+            )
+            col.caption(f"Rejected olasılığı: {scores[f'{pipeline.name}_proba'].iloc[0]:.3f}")
+        if scores["agree"].iloc[0]:
+            st.success("İki model aynı kararı verdi.")
+        else:
+            st.warning("Modeller farklı karar verdi.")
+        substitution_notice(application)
+
+# === Toplu: uyuşma oranı, model süreleri ve uyuşmazlık satırları
+else:
+    st.caption("Toplu karşılaştırma model analizi içindir, başvuru kararı vermez ve denetim kaydı oluşturmaz; "
+               "toplu kararlar için: python -m credit_scoring.batch ... --audit")
+    uploaded = st.file_uploader("Başvuru dosyası (CSV veya Parquet)", type=["csv", "parquet"])
+    if uploaded is not None:
+        df, scores, report = compare_upload(uploaded.getvalue(), uploaded.name, pipelines)
+        if report is None:
+            st.warning("Dosyada başvuru satırı yok.")
+            st.stop()
+
+        agreement = report["agreement_rate"]
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Uyuşma Oranı", "—" if agreement is None else f"{100 * agreement:.2f}%")
+        col2.metric("Uyuşmazlık", f"{report['disagreements']:,}")
+        col3.metric("Toplam Süre", f"{report['wall_seconds']:.2f} sn")
+        st.caption(" | ".join(
+            f"{MODEL_LABELS[p.name]}: {report[f'{p.name}_seconds']:.2f} sn" for p in pipelines
+        ) + f" | Ortak özellikler: {report['encode_seconds']:.2f} sn")
+
+        st.markdown("#### Uyuşmazlık Satırları")
+        st.dataframe(disagreement_rows(df, scores).head(1000))
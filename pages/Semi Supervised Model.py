@@ -1,128 +1,120 @@
+import time
+
 import streamlit as st
-import numpy as np
-import pickle
-import os
+
+from credit_scoring.artifacts import current_version
+from credit_scoring.audit import shared_logger
+from credit_scoring.drift import shared_monitor
+from credit_scoring.explain import PipelineExplainer, reason_table
+from credit_scoring.features import encode_raw
+from credit_scoring.pipelines import DECISION_THRESHOLD, PseudoLabelPipeline, PseudoLabelStudentPipeline
+from credit_scoring.shadow import shared_shadow
+from credit_scoring.training import ARTIFACT_NAMES
+from credit_scoring.ui import (
+    APPLICATION_SOURCES, application_form, audit_health, customer_application, feature_store, optional_explainer,
+    substitution_notice
+)
 
 st.set_page_config(page_title="Pseudo Label Model", page_icon="🤖")
 st.title("🤖 Yarı Denetimli (Pseudo Label) Model ile Kredi Skoru Tahmini")
 
 st.write("Bu model, hem etiketli hem de pseudo-etiketli veriler kullanılarak eğitilmiştir. Aşağıdaki formu doldurarak kredi skoru tahmini alabilirsiniz.")
 
-# === Kullanıcıdan Girdi Al ===
-age = st.slider("Yaş", 18, 85, 30)
-annual_income = st.number_input("Yıllık Gelir (₺)", min_value=0.0, value=50000.0)
-monthly_salary = st.number_input("Aylık Maaş", min_value=0.0, value=4000.0)
-num_accounts = st.slider("Banka Hesap Sayısı", 0, 10, 2)
-num_credit_cards = st.slider("Kredi Kartı Sayısı", 0, 10, 2)
-interest_rate = st.slider("Kredi Faiz Oranı (%)", 0.0, 50.0, 10.0)
-delay_from_due = st.slider("Vade Gecikme Süresi (gün)", 0, 60, 5)
-num_delayed_payments = st.slider("Gecikmiş Ödeme Sayısı", 0, 20, 2)
-changed_credit_limit = st.slider("Kredi Limit Değişimi (%)", -100.0, 100.0, 10.0)
-num_credit_inquiries = st.slider("Kredi Sorgusu Sayısı", 0, 20, 1)
-outstanding_debt = st.number_input("Kalan Borç (₺)", min_value=0.0, value=20000.0)
-credit_utilization_ratio = st.slider("Kredi Kullanım Oranı (%)", 0.0, 100.0, 45.0)
-credit_history_age = st.slider("Kredi Geçmişi (Ay)", 0, 500, 48)
-payment_of_min = st.selectbox("Asgari Ödeme Yapıldı mı?", ["Yes", "No"])
-payment_of_min_map = {"Yes": 1, "No": 0}[payment_of_min]
-monthly_investment = st.number_input("Aylık Yatırım (₺)", min_value=0.0, value=500.0)
-monthly_balance = st.number_input("Aylık Bakiye (₺)", min_value=0.0, value=3000.0)
-
-# === Meslek (Label Encoded)
-occupation = st.selectbox("Meslek", [
-    'Accountant', 'Architect', 'Developer', 'Doctor', 'Engineer',
-    'Entrepreneur', 'Journalist', 'Lawyer', 'Manager', 'Mechanic',
-    'Media_Manager', 'Musician', 'Scientist', 'Teacher', 'Writer', 'Other'
-])
-occupation_map = {
-    'Accountant': 0, 'Architect': 1, 'Developer': 2, 'Doctor': 3,
-    'Engineer': 4, 'Entrepreneur': 5, 'Journalist': 6, 'Lawyer': 7,
-    'Manager': 8, 'Mechanic': 9, 'Media_Manager': 10, 'Musician': 11,
-    'Scientist': 12, 'Teacher': 13, 'Writer': 14, 'Other': 15
-}
-occupation_label = occupation_map[occupation]
-
-# === Ödeme Davranışı
-payment_behaviour = st.selectbox("Ödeme Davranışı", [
-    "Low_spent_Small_value_payments",
-    "Low_spent_Medium_value_payments",
-    "Low_spent_Large_value_payments",
-    "High_spent_Small_value_payments",
-    "High_spent_Medium_value_payments",
-    "High_spent_Large_value_payments"
-])
-payment_behaviour_map = {
-    "Low_spent_Small_value_payments": 0,
-    "Low_spent_Medium_value_payments": 1,
-    "Low_spent_Large_value_payments": 2,
-    "High_spent_Small_value_payments": 3,
-    "High_spent_Medium_value_payments": 4,
-    "High_spent_Large_value_payments": 5
-}
-payment_behaviour_value = payment_behaviour_map[payment_behaviour]
-
-# === Kredi Karışımı
-credit_mix = st.selectbox("Kredi Karışımı", ["Standard", "Good", "Bad"])
-credit_mix_map = {"Standard": 1, "Good": 2, "Bad": 0}[credit_mix]
-
-# === Çoklu Kredi Türü (One-hot)
-loan_types = [
-    "Auto Loan", "Credit-Builder Loan", "Debt Consolidation Loan", "Home Equity Loan",
-    "Mortgage Loan", "Not Specified", "Payday Loan", "Personal Loan", "Student Loan"
-]
-loan_selected = st.multiselect("Kredi Tür(leri)", loan_types, default=["Not Specified"])
-loan_encoded = [1 if l in loan_selected else 0 for l in loan_types]
-
-# === PCA için gerekenler
-num_loans = st.slider("Kredi Sayısı", 0, 10, 1)
-total_emi = st.number_input("Aylık EMI Tutarı (₺)", min_value=0.0, value=1000.0)
-
-# === Numeric feature'lar (17 tane, modelde kullanılan sırayla)
-numeric_features = np.array([[
-    age, annual_income, monthly_salary, num_accounts, num_credit_cards,
-    interest_rate, num_loans, delay_from_due, num_delayed_payments,
-    changed_credit_limit, num_credit_inquiries, outstanding_debt,
-    credit_utilization_ratio, credit_history_age, total_emi,
-    monthly_investment, monthly_balance
-]])
-
-# === Categorical features (Num_of_Loan tekrar girilmez)
-categorical_features = np.array([[
-    occupation_label, payment_behaviour_value, credit_mix_map, *loan_encoded,payment_of_min_map
-]])
-
-# === Model bileşenleri
-try:
-    with open("models/quantile_scaler.pkl", "rb") as f:
-        scaler = pickle.load(f)
-    with open("models/leaky_pca.pkl", "rb") as f:
-        pca = pickle.load(f)
-    with open("models/pseudo_label_model.pkl", "rb") as f:
-        model = pickle.load(f)
-except Exception as e:
-    st.error(f"❌ Model dosyaları yüklenemedi:\n\n{e}")
-    st.stop()
+# === Başvuru kaynağı: form alanları veya özellik deposundaki müşterinin son ayı
+source = st.radio("Başvuru Kaynağı", APPLICATION_SOURCES, horizontal=True)
+if source == "Müşteri ID":
+    application = customer_application(feature_store())
+else:
+    # Form tüm model sayfalarında ortaktır (ui.application_form)
+    application = application_form()
+
+
+# === Model bileşenleri (tüm oturumlar için bir kez)
+@st.cache_resource
+def load_pipeline():
+    return PseudoLabelPipeline.load()
+
 
-# === Scale işlemi
-numeric_scaled = scaler.transform(numeric_features)
+@st.cache_resource
+def load_explainer():
+    return PipelineExplainer(load_pipeline())
 
-# === PCA: scaled EMI (14), scaled Loan (6)
-emi_and_loan_scaled = numeric_scaled[:, [14, 6]]
-leaky_compressed = pca.transform(emi_and_loan_scaled)[0][0]
 
-# === EMI ve Loan scaled vektöründen çıkarılır
-numeric_scaled_trimmed = np.delete(numeric_scaled, [6, 14], axis=1)
+@st.cache_resource
+def load_fast():
+    # Pseudo label modelinden damıtılmış tek LightGBM (distill.py)
+    return PseudoLabelStudentPipeline.load()
 
-# === Final feature vektörü
-final_features = np.hstack([
-    numeric_scaled_trimmed,
-    categorical_features,
-    np.array([[leaky_compressed]])
-])
 
-# === Tahmin ve görsel çıktı
-if st.button("🎯 Skoru Tahmin Et"):
-    prediction = model.predict(final_features)[0]
+@st.cache_resource
+def load_fast_explainer():
+    return PipelineExplainer(load_fast())
+
+
+try:
+    pipeline = load_pipeline()
+    drift_monitor = shared_monitor()
+    audit_logger = shared_logger()
+except Exception as e:
+    st.error(f"❌ Model dosyaları yüklenemedi:\n\n{e}")
+    st.stop()
+audit_health(audit_logger)
+# Açıklayıcı ayrı yüklenir: açıklama üretilemezse skorlama sürer
+explainer = optional_explainer(load_explainer)
+
+# === Skorlama modu: hızlıda kararı pseudo label modelinden damıtılmış öğrenci verir
+scoring_mode = st.radio("Skorlama Modu", ["Tam Model", "Hızlı"], horizontal=True,
+                        help="Hızlı: pseudo label modelini taklit eden tek, küçük bir model")
+scorer, scorer_explainer = pipeline, explainer
+if scoring_mode == "Hızlı":
+    try:
+        scorer = load_fast()
+        scorer_explainer = optional_explainer(load_fast_explainer)
+    except FileNotFoundError:
+        st.warning("Hızlı model (models/pseudo_label_student.pkl) bulunamadı; tam model kullanılıyor.")
+model_version = current_version(ARTIFACT_NAMES[scorer.name])
+# Aday sürüm varsa (--no-promote ile kaydedilmiş) aynı başvuru arka planda onunla da skorlanır
+shadow = shared_shadow(scorer)
+
+# === Tahmin ve görsel çıktı (15 scaled + 13 kategorik + PCA = 29 özellik, float32)
+if st.button("🎯 Skoru Tahmin Et", disabled=application is None):
+    start = time.perf_counter()
+    blocks = encode_raw(application)
+    probability = scorer.predict_proba(blocks)
+    prediction = int(probability[0] >= DECISION_THRESHOLD)
+    latency_ms = 1000 * (time.perf_counter() - start)
+
+    # Denetim kaydı kuyruğa bırakılır (disk yazımı arka planda); drift histogramları güncellenir
+    audit_logger.log(application, scorer.name, probability, [prediction], latency_ms, model_version)
+    if shadow is not None:
+        shadow.submit(blocks, probability, latency_ms)
+    drift_monitor.observe(blocks.numeric)
+    drift_monitor.export()
     if prediction == 0:
         st.markdown("### ✅ <span style='color:green'><strong>Approved</strong></span>", unsafe_allow_html=True)
     else:
         st.markdown("### ❌ <span style='color:red'><strong>Rejected</strong></span>", unsafe_allow_html=True)
+    substitution_notice(application)
+
+    # Ağaç yolu katkıları: pozitif etki reddi, negatif etki onayı destekler
+    st.markdown("#### 🔍 Kararı En Çok Etkileyen Faktörler")
+    if scorer_explainer is None:
+        st.caption("Bu model için açıklama yok.")
+    else:
+        _, contributions = scorer_explainer.explain(blocks)
+        st.dataframe(reason_table(contributions, rejected=prediction == 1), hide_index=True)
+
+# === Girdi kayması: tüm oturumlardaki son başvuruların eğitim dağılımına (quantile_scaler) göre PSI/KS değerleri
+with st.expander("📈 Girdi Kayması (Drift) İzleme"):
+    st.dataframe(drift_monitor.snapshot().round(4))
+
+# === Gölge skorlama: aday sürümün etkin modelle karar uyuşmazlığı ve gecikmesi (tüm oturumlar)
+if shadow is not None:
+    with st.expander(f"🕶️ Gölge Skorlama (aday v{shadow.stats.candidate_version})"):
+        summary = shadow.stats.summary()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Skorlanan", summary["rows"])
+        col2.metric("Uyuşmazlık", "-" if summary["rows"] == 0 else f"{summary['disagreement_rate']:.1%}")
+        col3.metric("Aday p95 (ms)", summary["candidate_p95_ms"] or "-")
+        col4.metric("Düşürülen", summary["dropped"])
+        st.caption("Kullanıcıya etkin model cevap verir; aday arka planda, kuyruk doluysa istek atlanarak skorlanır.")
@@ -0,0 +1,92 @@
+import glob
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from credit_scoring.audit import DEAD_LETTER_DIR, AuditLogger, audit_records, query
+from credit_scoring.schema import CATEGORICAL_VOCABULARIES, LOAN_TYPES, NUMERIC_COLS, PAYMENT_OF_MIN_COL
+
+
+def application(n=1):
+    row = {col: 1.0 for col in NUMERIC_COLS + [PAYMENT_OF_MIN_COL]}
+    row.update({col: vocabulary[0] for col, vocabulary in CATEGORICAL_VOCABULARIES.items()})
+    row.update({col: 0 for col in LOAN_TYPES})
+    return pd.DataFrame([row] * n)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+@pytest.fixture
+def logger(tmp_path):
+    logger = AuditLogger(str(tmp_path), flush_interval=0.05, fsync="never")
+    yield logger
+    logger.close()
+
+
+def test_bad_input_fails_at_caller(logger):
+    with pytest.raises(KeyError):
+        logger.log(application().drop(columns=NUMERIC_COLS[0]), "supervised", [0.2], [0], 1.0)
+    assert logger.stats()["writer_alive"]
+
+
+def test_write_error_is_dead_lettered_and_writer_survives(logger, tmp_path, monkeypatch):
+    def broken(table, day):
+        raise OSError("disk dolu")
+
+    monkeypatch.setattr(logger, "_write", broken)
+    logger.log(application(3), "supervised", [0.1, 0.7, 0.2], [0, 1, 0], 3.0)
+    assert wait_for(lambda: logger.stats()["dead_lettered"] == 3)
+    stats = logger.stats()
+    assert stats["writer_alive"] and stats["errors"] == 1 and "disk dolu" in stats["last_error"]
+    assert len(pd.read_parquet(glob.glob(os.path.join(tmp_path, DEAD_LETTER_DIR, "*.parquet"))[0])) == 3
+
+    monkeypatch.undo()
+    logger.log(application(), "supervised", [0.9], [1], 1.0)
+    assert wait_for(lambda: logger.stats()["written"] == 1)
+
+
+def test_open_stream_rotated_after_interval(tmp_path):
+    logger = AuditLogger(str(tmp_path), flush_interval=0.05, rotate_interval=0.2, fsync="never")
+    try:
+        logger.log(application(2), "supervised", [0.1, 0.9], [0, 1], 2.0)
+        # Yazıcı kapanmadan, boşta geçen süre sonunda kayıtlar sorgulanabilir
+        assert wait_for(lambda: logger.stats()["files"] == 1)
+        assert len(query(str(tmp_path))) == 2
+    finally:
+        logger.close()
+
+
+def test_written_batch_not_dead_lettered_when_rotation_fails(tmp_path, monkeypatch):
+    logger = AuditLogger(str(tmp_path), flush_interval=0.05, max_file_rows=1, fsync="never")
+    try:
+        def broken():
+            raise OSError("mühürleme hatası")
+
+        monkeypatch.setattr(logger, "_rotate", broken)
+        logger.log(application(2), "supervised", [0.1, 0.9], [0, 1], 2.0)
+        assert wait_for(lambda: logger.stats()["errors"] >= 1)
+        stats = logger.stats()
+        assert stats["written"] == 2 and stats["dead_lettered"] == 0
+        monkeypatch.undo()
+    finally:
+        logger.close()
+
+
+def test_partition_follows_record_timestamp(tmp_path):
+    logger = AuditLogger(str(tmp_path), flush_interval=0.05, fsync="never")
+    # Gece yarısından hemen önce oluşturulup sonra yazılan kayıtlar kendi günlerinde kalır
+    before_midnight = pd.Timestamp("2026-03-01 23:59:59.900", tz="UTC").timestamp()
+    logger.queue.put(pd.concat([
+        audit_records(before_midnight, application(2), "supervised", [0.1, 0.9], [0, 1], 2.0),
+        audit_records(before_midnight + 1, application(), "supervised", [0.2], [0], 1.0),
+    ], ignore_index=True))
+    logger.close()
+    assert query(str(tmp_path), until="2026-03-01")["probability"].tolist() == [0.1, 0.9]
+    assert query(str(tmp_path), since="2026-03-02")["probability"].tolist() == [0.2]
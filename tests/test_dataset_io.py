@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from credit_scoring.dataset_io import is_model_matrix, load_model_matrix, save_columns
+from credit_scoring.schema import SUPERVISED_FEATURES
+from credit_scoring.training import read_data, read_frame
+
+
+@pytest.fixture
+def model_ready(tmp_path):
+    # Notebook'taki df_for_model gibi: özellikler kendi sırasında, ardından target
+    rng = np.random.default_rng(0)
+    columns = list(reversed(SUPERVISED_FEATURES))
+    df = pd.DataFrame(rng.normal(size=(20, len(columns))), columns=columns)
+    df["target"] = rng.integers(0, 2, size=20)
+    return save_columns(df, str(tmp_path / "df_for_model")), df
+
+
+def test_matrix_follows_feature_order(model_ready):
+    path, df = model_ready
+    X, y = load_model_matrix(path, SUPERVISED_FEATURES)
+    assert X.dtype == np.float32 and X.shape == (20, len(SUPERVISED_FEATURES))
+    np.testing.assert_array_equal(X, df[SUPERVISED_FEATURES].to_numpy(dtype=np.float32))
+    np.testing.assert_array_equal(y, df["target"].to_numpy())
+
+
+def test_model_ready_dir_is_not_read_as_raw(model_ready):
+    path, _ = model_ready
+    assert is_model_matrix(path, SUPERVISED_FEATURES)
+    assert read_data(path) == path
+    with pytest.raises(ValueError):
+        read_frame(path)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from credit_scoring.encoders import CategoricalEncoder
+from credit_scoring.schema import CREDIT_MIXES
+
+
+@pytest.fixture
+def encoder():
+    return CategoricalEncoder.from_schema()
+
+
+def test_numeric_codes_in_range_pass_through(encoder):
+    codes = encoder.transform_column(pd.Series([0, 1, 2], name="Credit_Mix"))
+    assert codes.dtype == np.int8
+    assert codes.tolist() == [0, 1, 2]
+
+
+def test_integral_float_codes_accepted(encoder):
+    codes = encoder.transform_column(pd.Series([0.0, 2.0], name="Credit_Mix"))
+    assert codes.tolist() == [0, 2]
+
+
+@pytest.mark.parametrize("value", [256, len(CREDIT_MIXES), -1, 1.7, np.nan])
+def test_invalid_numeric_codes_rejected(encoder, value):
+    # int8 dönüşümü 256'yı 0'a, 1.7'yi 1'e, NaN'ı 0'a çeviriyordu
+    with pytest.raises(ValueError):
+        encoder.transform_column(pd.Series([0, value], name="Credit_Mix"))
+
+
+def test_nullable_integer_missing_rejected(encoder):
+    with pytest.raises(ValueError):
+        encoder.transform_column(pd.Series([1, None], dtype="Int64", name="Credit_Mix"))
+
+
+def test_string_values_encoded(encoder):
+    codes = encoder.transform_column(pd.Series(list(CREDIT_MIXES), name="Credit_Mix"))
+    assert codes.tolist() == list(range(len(CREDIT_MIXES)))
+
+
+def test_fit_rejects_all_missing_ordinal_column():
+    df = pd.DataFrame({"Occupation": ["Doctor", "Lawyer"], "Payment_Behaviour": ["!@9#%8", None],
+                       "Credit_Mix": ["Good", "Bad"]})
+    with pytest.raises(ValueError, match="Payment_Behaviour"):
+        CategoricalEncoder.fit(df)
+
+
+def test_fallback_substitutions_reported_and_counted(encoder):
+    df = pd.DataFrame({"Occupation": ["Doctor", "_______", "Astronaut"]})
+    assert encoder.substitutions(df) == {"Occupation": (["_______", "Astronaut"], "Other")}
+    encoder.transform_column(df["Occupation"])
+    assert encoder.substituted == {"Occupation": 2}
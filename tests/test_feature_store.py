@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from credit_scoring.feature_store import FeatureStore, build_store
+from credit_scoring.schema import CATEGORICAL_VOCABULARIES, LOAN_TYPES, NUMERIC_COLS, PAYMENT_OF_MIN_COL
+
+
+def applications(ids, month, income, **extra):
+    row = {col: 1.0 for col in NUMERIC_COLS + [PAYMENT_OF_MIN_COL]}
+    row.update({col: vocabulary[0] for col, vocabulary in CATEGORICAL_VOCABULARIES.items()})
+    row.update({col: 0 for col in LOAN_TYPES})
+    df = pd.DataFrame([row] * len(ids))
+    df.insert(0, "Customer_ID", ids)
+    df.insert(1, "Month", month)
+    df[NUMERIC_COLS[0]] = float(income)
+    for col, value in extra.items():
+        df[col] = value
+    return df
+
+
+def incomes(root, ids):
+    return FeatureStore.open(root).frame(ids).set_index("Customer_ID")[NUMERIC_COLS[0]].to_dict()
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / "store")
+
+
+def test_january_of_next_year_wins_over_december(root):
+    # Yılın ayı saklandığında Aralık (11) Ocak'tan (0) "daha yeni" sayılıyordu
+    data = pd.concat([applications(["a"], "January", 2, Year=2027), applications(["a"], "December", 1, Year=2026)])
+    build_store([data], root)
+    store = FeatureStore.open(root)
+    assert incomes(root, ["a"]) == {"a": 2.0}
+    assert store.frame(["a"])["Month"].tolist() == ["January"]
+
+
+def test_refresh_merges_over_current_store(root):
+    build_store([applications(["a", "b"], "December", 1)], root)
+    # Yeni ay dosyasında b yok; yılsız Ocak, depodaki Aralık'tan sonraki yıla yerleşir
+    build_store([applications(["a", "c"], "January", 2)], root)
+    assert incomes(root, ["a", "b", "c"]) == {"a": 2.0, "b": 1.0, "c": 2.0}
+    assert FeatureStore.open(root).meta["merged_customers"] == 2
+    assert np.asarray(FeatureStore.open(root).records["period"]).max() == 12
+
+    build_store([applications(["a"], "February", 3)], root, merge=False)
+    assert incomes(root, ["a", "b"]) == {"a": 3.0}
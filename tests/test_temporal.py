@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from credit_scoring.temporal import PERIOD_COL, TEMPORAL_COLS, build_state, temporal_features, update
+
+
+def applications(ids, month, **extra):
+    df = pd.DataFrame({"Customer_ID": ids, "Month": month, **extra})
+    for i, col in enumerate(TEMPORAL_COLS):
+        df[col] = np.arange(len(ids), dtype=float) + i
+    return df
+
+
+@pytest.fixture
+def december_state():
+    history = pd.concat([applications(["a", "b"], month) for month in ("November", "December")], ignore_index=True)
+    return build_state(history)
+
+
+def test_january_after_december_is_next_period(december_state):
+    # Yılın ayı saklandığında Ocak (0) <= Aralık (11) olduğu için güncelleme duruyordu
+    features, state = update(december_state, applications(["a", "b"], "January"))
+    assert features["Months_Since_Prev"].tolist() == [1.0, 1.0]
+    assert state[PERIOD_COL].tolist() == [12, 12]
+
+    features, _ = update(state, applications(["a"], "March"))
+    assert features["Months_Since_Prev"].tolist() == [2.0]
+
+
+def test_same_month_rerun_rejected(december_state):
+    with pytest.raises(ValueError):
+        update(december_state, applications(["a"], "December"))
+
+
+@pytest.mark.parametrize("history", [
+    pd.concat([applications(["a"], "December", Year=[2026]), applications(["a"], "January", Year=[2027])]),
+    pd.concat([applications(["a"], "2026-12"), applications(["a"], "2027-01")]),
+])
+def test_history_ordered_across_years(history):
+    features = temporal_features(history.reset_index(drop=True))
+    assert features["Months_Since_Prev"].iloc[1] == 1.0